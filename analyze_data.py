@@ -3,59 +3,142 @@ Analyze the collected nutrition SaaS data.
 Shows statistics, sentiment breakdown, top sources, etc.
 """
 
+import heapq
 import json
+import os
 from collections import Counter
 from datetime import datetime
 
+from commentradar.storage.archive import CommentArchive
+from commentradar.storage.jsonl import is_jsonl_path, iter_comment_dicts
+from commentradar.storage.sqlite import SQLiteCommentStore, is_sqlite_path
+from commentradar.utils.dates import parse_date_to_epoch
+
 
 def analyze_file(filename):
-    """Analyze a JSON data file."""
+    """Analyze a JSON, JSON Lines or SQLite data file."""
+    
+    if is_sqlite_path(filename):
+        if not os.path.exists(filename):
+            print(f"❌ File not found: {filename}")
+            return
+        with SQLiteCommentStore(filename) as store:
+            print_report(filename, **store_stats(store))
+        return
+    
+    if is_jsonl_path(filename):
+        if not os.path.exists(filename):
+            print(f"❌ File not found: {filename}")
+            return
+        # Memory-mapped rows, decoded one at a time
+        with CommentArchive(filename) as archive:
+            print_report(filename, **file_stats(archive.iter_dicts()))
+        return
     
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        stats = file_stats(iter_comment_dicts(filename))
     except FileNotFoundError:
         print(f"❌ File not found: {filename}")
         return
     
+    print_report(filename, **stats)
+
+
+def file_stats(rows):
+    """
+    Compute report statistics in one pass over comment dictionaries.
+    
+    Only the counters and the current top rows are kept, not the rows.
+    """
+    total = 0
+    platforms = Counter()
+    sentiments = Counter()
+    authors = Counter()
+    top_liked = []
+    recent = []
+    
+    for i, item in enumerate(rows):
+        total += 1
+        platforms[item['platform']] += 1
+        sentiments[item.get('sentiment', 'unknown')] += 1
+        authors[item['commenter_name']] += 1
+        
+        # Heaps of (key, -row number, row): ties keep the earlier row
+        if item.get('likes'):
+            push_top(top_liked, (item['likes'], -i, item), 3)
+        timestamp = parse_date_to_epoch(item.get('date_posted'), item['platform'])
+        if timestamp is not None:
+            push_top(recent, (timestamp, -i, item), 3)
+    
+    return {
+        'total': total,
+        'platforms': platforms.most_common(),
+        'sentiments': sentiments.most_common(),
+        'authors': authors.most_common(5),
+        'top_liked': [item for _, _, item in sorted(top_liked, reverse=True)],
+        'recent': [item for _, _, item in sorted(recent, reverse=True)],
+    }
+
+
+def push_top(heap, entry, k):
+    """Keep the ``k`` largest entries in a min-heap."""
+    if len(heap) < k:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+def store_stats(store):
+    """Compute report statistics with indexed queries on a SQLite store."""
+    total = len(store)
+    sentiments = store.count_by('sentiment')
+    unknown = total - sum(sentiments.values())
+    if unknown:
+        sentiments['unknown'] = unknown
+    return {
+        'total': total,
+        'platforms': list(store.count_by('platform').items()),
+        'sentiments': Counter(sentiments).most_common(),
+        'authors': list(store.count_by('commenter_name').items())[:5],
+        'top_liked': [c.to_dict() for c in store.top_liked(3)],
+        'recent': [c.to_dict() for c in store.latest(3)],
+    }
+
+
+def print_report(filename, total, platforms, sentiments, authors, top_liked, recent):
+    """Print the analysis of one data file."""
+    
     print(f"\n{'='*60}")
     print(f"📊 Analysis: {filename}")
     print(f"{'='*60}\n")
     
     # Basic stats
-    print(f"📝 Total Posts: {len(data)}")
+    print(f"📝 Total Posts: {total}")
     
     # Platform breakdown
-    platforms = Counter(item['platform'] for item in data)
     print(f"\n🌐 By Platform:")
-    for platform, count in platforms.most_common():
+    for platform, count in platforms:
         print(f"   {platform.capitalize():.<20} {count} posts")
     
     # Sentiment breakdown
-    sentiments = Counter(item.get('sentiment', 'unknown') for item in data)
     print(f"\n😊 By Sentiment:")
-    for sentiment, count in sentiments.most_common():
+    for sentiment, count in sentiments:
         print(f"   {sentiment.capitalize():.<20} {count} posts")
     
     # Top contributors
-    authors = Counter(item['commenter_name'] for item in data)
     print(f"\n👥 Top Contributors:")
-    for author, count in authors.most_common(5):
+    for author, count in authors:
         print(f"   {author[:30]:.<32} {count} posts")
     
     # Most liked
-    with_likes = [item for item in data if item.get('likes')]
-    if with_likes:
-        top_liked = sorted(with_likes, key=lambda x: x.get('likes', 0), reverse=True)[:3]
+    if top_liked:
         print(f"\n❤️  Most Liked Posts:")
         for i, item in enumerate(top_liked, 1):
             print(f"   {i}. {item['likes']} likes - {item['comment_text'][:50]}...")
     
     # Recent posts
-    with_dates = [item for item in data if item.get('date_posted')]
-    if with_dates:
+    if recent:
         print(f"\n📅 Latest Posts:")
-        recent = sorted(with_dates, key=lambda x: x.get('date_posted', ''), reverse=True)[:3]
         for i, item in enumerate(recent, 1):
             print(f"   {i}. [{item['platform'].upper()}] {item['commenter_name']}")
             print(f"      {item['comment_text'][:60]}...")
@@ -72,16 +155,19 @@ def main():
 ╚═══════════════════════════════════════════════════════════╝
 """)
     
-    import os
     import glob
     
     # Find all JSON files in scrape folder
     scrape_folder = "scrape"
     if os.path.exists(scrape_folder):
-        files = glob.glob(os.path.join(scrape_folder, "*.json"))
+        files = sorted(
+            glob.glob(os.path.join(scrape_folder, "*.json"))
+            + glob.glob(os.path.join(scrape_folder, "*.jsonl"))
+            + glob.glob(os.path.join(scrape_folder, "*.db"))
+        )
         
         if not files:
-            print("❌ No JSON files found in scrape/ folder")
+            print("❌ No JSON, JSONL or database files found in scrape/ folder")
             return
         
         print(f"📊 Found {len(files)} data files\n")
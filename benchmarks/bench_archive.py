@@ -0,0 +1,72 @@
+"""
+Benchmark: opening a large JSON Lines archive and reading its last rows.
+
+Compares loading every row (``list(iter_comment_dicts(...))``, what
+``analyze_data.py`` used to do) against ``CommentArchive`` with a cold
+index (first open, full scan) and a warm index (sidecar reused).
+
+Usage:
+    python benchmarks/bench_archive.py [--rows 1000000] [--tail 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commentradar.models import Comment
+from commentradar.storage.archive import CommentArchive
+from commentradar.storage.jsonl import iter_comment_dicts, write_jsonl
+
+
+def build(path: str, rows: int):
+    write_jsonl(
+        (
+            Comment(
+                source_url=f"https://blog.example.com/posts/{i % 500}",
+                platform=('reddit', 'hackernews', 'github', 'devto', 'blog')[i % 5],
+                commenter_name=f"user{i % 5000}",
+                comment_text=f"Comment number {i} about nutrition software pricing and features",
+                date_posted=f"2024-01-{i % 28 + 1:02d}T10:00:00Z",
+                likes=i % 100,
+            )
+            for i in range(rows)
+        ),
+        path
+    )
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed:8.3f}s")
+    return elapsed
+
+
+def read_tail(path: str, n: int):
+    with CommentArchive(path) as archive:
+        return archive.tail(n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--tail', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'comments.jsonl')
+        build(path, args.rows)
+        print(f"{args.rows} comments, {os.path.getsize(path) / 1e6:.0f} MB")
+
+        timed("load all rows, take last rows", lambda: list(iter_comment_dicts(path))[-args.tail:])
+        timed("CommentArchive, cold index", lambda: read_tail(path, args.tail))
+        timed("CommentArchive, warm index", lambda: read_tail(path, args.tail))
+
+
+if __name__ == '__main__':
+    main()
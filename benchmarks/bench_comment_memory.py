@@ -0,0 +1,83 @@
+"""
+Benchmark: memory per Comment in a large in-memory feed.
+
+Compares the slotted, interned Comment against an equivalent plain
+dataclass. Rows are built the way merged feeds are loaded, with every
+string a fresh object, so repeated platform/author/URL values are only
+shared when they are interned.
+
+Usage:
+    python benchmarks/bench_comment_memory.py [--rows 100000 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commentradar.models import Comment
+
+
+@dataclass
+class PlainComment:
+    """The previous Comment layout: a dataclass with a per-instance __dict__."""
+
+    source_url: str
+    platform: str
+    commenter_name: str
+    comment_text: str
+    date_posted: Optional[str] = None
+    sentiment: Optional[str] = None
+    likes: Optional[int] = None
+    replies: Optional[int] = None
+
+
+PLATFORMS = ['reddit', 'hackernews', 'github', 'devto', 'blog']
+
+
+def build(cls, rows: int):
+    """Build a feed with realistic value repetition."""
+    feed = []
+    for i in range(rows):
+        feed.append(cls(
+            source_url=''.join(['https://blog.example.com/posts/', str(i % 500)]),
+            platform=''.join(PLATFORMS[i % len(PLATFORMS)]),
+            commenter_name=''.join(['user', str(i % 5000)]),
+            comment_text=f"Comment number {i} about nutrition software pricing",
+            date_posted=f"2024-01-{i % 28 + 1:02d}T10:00:00Z",
+            sentiment=('positive', 'negative', 'neutral')[i % 3],
+            likes=i % 100,
+        ))
+    return feed
+
+
+def measure(cls, rows: int) -> float:
+    """Return retained bytes per comment."""
+    gc.collect()
+    tracemalloc.start()
+    feed = build(cls, rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del feed
+    return current / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'plain B/row':>12} {'slotted B/row':>14} {'saving':>8}")
+    for rows in args.rows:
+        plain = measure(PlainComment, rows)
+        slotted = measure(Comment, rows)
+        print(f"{rows:>10} {plain:>12.1f} {slotted:>14.1f} {1 - slotted / plain:>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: near-duplicate lookups against a large index.
+
+Builds a ``NearDuplicateIndex`` over synthetic comments, saves and reloads
+its sidecar, then times lookups of edited copies (hits) and of unrelated
+texts (misses).
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--rows 100000] [--queries 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commentradar.storage.lsh import NearDuplicateIndex
+
+
+WORDS = (
+    "app price support team release update bug fix feature users sync login "
+    "export data fast slow crash great terrible pricing plan free trial mobile "
+    "desktop web api docs billing refund account cloud backup offline search"
+).split()
+
+
+def make_text(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(15, 40)))
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = [make_text(rng) for _ in range(args.rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'comments.jsonl.lsh')
+        index = NearDuplicateIndex(path)
+
+        print(f"{args.rows} comments")
+
+        def build():
+            for i, text in enumerate(texts):
+                index.add(f"{i:016x}", text)
+            index.flush()
+
+        timed("build and save", build)
+        print(f"  {'sidecar size':<40} {os.path.getsize(path) / 1e6:8.1f} MB")
+        start = time.perf_counter()
+        index = NearDuplicateIndex(path)
+        print(f"  {'reload':<40} {time.perf_counter() - start:8.3f}s")
+
+        hits = [texts[rng.randrange(args.rows)] + " (cross-posted)" for _ in range(args.queries)]
+        misses = [make_text(rng) for _ in range(args.queries)]
+        for label, queries in (("edited copies", hits), ("unrelated texts", misses)):
+            found = 0
+            start = time.perf_counter()
+            for text in queries:
+                found += bool(index.query(text))
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<40} {elapsed / len(queries) * 1e3:8.3f}ms per lookup, {found} matched")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: re-scoring an archive's worth of comments.
+
+Compares ``analyze_sentiment`` called per comment against the NumPy batch
+scorer (``VectorizedLexiconScorer``), and checks that the labels agree.
+
+Usage:
+    python benchmarks/bench_sentiment.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commentradar.utils.sentiment import analyze_sentiment
+from commentradar.utils.sentiment_vectorized import VectorizedLexiconScorer
+
+
+WORDS = (
+    "the app is great but pricing isn't good and support was terrible honestly "
+    "we switched to it last month, the sync is fast and I love the export. "
+    "Not bad overall; docs are poor, onboarding awful, but the API is excellent!"
+).split()
+
+
+def build(rows: int):
+    rng = random.Random(42)
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 80))) for _ in range(rows)]
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    texts = build(args.rows)
+    print(f"{args.rows} comments")
+
+    scalar, scalar_time = timed("analyze_sentiment per comment", lambda: [analyze_sentiment(t) for t in texts])
+    scorer = VectorizedLexiconScorer()
+    vectorized, vectorized_time = timed("VectorizedLexiconScorer.label", lambda: scorer.label(texts))
+
+    print(f"  {'speedup':<40} {scalar_time / vectorized_time:8.1f}x")
+    print(f"  {'labels match':<40} {str(scalar == vectorized):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: serializing a large comment collection.
+
+Compares the previous path (``dataclasses.asdict`` + stdlib ``json.dumps``
+with ``indent=2``) against the field-getter encoder with the active JSON
+backend (orjson when installed), in indented and compact modes.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 1000000]
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from commentradar.models import Comment, CommentCollection
+from commentradar.serialization import backend_name
+
+
+def build(rows: int) -> CommentCollection:
+    collection = CommentCollection()
+    collection.extend(
+        Comment(
+            source_url=f"https://blog.example.com/posts/{i % 500}",
+            platform=('reddit', 'hackernews', 'github', 'devto', 'blog')[i % 5],
+            commenter_name=f"user{i % 5000}",
+            comment_text=f"Comment number {i} about nutrition software pricing and features",
+            date_posted=f"2024-01-{i % 28 + 1:02d}T10:00:00Z",
+            sentiment=('positive', 'negative', 'neutral')[i % 3],
+            likes=i % 100,
+        )
+        for i in range(rows)
+    )
+    return collection
+
+
+def timed(label: str, func, baseline: float = None) -> float:
+    start = time.perf_counter()
+    output = func()
+    elapsed = time.perf_counter() - start
+    speedup = f"{baseline / elapsed:6.1f}x" if baseline else "     -"
+    print(f"  {label:<38} {elapsed:7.2f}s {speedup}  ({len(output) / 1e6:.0f} MB)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    collection = build(args.rows)
+    print(f"{args.rows} comments, JSON backend: {backend_name()}")
+
+    baseline = timed(
+        "asdict + json.dumps(indent=2)",
+        lambda: json.dumps([dataclasses.asdict(c) for c in collection], ensure_ascii=False, indent=2)
+    )
+    timed("to_json() indented", lambda: collection.to_json(), baseline)
+    timed("to_json(indent=None) compact", lambda: collection.to_json(indent=None), baseline)
+
+
+if __name__ == '__main__':
+    main()
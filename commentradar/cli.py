@@ -8,9 +8,21 @@ import logging
 from typing import Optional
 
 from commentradar.scraper_manager import ScraperManager
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.utils.query import QueryError, compile_query
+from commentradar.utils.sentiment import DEFAULT_BACKEND, available_backends
 from commentradar import __version__
 
 
+def query_expression(value: str) -> str:
+    """Validate a --where expression before any scraping starts."""
+    try:
+        compile_query(value)
+    except QueryError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
 def setup_logging(verbose: bool = False):
     """
     Configure logging.
@@ -72,7 +84,13 @@ def create_parser() -> argparse.ArgumentParser:
         '--output',
         type=str,
         default='comments.json',
-        help='Output JSON file path (default: comments.json)'
+        help='Output file path; .jsonl writes JSON Lines (default: comments.json)'
+    )
+    
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write compact single-line JSON instead of indented JSON'
     )
     
     # Filtering options
@@ -109,6 +127,13 @@ def create_parser() -> argparse.ArgumentParser:
         help='Maximum comment text length'
     )
     
+    filter_group.add_argument(
+        '--where',
+        type=query_expression,
+        metavar='EXPR',
+        help='Filter expression, e.g. "platform = reddit and (likes >= 10 or text ~ /pricing/i)"'
+    )
+    
     # Additional options
     parser.add_argument(
         '--analyze-sentiment',
@@ -116,6 +141,13 @@ def create_parser() -> argparse.ArgumentParser:
         help='Add sentiment analysis to comments'
     )
     
+    parser.add_argument(
+        '--sentiment-backend',
+        choices=available_backends(),
+        default=DEFAULT_BACKEND,
+        help=f'Sentiment scorer, loaded only when used (default: {DEFAULT_BACKEND})'
+    )
+    
     parser.add_argument(
         '--verbose',
         '-v',
@@ -148,11 +180,20 @@ def main(args: Optional[list] = None):
         if 'all' in platforms:
             platforms = ['blog', 'facebook', 'instagram', 'google']
         
+        # Date and length filters are also enforced while scraping
+        constraints = SourceConstraints(
+            start_date=parsed_args.filter_date_start,
+            end_date=parsed_args.filter_date_end,
+            min_length=parsed_args.min_length,
+            max_length=parsed_args.max_length
+        )
+        
         # Create scraper manager
         manager = ScraperManager(
             topic=parsed_args.topic,
             platforms=platforms,
-            limit=parsed_args.limit
+            limit=parsed_args.limit,
+            constraints=constraints
         )
         
         # Scrape comments
@@ -162,15 +203,16 @@ def main(args: Optional[list] = None):
         # Add sentiment analysis if requested
         if parsed_args.analyze_sentiment:
             logger.info("Analyzing sentiment...")
-            manager.add_sentiment_analysis()
+            manager.add_sentiment_analysis(backend=parsed_args.sentiment_backend)
         
         # Apply filters
-        if any([
+        if any(option is not None for option in [
             parsed_args.filter_date_start,
             parsed_args.filter_date_end,
             parsed_args.sentiment,
             parsed_args.min_length,
-            parsed_args.max_length
+            parsed_args.max_length,
+            parsed_args.where
         ]):
             logger.info("Applying filters...")
             manager.apply_filters(
@@ -178,11 +220,12 @@ def main(args: Optional[list] = None):
                 end_date=parsed_args.filter_date_end,
                 sentiment=parsed_args.sentiment,
                 min_length=parsed_args.min_length,
-                max_length=parsed_args.max_length
+                max_length=parsed_args.max_length,
+                where=parsed_args.where
             )
         
         # Save results
-        manager.save_results(parsed_args.output)
+        manager.save_results(parsed_args.output, compact=parsed_args.compact)
         
         logger.info(f"✓ Successfully saved {len(manager.collection)} comments to {parsed_args.output}")
         return 0
@@ -0,0 +1,170 @@
+"""
+Columnar backend for comment collections.
+
+Holds one array per field so filters, counts and top-k run as vectorized
+NumPy operations instead of per-object attribute access. Requires the
+optional ``numpy`` dependency (``pip install commentradar[fast]``).
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from commentradar.models import Comment
+from commentradar.utils.dates import parse_date_bound
+
+
+# Timestamp stored for comments without a parseable date
+MISSING_TIMESTAMP = -(2 ** 63)
+
+
+def _encode(values: Sequence, categories: List[str]) -> 'np.ndarray':
+    """Encode values as integer codes into ``categories`` (-1 for missing)."""
+    index = {category: code for code, category in enumerate(categories)}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = -1
+            continue
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(categories)
+            categories.append(value)
+        codes[i] = code
+    return codes
+
+
+class CommentColumns:
+    """Column arrays built from a list of comments."""
+
+    def __init__(self, comments: List[Comment]):
+        """
+        Build the columns.
+
+        Args:
+            comments: Comments to index; row ``i`` refers to ``comments[i]``
+        """
+        if np is None:
+            raise ImportError("The columnar backend requires numpy. Install with: pip install numpy")
+
+        self.comments = comments
+        # Rows built; comments appended to the list later are not indexed
+        self.rows = n = len(comments)
+
+        self.timestamps = np.fromiter(
+            (MISSING_TIMESTAMP if ts is None else ts
+             for ts in (c.timestamp for c in comments)),
+            dtype=np.int64, count=n
+        )
+        self.text_lengths = np.fromiter((len(c.comment_text) for c in comments), dtype=np.int64, count=n)
+        self.likes = np.fromiter((c.likes or 0 for c in comments), dtype=np.int64, count=n)
+
+        self.platforms: List[str] = []
+        self.platform_codes = _encode([c.platform for c in comments], self.platforms)
+        self.sentiments: List[str] = []
+        self.sentiment_codes = _encode(
+            [c.sentiment.lower() if c.sentiment else None for c in comments], self.sentiments
+        )
+
+    def __len__(self):
+        return self.rows
+
+    def mask(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None
+    ) -> 'np.ndarray':
+        """
+        Compute a boolean row mask for the given filters.
+
+        Args:
+            start_date: Keep comments on or after this date
+            end_date: Keep comments on or before this date
+            sentiment: Keep comments with this sentiment
+            min_length: Minimum comment text length
+            max_length: Maximum comment text length
+
+        Returns:
+            Boolean array with one entry per comment
+        """
+        mask = np.ones(self.rows, dtype=bool)
+
+        if start_date is not None or end_date is not None:
+            mask &= self.timestamps != MISSING_TIMESTAMP
+            if start_date is not None:
+                mask &= self.timestamps >= parse_date_bound(start_date)
+            if end_date is not None:
+                mask &= self.timestamps <= parse_date_bound(end_date, end=True)
+
+        if sentiment is not None:
+            mask &= self.sentiment_codes == self._code(self.sentiments, sentiment.lower())
+
+        if min_length is not None:
+            mask &= self.text_lengths >= min_length
+        if max_length is not None:
+            mask &= self.text_lengths <= max_length
+
+        return mask
+
+    def select(self, mask: 'np.ndarray') -> List[Comment]:
+        """Return the comments selected by a row mask, in order."""
+        comments = self.comments
+        return [comments[i] for i in np.flatnonzero(mask)]
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        """
+        Count comments per platform or sentiment.
+
+        Args:
+            field: 'platform' or 'sentiment'
+
+        Returns:
+            Mapping of value to count, most common first
+        """
+        categories, codes = self._categorical(field)
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        order = np.argsort(-counts, kind='stable')
+        return {categories[i]: int(counts[i]) for i in order if counts[i]}
+
+    def top_k(self, k: int, by: str = 'likes') -> List[Comment]:
+        """
+        Return the ``k`` comments with the highest value of a numeric column.
+
+        Args:
+            k: Number of comments
+            by: 'likes' or 'text_length'
+
+        Returns:
+            Comments in descending order of the column, earlier comments
+            first among equal values (like ``heapq.nlargest``)
+        """
+        values = {'likes': self.likes, 'text_length': self.text_lengths}[by]
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        # Every row tied with the k-th value is a candidate, in row order
+        threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+        candidates = np.flatnonzero(values >= threshold)
+        top = candidates[np.argsort(-values[candidates], kind='stable')[:k]]
+        return [self.comments[i] for i in top]
+
+    def _categorical(self, field: str):
+        if field == 'platform':
+            return self.platforms, self.platform_codes
+        if field == 'sentiment':
+            return self.sentiments, self.sentiment_codes
+        raise ValueError(f"Unknown categorical field: {field}")
+
+    @staticmethod
+    def _code(categories: List[str], value: str) -> int:
+        try:
+            return categories.index(value)
+        except ValueError:
+            return -2  # Matches no row, including missing values
+
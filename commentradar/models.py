@@ -2,15 +2,99 @@
 Data models for CommentRadar.
 """
 
-from dataclasses import dataclass, asdict
+from collections import Counter
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-import json
+import bisect
+import hashlib
+import heapq
+import re
+import sys
 
+from commentradar.serialization import dumps, make_dict_encoder
 
+
+def _slotted(*extra_slots: str):
+    """
+    Recreate a dataclass with ``__slots__`` instead of a per-instance ``__dict__``.
+    
+    Equivalent to ``dataclass(slots=True)``, which needs Python 3.10.
+    
+    Args:
+        extra_slots: Slots for non-field attributes, such as cached values
+    """
+    return lambda cls: _make_slotted(cls, extra_slots)
+
+
+def _make_slotted(cls, extra_slots):
+    field_names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = field_names + tuple(extra_slots)
+    # Field defaults live in the generated __init__; as class attributes
+    # they would conflict with the slots
+    for name in field_names + ('__dict__', '__weakref__'):
+        namespace.pop(name, None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _intern(value):
+    """Intern a string so repeated values share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _normalize(value: Optional[str]) -> str:
+    """Normalize a string for identity hashing: collapse whitespace, casefold."""
+    if not value:
+        return ''
+    return _WHITESPACE_RE.sub(' ', value).strip().casefold()
+
+
+def _normalize_url(url: Optional[str]) -> str:
+    """Normalize a URL for identity hashing: drop the fragment and trailing slash."""
+    if not url:
+        return ''
+    return url.strip().split('#', 1)[0].rstrip('/')
+
+
+class _Unparsed:
+    """Marks a timestamp that has not been parsed yet (None means unparseable)."""
+    
+    __slots__ = ()
+    
+    def __reduce__(self):
+        # Pickled and copied comments refer to the same marker
+        return '_UNPARSED'
+    
+    def __repr__(self):
+        return '<unparsed>'
+
+
+_UNPARSED = _Unparsed()
+
+# Fields the cached id and timestamp are computed from
+_ID_FIELDS = frozenset(('source_url', 'platform', 'commenter_name', 'comment_text'))
+_TIMESTAMP_FIELDS = frozenset(('date_posted', 'platform'))
+
+
+@_slotted('_id', '_timestamp')
 @dataclass
 class Comment:
-    """Represents a single comment from any platform."""
+    """
+    Represents a single comment from any platform.
+    
+    Instances are slotted, and the platform, commenter name and source URL
+    are interned, since the same values repeat across thousands of comments
+    in merged feeds.
+    
+    ``id`` is a stable content hash of the platform, URL, author and text,
+    so the same comment scraped twice has the same id. ``timestamp`` is
+    ``date_posted`` normalized to epoch seconds. Both are cached, and
+    recomputed after the fields they derive from are reassigned.
+    """
     
     source_url: str
     platform: str
@@ -21,62 +105,269 @@ class Comment:
     likes: Optional[int] = None
     replies: Optional[int] = None
     
+    def __init__(
+        self,
+        source_url: str,
+        platform: str,
+        commenter_name: str,
+        comment_text: str,
+        date_posted: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        likes: Optional[int] = None,
+        replies: Optional[int] = None
+    ):
+        # Written directly, bypassing __setattr__: nothing is cached yet
+        set_field = object.__setattr__
+        set_field(self, 'source_url', _intern(source_url))
+        set_field(self, 'platform', _intern(platform))
+        set_field(self, 'commenter_name', _intern(commenter_name))
+        set_field(self, 'comment_text', comment_text)
+        set_field(self, 'date_posted', date_posted)
+        set_field(self, 'sentiment', sentiment)
+        set_field(self, 'likes', likes)
+        set_field(self, 'replies', replies)
+        set_field(self, '_id', None)
+        set_field(self, '_timestamp', _UNPARSED)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _ID_FIELDS:
+            object.__setattr__(self, '_id', None)
+        if name in _TIMESTAMP_FIELDS:
+            object.__setattr__(self, '_timestamp', _UNPARSED)
+    
+    @property
+    def id(self) -> str:
+        """Stable 16-character hex identity, computed once."""
+        if self._id is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for part in (
+                _normalize(self.platform),
+                _normalize_url(self.source_url),
+                _normalize(self.commenter_name),
+                _normalize(self.comment_text),
+            ):
+                digest.update(part.encode('utf-8'))
+                digest.update(b'\x1f')
+            self._id = digest.hexdigest()
+        return self._id
+    
+    @property
+    def timestamp(self) -> Optional[int]:
+        """``date_posted`` as epoch seconds, parsed once (None if missing or unparseable)."""
+        if self._timestamp is _UNPARSED:
+            from commentradar.utils.dates import parse_date_to_epoch
+            self._timestamp = parse_date_to_epoch(self.date_posted, self.platform)
+        return self._timestamp
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Comment':
+        """Create a comment from a dictionary, ignoring unknown keys."""
+        comment = cls(**{name: data[name] for name in _FIELD_NAMES if name in data})
+        # Trust a stored id instead of rehashing the text
+        comment._id = data.get('id')
+        return comment
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert comment to dictionary."""
-        return asdict(self)
+        return _comment_to_dict(self)
+    
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Convert comment to JSON string (compact with ``indent=None``)."""
+        return dumps(self.to_dict(), indent=indent)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(Comment))
+
+# Field values are immutable, so a shallow field-by-field copy is enough;
+# the id is stored with the row
+_comment_to_dict = make_dict_encoder(_FIELD_NAMES + ('id',))
+
+
+def comment_id(data: Dict[str, Any]) -> str:
+    """
+    Return the id of a stored comment row.
     
-    def to_json(self) -> str:
-        """Convert comment to JSON string."""
-        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+    Rows written before ids were stored get their id computed.
+    """
+    return data.get('id') or Comment.from_dict(data).id
 
 
 class CommentCollection:
-    """Collection of comments with utility methods."""
+    """
+    Collection of comments with utility methods.
+    
+    With ``columnar=True``, filters, counts and top-k run as vectorized
+    operations over per-field arrays (see ``commentradar.columnar``, needs
+    numpy). The list and iteration API is the same for both backends.
     
-    def __init__(self):
+    Date range filters use a sorted timestamp index built on first use, so
+    they cost a binary search plus the size of the result.
+    """
+    
+    def __init__(self, columnar: bool = False):
         self.comments: List[Comment] = []
+        self.columnar = columnar
+        self._columns = None
+        self._date_index = None
+        self._date_index_of = None
     
     def add(self, comment: Comment):
         """Add a comment to the collection."""
         self.comments.append(comment)
+        self._columns = None
+        self._date_index = None
     
     def extend(self, comments: List[Comment]):
         """Add multiple comments to the collection."""
         self.comments.extend(comments)
+        self._columns = None
+        self._date_index = None
+    
+    @property
+    def columns(self):
+        """
+        Column arrays for the current comments, built on first use.
+        
+        Adding comments rebuilds them; call ``invalidate_columns`` after
+        modifying comments in place (e.g. adding sentiment).
+        """
+        columns = self._columns
+        if columns is None or columns.comments is not self.comments or len(columns) != len(self.comments):
+            from commentradar.columnar import CommentColumns
+            columns = self._columns = CommentColumns(self.comments)
+        return columns
+    
+    def invalidate_columns(self):
+        """Drop cached column arrays after comments were modified in place."""
+        self._columns = None
+    
+    @property
+    def date_index(self):
+        """
+        Timestamps in ascending order with the matching comment positions.
+        
+        Comments without a parseable date are left out. The index is
+        rebuilt when comments are added or the ``comments`` list is
+        replaced.
+        """
+        index = self._date_index
+        if index is None or self._date_index_of is not self.comments or index[2] != len(self.comments):
+            dated = sorted(
+                (c.timestamp, i) for i, c in enumerate(self.comments) if c.timestamp is not None
+            )
+            index = self._date_index = (
+                [ts for ts, _ in dated], [i for _, i in dated], len(self.comments)
+            )
+            self._date_index_of = self.comments
+        return index
     
     def to_dict(self) -> List[Dict[str, Any]]:
         """Convert all comments to a list of dictionaries."""
         return [comment.to_dict() for comment in self.comments]
     
-    def to_json(self, indent: int = 2) -> str:
-        """Convert all comments to JSON string."""
-        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Convert all comments to JSON string (compact with ``indent=None``)."""
+        return dumps(self.to_dict(), indent=indent)
     
-    def save_to_file(self, filepath: str):
-        """Save comments to a JSON file."""
+    def save_to_file(self, filepath: str, compact: bool = False):
+        """
+        Save comments to a file.
+        
+        Paths ending in .jsonl or .ndjson are written as JSON Lines, one
+        comment per line; .db, .sqlite and .sqlite3 paths replace the
+        contents of a SQLite store; anything else is written as a JSON
+        array, indented unless ``compact`` is set.
+        """
+        from commentradar.storage.jsonl import is_jsonl_path, write_jsonl
+        from commentradar.storage.sqlite import SQLiteCommentStore, is_sqlite_path
+        
+        if is_jsonl_path(filepath):
+            write_jsonl(self.comments, filepath)
+            return
+        if is_sqlite_path(filepath):
+            with SQLiteCommentStore(filepath) as store:
+                store.clear()
+                store.add(self.comments)
+            return
+        
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self.to_json())
+            f.write(self.to_json(indent=None if compact else 2))
+    
+    @classmethod
+    def load_from_file(cls, filepath: str, columnar: bool = False) -> 'CommentCollection':
+        """Load comments from a JSON Lines, JSON array or SQLite file."""
+        from commentradar.storage.jsonl import iter_comment_dicts
+        from commentradar.storage.sqlite import SQLiteCommentStore, is_sqlite_path
+        
+        collection = cls(columnar=columnar)
+        if is_sqlite_path(filepath):
+            with SQLiteCommentStore(filepath) as store:
+                collection.extend(list(store))
+            return collection
+        collection.extend([Comment.from_dict(row) for row in iter_comment_dicts(filepath)])
+        return collection
     
     def filter_by_date(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
-        """Filter comments by date range."""
+        """
+        Filter comments by date range, keeping collection order.
+        
+        Bounds are inclusive; a bare ``YYYY-MM-DD`` end date covers that
+        whole day. Comments without a parseable date are dropped.
+        
+        Raises:
+            ValueError: If a bound cannot be parsed
+        """
         if not start_date and not end_date:
             return self.comments
         
-        filtered = []
-        for comment in self.comments:
-            if comment.date_posted:
-                # Simple date comparison (assumes ISO format)
-                if start_date and comment.date_posted < start_date:
-                    continue
-                if end_date and comment.date_posted > end_date:
-                    continue
-                filtered.append(comment)
+        if self.columnar:
+            return self.columns.select(self.columns.mask(start_date=start_date, end_date=end_date))
+        
+        from commentradar.utils.dates import parse_date_bound
         
-        return filtered
+        timestamps, positions, _ = self.date_index
+        lo = bisect.bisect_left(timestamps, parse_date_bound(start_date)) if start_date else 0
+        hi = bisect.bisect_right(timestamps, parse_date_bound(end_date, end=True)) if end_date else len(timestamps)
+        return [self.comments[i] for i in sorted(positions[lo:hi])]
     
     def filter_by_sentiment(self, sentiment: str):
-        """Filter comments by sentiment (positive, negative, neutral)."""
-        return [c for c in self.comments if c.sentiment == sentiment.lower()]
+        """Filter comments by sentiment (positive, negative, neutral), ignoring case."""
+        if self.columnar:
+            return self.columns.select(self.columns.mask(sentiment=sentiment))
+        sentiment = sentiment.lower()
+        return [c for c in self.comments if c.sentiment and c.sentiment.lower() == sentiment]
+    
+    def count_by(self, field: str) -> Dict[str, int]:
+        """
+        Count comments per value of a field (e.g. 'platform', 'sentiment').
+        
+        Sentiments are counted in lower case, as they are filtered.
+        
+        Returns:
+            Mapping of value to count, most common first
+        """
+        if self.columnar and field in ('platform', 'sentiment'):
+            return self.columns.count_by(field)
+        if field == 'sentiment':
+            counts = Counter(c.sentiment.lower() if c.sentiment else None for c in self.comments)
+        else:
+            counts = Counter(getattr(c, field) for c in self.comments)
+        counts.pop(None, None)
+        return dict(counts.most_common())
+    
+    def top_k(self, k: int, by: str = 'likes') -> List[Comment]:
+        """
+        Return the ``k`` comments with the most likes (or longest text,
+        with ``by='text_length'``).
+        """
+        if self.columnar:
+            return self.columns.top_k(k, by=by)
+        if by == 'text_length':
+            key = lambda c: len(c.comment_text)
+        else:
+            key = lambda c: getattr(c, by) or 0
+        return heapq.nlargest(k, self.comments, key=key)
     
     def __len__(self):
         """Return the number of comments."""
@@ -85,4 +376,3 @@ class CommentCollection:
     def __iter__(self):
         """Make the collection iterable."""
         return iter(self.comments)
-
@@ -1,17 +1,30 @@
 """
 Scheduled scraping module for CommentRadar.
 Run scraping tasks on a schedule (e.g., every 30 minutes).
+
+``ScheduledScraper`` scrapes one topic; ``SchedulerService`` runs many of
+them from one process, on a shared worker pool. Jobs can be listed in an
+INI file and started with ``python -m commentradar.scheduler --config``.
 """
 
-import time
+import configparser
+import heapq
 import logging
-import schedule
-from datetime import datetime
-from typing import Optional, List
-import json
 import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
 
+from commentradar.models import CommentCollection
 from commentradar.scraper_manager import ScraperManager
+from commentradar.storage import CommentStore, open_store
+from commentradar.storage.lsh import LSH_SUFFIX, NearDuplicateIndex
+from commentradar.utils.sentiment import DEFAULT_BACKEND, available_backends, warm_up
+from commentradar.utils.sentiment_cache import CACHE_SUFFIX, SentimentCache
 
 
 logging.basicConfig(
@@ -31,7 +44,9 @@ class ScheduledScraper:
         output_file: str = "comments.json",
         limit: Optional[int] = None,
         analyze_sentiment: bool = False,
-        append_mode: bool = True
+        append_mode: bool = True,
+        collapse_near_duplicates: bool = False,
+        sentiment_backend: str = DEFAULT_BACKEND
     ):
         """
         Initialize the scheduled scraper.
@@ -39,10 +54,18 @@ class ScheduledScraper:
         Args:
             topic: Topic to scrape
             platforms: List of platforms
-            output_file: Output JSON file path
+            output_file: Output file path (.db/.sqlite upserts into an
+                indexed SQLite store; .jsonl and .json files are appended
+                to, deduplicated by an id index kept in ``<output>.ids``)
             limit: Max comments per run
-            analyze_sentiment: Whether to analyze sentiment
+            analyze_sentiment: Whether to analyze sentiment (scores are cached
+                in ``<output>.sentiment``, so known texts are not rescored)
             append_mode: If True, append to existing file; if False, overwrite
+            collapse_near_duplicates: Drop comments whose text nearly matches
+                a stored comment (e.g. cross-posts), using a MinHash index
+                kept next to the output file (``<output>.lsh``)
+            sentiment_backend: Sentiment backend name (loaded before the
+                first run by ``run_every`` and ``SchedulerService``)
         """
         self.topic = topic
         self.platforms = platforms
@@ -50,10 +73,53 @@ class ScheduledScraper:
         self.limit = limit
         self.analyze_sentiment = analyze_sentiment
         self.append_mode = append_mode
+        self.collapse_near_duplicates = collapse_near_duplicates
+        self.sentiment_backend = sentiment_backend
         self.run_count = 0
+        self._store = None
+        self._near_duplicates = None
+        self._sentiment_cache = None
+    
+    @property
+    def store(self) -> CommentStore:
+        """Store for the output file, opened once and kept open."""
+        if self._store is None:
+            self._store = open_store(self.output_file)
+        return self._store
+    
+    @property
+    def near_duplicates(self) -> NearDuplicateIndex:
+        """Near-duplicate index for the output file, built from it on first use."""
+        if self._near_duplicates is None:
+            index = NearDuplicateIndex(self.output_file + LSH_SUFFIX)
+            if len(index) == 0 and os.path.exists(self.output_file):
+                logger.info(f"Indexing existing comments in {self.output_file} for near-duplicates")
+                for comment in self._existing_comments():
+                    index.add(comment.id, comment.comment_text)
+                index.flush()
+            self._near_duplicates = index
+        return self._near_duplicates
+    
+    @property
+    def sentiment_cache(self) -> SentimentCache:
+        """Sentiment score cache next to the output file."""
+        if self._sentiment_cache is None:
+            self._sentiment_cache = SentimentCache(self.output_file + CACHE_SUFFIX)
+        return self._sentiment_cache
+    
+    def _existing_comments(self):
+        return iter(self.store)
+        
+    def scrape_job(self) -> bool:
+        """
+        Execute a single scraping job.
+        
+        Errors are logged rather than raised, so a failed run does not stop
+        the schedule.
         
-    def scrape_job(self):
-        """Execute a single scraping job."""
+        Returns:
+            True if the run completed, False if it failed
+        """
         self.run_count += 1
         logger.info(f"Starting scheduled scrape #{self.run_count} at {datetime.now()}")
         
@@ -70,54 +136,45 @@ class ScheduledScraper:
             
             # Add sentiment if requested
             if self.analyze_sentiment:
-                manager.add_sentiment_analysis()
+                manager.add_sentiment_analysis(backend=self.sentiment_backend, cache=self.sentiment_cache)
             
             if len(collection) == 0:
                 logger.warning("No new comments found")
-                return
+                return True
             
-            # Handle append vs overwrite mode
-            if self.append_mode and os.path.exists(self.output_file):
-                # Load existing data
-                with open(self.output_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-                
-                # Get new data
-                new_data = collection.to_dict()
-                
-                # Remove duplicates based on source_url and comment_text
-                existing_keys = {
-                    (c['source_url'], c['comment_text']) 
-                    for c in existing_data
-                }
-                
-                unique_new_comments = [
-                    c for c in new_data 
-                    if (c['source_url'], c['comment_text']) not in existing_keys
-                ]
-                
-                # Merge
-                merged_data = existing_data + unique_new_comments
-                
-                # Save merged data
-                with open(self.output_file, 'w', encoding='utf-8') as f:
-                    json.dump(merged_data, f, ensure_ascii=False, indent=2)
-                
-                logger.info(
-                    f"✓ Added {len(unique_new_comments)} new comments "
-                    f"(Total: {len(merged_data)})"
-                )
-            else:
-                # Overwrite mode
-                manager.save_results(self.output_file)
-                logger.info(f"✓ Saved {len(collection)} comments to {self.output_file}")
+            if self.collapse_near_duplicates:
+                if not self.append_mode:
+                    self.near_duplicates.clear()
+                kept = self.near_duplicates.collapse(collection)
+                collection = CommentCollection()
+                collection.extend(kept)
+                manager.collection = collection
+            
+            # Only the new rows are written; the store's id index stays
+            # loaded between runs
+            if not self.append_mode:
+                self.store.clear()
+            unique_new_comments = self.store.add(collection)
+            logger.info(
+                f"✓ Added {len(unique_new_comments)} new comments to {self.output_file} "
+                f"(Total: {len(self.store)})"
+            )
+            
+            if self.collapse_near_duplicates:
+                # Only persisted once the comments themselves are written
+                self.near_duplicates.flush()
             
         except Exception as e:
             logger.error(f"Error in scrape job: {e}", exc_info=True)
+            return False
+        return True
     
-    def run_every(self, minutes: int):
+    def run_every(self, minutes: float):
         """
-        Run scraping every N minutes.
+        Run scraping every N minutes, starting now.
+        
+        A run that is still going when the next one is due makes that
+        cycle be skipped rather than queued.
         
         Args:
             minutes: Interval in minutes
@@ -128,22 +185,315 @@ class ScheduledScraper:
         logger.info(f"Output: {self.output_file}")
         logger.info(f"Append mode: {self.append_mode}")
         
-        # Schedule the job
-        schedule.every(minutes).minutes.do(self.scrape_job)
+        # Runs once immediately, then every interval
+        job = TopicJob(self.topic, self.scrape_job, interval=minutes * 60)
+        service = SchedulerService(
+            [job],
+            workers=1,
+            sentiment_backends=[self.sentiment_backend] if self.analyze_sentiment else None
+        )
+        logger.info("Scheduler is running. Press Ctrl+C to stop.")
+        service.run()
+        logger.info(f"Total runs completed: {self.run_count}")
+
+
+PLATFORMS = ['blog', 'facebook', 'instagram', 'google']
+
+# Start-time jitter in seconds, so jobs with the same interval spread out
+DEFAULT_JITTER = 30.0
+
+# Seconds between timing summaries of a running service
+REPORT_INTERVAL = 3600.0
+
+
+@dataclass
+class TopicJob:
+    """
+    A job run by ``SchedulerService``, with its timing statistics.
+    
+    A run fails when ``run`` raises or returns False (as
+    ``ScheduledScraper.scrape_job`` does after logging an error).
+    """
+
+    name: str
+    run: Callable[[], object]
+    interval: float
+    jitter: float = 0.0
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    last_duration: Optional[float] = None
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    @property
+    def mean_duration(self) -> Optional[float]:
+        return self.total_duration / self.runs if self.runs else None
+
+
+class SchedulerService:
+    """
+    Run many jobs on their own intervals from one process.
+    
+    A single scheduling thread starts due jobs on a shared thread pool, so
+    a slow job never delays the others. A job that is still running when
+    it is due again skips that cycle. Each start is delayed by a random
+    jitter of up to the job's ``jitter`` seconds, so jobs sharing an
+    interval do not all hit the network at once; the schedule itself does
+    not drift.
+    """
+    
+    def __init__(
+        self,
+        jobs: List[TopicJob],
+        workers: Optional[int] = None,
+        report_interval: float = REPORT_INTERVAL,
+        sentiment_backends: Optional[List[str]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the service.
         
-        # Run once immediately
-        logger.info("Running initial scrape...")
-        self.scrape_job()
+        Args:
+            jobs: Jobs to run
+            workers: Worker threads shared by all jobs (default: one per
+                job, up to 32)
+            report_interval: Seconds between timing summaries in the log
+            sentiment_backends: Sentiment backends the jobs use, loaded by
+                ``run`` before the first runs instead of during them
+            clock: Monotonic time source in seconds
+        """
+        self.jobs = jobs
+        self.workers = workers or min(32, max(1, len(jobs)))
+        self.report_interval = report_interval
+        self.sentiment_backends = list(dict.fromkeys(sentiment_backends or ()))
+        self.clock = clock
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, path: str) -> 'SchedulerService':
+        """
+        Build a service from an INI file.
         
-        # Keep running
-        logger.info("Scheduler is running. Press Ctrl+C to stop.")
+        Each ``[job:<name>]`` section is a ``ScheduledScraper``; keys in
+        ``[DEFAULT]`` apply to every job, and ``[scheduler]`` sets
+        ``workers``::
+        
+            [DEFAULT]
+            interval = 30            # minutes
+            jitter = 30              # seconds
+            platforms = blog google
+            limit = 50
+            analyze_sentiment = true
+            
+            [scheduler]
+            workers = 8
+            
+            [job:dental]
+            topic = dental clinics
+            output = dental.jsonl
+        
+        Other job keys: ``sentiment_backend``, ``overwrite`` and
+        ``collapse_near_duplicates``. ``topic`` defaults to the section
+        name and ``output`` to ``<name>.jsonl``.
+        
+        Args:
+            path: Config file path
+        
+        Returns:
+            A service for the configured jobs
+        
+        Raises:
+            ValueError: If the file is missing or has no valid jobs
+        """
+        config = configparser.ConfigParser(inline_comment_prefixes=('#', ';'))
+        if not config.read(path, encoding='utf-8'):
+            raise ValueError(f"Cannot read scheduler config: {path}")
+        
+        jobs = []
+        outputs = {}
+        backends = []
+        for section in config.sections():
+            if not section.startswith('job:'):
+                continue
+            name = section[len('job:'):].strip()
+            options = config[section]
+            try:
+                platforms = options.get('platforms', 'all').replace(',', ' ').split()
+                if 'all' in platforms:
+                    platforms = PLATFORMS
+                unknown = set(platforms) - set(PLATFORMS)
+                if unknown:
+                    raise ValueError(f"unknown platforms {', '.join(sorted(unknown))}")
+                backend = options.get('sentiment_backend', DEFAULT_BACKEND)
+                if backend not in available_backends():
+                    raise ValueError(f"unknown sentiment backend {backend}")
+                limit = options.getint('limit', fallback=None)
+                scraper = ScheduledScraper(
+                    topic=options.get('topic', name),
+                    platforms=platforms,
+                    output_file=options.get('output', f"{name}.jsonl"),
+                    limit=limit,
+                    analyze_sentiment=options.getboolean('analyze_sentiment', fallback=False),
+                    append_mode=not options.getboolean('overwrite', fallback=False),
+                    collapse_near_duplicates=options.getboolean('collapse_near_duplicates', fallback=False),
+                    sentiment_backend=backend
+                )
+                interval = options.getfloat('interval', fallback=30.0) * 60
+                jitter = options.getfloat('jitter', fallback=DEFAULT_JITTER)
+            except ValueError as e:
+                raise ValueError(f"Invalid job [{section}] in {path}: {e}") from None
+            if interval <= 0 or jitter < 0:
+                raise ValueError(f"Invalid job [{section}] in {path}: interval must be positive")
+            
+            output = os.path.abspath(scraper.output_file)
+            if output in outputs:
+                raise ValueError(f"Jobs [{outputs[output]}] and [{section}] write the same file {scraper.output_file}")
+            outputs[output] = section
+            jobs.append(TopicJob(name, scraper.scrape_job, interval=interval, jitter=jitter))
+            if scraper.analyze_sentiment:
+                backends.append(scraper.sentiment_backend)
+        
+        if not jobs:
+            raise ValueError(f"No [job:<name>] sections in {path}")
+        workers = config.getint('scheduler', 'workers', fallback=None) if config.has_section('scheduler') else None
+        return cls(jobs, workers=workers, sentiment_backends=backends)
+    
+    def _execute(self, job: TopicJob):
+        """Run a job and record its timing."""
+        start = self.clock()
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            failed = job.run() is False
+        except Exception as e:
+            failed = True
+            logger.error(f"Job {job.name} failed: {e}", exc_info=True)
+        elapsed = self.clock() - start
+        with self._lock:
+            job.runs += 1
+            job.failures += failed
+            job.last_duration = elapsed
+            job.total_duration += elapsed
+            job.max_duration = max(job.max_duration, elapsed)
+        logger.info(f"Job {job.name} finished in {elapsed:.1f}s (run {job.runs}, {job.skipped} skipped)")
+    
+    def _start(self, job: TopicJob, executor: ThreadPoolExecutor):
+        if job.running:
+            with self._lock:
+                job.skipped += 1
+            logger.warning(f"Job {job.name} is still running, skipping this cycle")
+            return
+        job.future = executor.submit(self._execute, job)
+    
+    def report(self) -> List[Dict[str, object]]:
+        """
+        Timing statistics of every job.
+        
+        Returns:
+            One dictionary per job with its name, interval, runs, skipped
+            cycles, failures and last, mean and max durations in seconds
+        """
+        with self._lock:
+            return [
+                {
+                    'name': job.name,
+                    'interval': job.interval,
+                    'runs': job.runs,
+                    'skipped': job.skipped,
+                    'failures': job.failures,
+                    'running': job.running,
+                    'last': job.last_duration,
+                    'mean': job.mean_duration,
+                    'max': job.max_duration if job.runs else None,
+                }
+                for job in self.jobs
+            ]
+    
+    def log_report(self):
+        """Log a timing summary of every job."""
+        def seconds(value):
+            return '-' if value is None else f"{value:.1f}s"
+        
+        logger.info(f"{'job':<24} {'runs':>5} {'skipped':>7} {'failed':>6} {'last':>8} {'mean':>8} {'max':>8}")
+        for row in self.report():
+            logger.info(
+                f"{row['name'][:24]:<24} {row['runs']:>5} {row['skipped']:>7} {row['failures']:>6} "
+                f"{seconds(row['last']):>8} {seconds(row['mean']):>8} {seconds(row['max']):>8}"
+            )
+    
+    def _schedule(self, now: float, initial_jitter: bool = False) -> List[tuple]:
+        """
+        Queue the first run of every job.
+        
+        Returns:
+            Heap of (due time, start time, job index); start = due + jitter
+        """
+        queue = []
+        for i, job in enumerate(self.jobs):
+            delay = random.uniform(0, job.jitter) if initial_jitter else 0.0
+            queue.append((now, now + delay, i))
+        heapq.heapify(queue)
+        return queue
+    
+    def _dispatch(self, queue: List[tuple], now: float, executor):
+        """Start the jobs whose start time has come and queue their next runs."""
+        while queue and queue[0][1] <= now:
+            due, _, i = heapq.heappop(queue)
+            job = self.jobs[i]
+            self._start(job, executor)
+            due += job.interval
+            if due <= now:
+                # Fell behind (e.g. after a suspend): resume from now
+                due = now + job.interval
+            heapq.heappush(queue, (due, due + random.uniform(0, job.jitter), i))
+    
+    def run(self, initial_jitter: bool = False):
+        """
+        Run the jobs until ``stop()`` is called or Ctrl+C is pressed.
+        
+        Every job starts once right away (after its jitter when
+        ``initial_jitter`` is set), then once per interval. The sentiment
+        backends are loaded first, once each.
+        
+        Args:
+            initial_jitter: Spread the first runs over each job's jitter
+        """
+        for backend in self.sentiment_backends:
+            # Load the model now rather than during the first scrape
+            logger.info(f"Loading sentiment backend: {backend}")
+            warm_up(backend)
+        
+        logger.info(f"Starting {len(self.jobs)} jobs on {self.workers} workers")
+        now = self.clock()
+        queue = self._schedule(now, initial_jitter)
+        next_report = now + self.report_interval
+        
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='commentradar-job')
+        try:
+            while not self._stop.is_set():
+                now = self.clock()
+                self._dispatch(queue, now, executor)
+                if now >= next_report:
+                    self.log_report()
+                    next_report = now + self.report_interval
+                wait = min(queue[0][1], next_report) - self.clock()
+                self._stop.wait(max(wait, 0.0))
         except KeyboardInterrupt:
-            logger.info("\nScheduler stopped by user")
-            logger.info(f"Total runs completed: {self.run_count}")
+            logger.info("Scheduler stopped by user")
+        finally:
+            self._stop.set()
+            logger.info("Waiting for running jobs to finish...")
+            executor.shutdown(wait=True)
+            self.log_report()
+    
+    def stop(self):
+        """Ask ``run()`` to return once running jobs finish."""
+        self._stop.set()
 
 
 def main():
@@ -155,7 +505,12 @@ def main():
         epilog='Example: python -m commentradar.scheduler --topic "tech news" --interval 30'
     )
     
-    parser.add_argument('--topic', required=True, help='Topic to scrape')
+    parser.add_argument('--topic', help='Topic to scrape')
+    parser.add_argument(
+        '--config',
+        metavar='FILE',
+        help='INI file of [job:<name>] sections to run together (instead of --topic)'
+    )
     parser.add_argument(
         '--platform',
         nargs='+',
@@ -163,18 +518,39 @@ def main():
         default=['all'],
         help='Platforms to scrape'
     )
-    parser.add_argument('--interval', type=int, default=30, help='Interval in minutes (default: 30)')
+    parser.add_argument('--interval', type=float, default=30, help='Interval in minutes (default: 30)')
     parser.add_argument('--limit', type=int, help='Max comments per run')
-    parser.add_argument('--output', default='comments.json', help='Output file')
+    parser.add_argument('--output', default='comments.json', help='Output file (.json, .jsonl or .db)')
     parser.add_argument('--analyze-sentiment', action='store_true', help='Analyze sentiment')
     parser.add_argument('--overwrite', action='store_true', help='Overwrite instead of append')
+    parser.add_argument(
+        '--collapse-near-duplicates',
+        action='store_true',
+        help='Skip comments that nearly duplicate a stored one (e.g. cross-posts)'
+    )
+    parser.add_argument(
+        '--sentiment-backend',
+        choices=available_backends(),
+        default=DEFAULT_BACKEND,
+        help=f'Sentiment scorer (default: {DEFAULT_BACKEND})'
+    )
     
     args = parser.parse_args()
     
+    if args.config:
+        try:
+            service = SchedulerService.from_config(args.config)
+        except ValueError as e:
+            parser.error(str(e))
+        service.run(initial_jitter=True)
+        return
+    if not args.topic:
+        parser.error('one of --topic or --config is required')
+    
     # Handle 'all' platform
     platforms = args.platform
     if 'all' in platforms:
-        platforms = ['blog', 'facebook', 'instagram', 'google']
+        platforms = PLATFORMS
     
     # Create scheduler
     scheduler = ScheduledScraper(
@@ -183,7 +559,9 @@ def main():
         output_file=args.output,
         limit=args.limit,
         analyze_sentiment=args.analyze_sentiment,
-        append_mode=not args.overwrite
+        append_mode=not args.overwrite,
+        collapse_near_duplicates=args.collapse_near_duplicates,
+        sentiment_backend=args.sentiment_backend
     )
     
     # Run on schedule
@@ -12,7 +12,9 @@ from commentradar.scrapers import (
     InstagramScraper,
     GoogleScraper
 )
+from commentradar.scrapers.constraints import SourceConstraints
 from commentradar.utils.sentiment import add_sentiment_to_comments
+from commentradar.utils.sentiment_cache import SentimentCache
 from commentradar.utils.filters import apply_filters
 
 
@@ -29,7 +31,13 @@ class ScraperManager:
         'google': GoogleScraper,
     }
     
-    def __init__(self, topic: str, platforms: Optional[List[str]] = None, limit: Optional[int] = None):
+    def __init__(
+        self,
+        topic: str,
+        platforms: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        constraints: Optional[SourceConstraints] = None
+    ):
         """
         Initialize the scraper manager.
         
@@ -37,10 +45,13 @@ class ScraperManager:
             topic: The topic to search for
             platforms: List of platforms to scrape (default: all)
             limit: Maximum number of comments per platform
+            constraints: Date and length constraints pushed down to the
+                scrapers (``apply_filters`` still checks the results)
         """
         self.topic = topic
         self.platforms = platforms or list(self.PLATFORM_MAP.keys())
         self.limit = limit
+        self.constraints = constraints
         self.collection = CommentCollection()
     
     def scrape_all(self) -> CommentCollection:
@@ -79,7 +90,7 @@ class ScraperManager:
             List of Comment objects
         """
         scraper_class = self.PLATFORM_MAP[platform]
-        scraper = scraper_class(topic=self.topic, limit=self.limit)
+        scraper = scraper_class(topic=self.topic, limit=self.limit, constraints=self.constraints)
         
         try:
             comments = scraper.scrape()
@@ -87,9 +98,16 @@ class ScraperManager:
         finally:
             scraper.close()
     
-    def add_sentiment_analysis(self):
-        """Add sentiment analysis to all collected comments."""
-        add_sentiment_to_comments(self.collection.comments)
+    def add_sentiment_analysis(self, backend: str = 'keyword', cache: Optional[SentimentCache] = None):
+        """
+        Add sentiment analysis to all collected comments.
+        
+        Args:
+            backend: Sentiment backend name ('keyword', 'vader', 'textblob')
+            cache: Score cache, so texts seen in earlier runs are not rescored
+        """
+        add_sentiment_to_comments(self.collection.comments, backend=backend, cache=cache)
+        self.collection.invalidate_columns()
     
     def apply_filters(
         self,
@@ -97,7 +115,8 @@ class ScraperManager:
         end_date: Optional[str] = None,
         sentiment: Optional[str] = None,
         min_length: Optional[int] = None,
-        max_length: Optional[int] = None
+        max_length: Optional[int] = None,
+        where: Optional[str] = None
     ):
         """
         Apply filters to the collected comments.
@@ -108,23 +127,26 @@ class ScraperManager:
             sentiment: Filter by sentiment
             min_length: Minimum comment length
             max_length: Maximum comment length
+            where: Query expression, e.g. "platform = reddit and likes > 5"
         """
         self.collection.comments = apply_filters(
-            self.collection.comments,
+            self.collection,
             start_date=start_date,
             end_date=end_date,
             sentiment=sentiment,
             min_length=min_length,
-            max_length=max_length
+            max_length=max_length,
+            where=where
         )
     
-    def save_results(self, output_file: str):
+    def save_results(self, output_file: str, compact: bool = False):
         """
         Save the collected comments to a JSON file.
         
         Args:
             output_file: Path to output file
+            compact: Write single-line JSON instead of indented JSON
         """
-        self.collection.save_to_file(output_file)
+        self.collection.save_to_file(output_file, compact=compact)
         logger.info(f"Saved {len(self.collection)} comments to {output_file}")
 
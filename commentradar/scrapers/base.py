@@ -3,14 +3,26 @@ Base scraper class that all platform scrapers inherit from.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+import codecs
 import requests
+from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import time
 import logging
 
 from commentradar.models import Comment
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.scrapers.http import shared_get
+from commentradar.scrapers.pagination import (
+    MAX_COMMENT_PAGES,
+    find_comment_pages,
+    find_next_page,
+    is_same_post
+)
 from commentradar.utils.robots import check_robots_txt
+from commentradar.utils.throttle import HostThrottle
 
 
 logging.basicConfig(level=logging.INFO)
@@ -20,20 +32,30 @@ logger = logging.getLogger(__name__)
 class BaseScraper(ABC):
     """Abstract base class for all platform scrapers."""
     
-    def __init__(self, topic: str, limit: Optional[int] = None):
+    def __init__(
+        self,
+        topic: str,
+        limit: Optional[int] = None,
+        constraints: Optional[SourceConstraints] = None
+    ):
         """
         Initialize the scraper.
         
         Args:
             topic: The topic to search for
             limit: Maximum number of comments to scrape
+            constraints: Date and length constraints to enforce while
+                scraping, so the limit counts only matching comments
         """
         self.topic = topic
         self.limit = limit
+        self.constraints = constraints or SourceConstraints()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'CommentRadar/0.1.0 (Educational Purpose; +https://github.com/commentradar)'
         })
+        # Politeness budget for concurrent fetches (see fetch_pages)
+        self.throttle = HostThrottle(max_concurrent=2, min_interval=1.0)
     
     @abstractmethod
     def scrape(self) -> List[Comment]:
@@ -79,6 +101,9 @@ class BaseScraper(ABC):
         """
         Fetch a web page with error handling.
         
+        Identical fetches by other scrapers in the process, running or
+        finished within the last minute, are shared (see ``shared_get``).
+        
         Args:
             url: The URL to fetch
             
@@ -86,13 +111,103 @@ class BaseScraper(ABC):
             Page content as string, or None if failed
         """
         try:
-            response = self.session.get(url, timeout=10)
+            response = shared_get(self.session, url, timeout=10)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return None
     
+    def fetch_pages(self, urls: List[str], max_workers: int = 4) -> List[Optional[str]]:
+        """
+        Fetch several pages concurrently within the per-host politeness budget.
+        
+        Pages disallowed by robots.txt are skipped.
+        
+        Args:
+            urls: The URLs to fetch
+            max_workers: Maximum number of concurrent requests overall
+            
+        Returns:
+            Page contents in the order of ``urls`` (None for failed pages)
+        """
+        if not urls:
+            return []
+        
+        def fetch(url: str) -> Optional[str]:
+            if not self.check_robots_permission(url):
+                logger.warning(f"robots.txt disallows: {url}")
+                return None
+            with self.throttle.slot(url):
+                return self.fetch_page(url)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            return list(executor.map(fetch, urls))
+    
+    def fetch_comment_pages(self, soup: BeautifulSoup, url: str) -> List[BeautifulSoup]:
+        """
+        Fetch the remaining pages of a paginated comment section.
+        
+        Numbered comment pages are fetched concurrently. A bare ``rel=next``
+        chain can only be discovered one page at a time, so it is followed
+        serially.
+        
+        Args:
+            soup: Parsed first page
+            url: URL of the first page
+            
+        Returns:
+            Parsed remaining pages, in page order
+        """
+        page_urls = find_comment_pages(soup, url)
+        if page_urls:
+            logger.info(f"Fetching {len(page_urls)} more comment pages for {url}")
+            return [BeautifulSoup(html, 'html.parser') for html in self.fetch_pages(page_urls) if html]
+        
+        pages = []
+        seen = {url}
+        next_url = find_next_page(soup, url)
+        while next_url and next_url not in seen and is_same_post(next_url, url):
+            if len(pages) >= MAX_COMMENT_PAGES - 1:
+                break
+            seen.add(next_url)
+            html = self.fetch_pages([next_url])[0]
+            if not html:
+                break
+            page = BeautifulSoup(html, 'html.parser')
+            pages.append(page)
+            next_url = find_next_page(page, next_url)
+        
+        return pages
+    
+    def fetch_stream(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """
+        Fetch a web page as a stream of decoded text chunks.
+        
+        The body is never held in memory as a whole, so callers can process
+        the page while it is still downloading and stop early.
+        
+        Args:
+            url: The URL to fetch
+            chunk_size: Size of the raw chunks to read, in bytes
+            
+        Yields:
+            Decoded text chunks
+        """
+        try:
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+                for raw in response.iter_content(chunk_size=chunk_size):
+                    text = decoder.decode(raw)
+                    if text:
+                        yield text
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+        except requests.RequestException as e:
+            logger.error(f"Failed to stream {url}: {e}")
+    
     def close(self):
         """Close the session."""
         self.session.close()
@@ -14,6 +14,15 @@ from commentradar.models import Comment
 
 logger = logging.getLogger(__name__)
 
+# Common comment selectors
+COMMENT_CLASSES = frozenset(['comment', 'comment-body', 'user-comment'])
+COMMENT_ID_RE = re.compile(r'comment-\d+')
+
+# Selectors that start a comment of their own; threaded replies are nested
+# inside their parent's container
+COMMENT_ROOT_CLASSES = frozenset(['comment', 'user-comment'])
+COMMENT_ROOT_ID_RE = re.compile(r'comment-\d+$')
+
 
 class BlogScraper(BaseScraper):
     """Scraper for blog comments."""
@@ -44,7 +53,7 @@ class BlogScraper(BaseScraper):
                 continue
             
             page_comments = self._extract_comments_from_page(url)
-            comments.extend(page_comments)
+            comments.extend(self.constraints.filter(page_comments))
             
             # Rate limiting
             self.rate_limit(1.5)
@@ -91,28 +100,61 @@ class BlogScraper(BaseScraper):
         
         soup = BeautifulSoup(html, 'html.parser')
         
-        # Common comment selectors (adapt based on actual blog structure)
-        comment_selectors = [
-            {'class': 'comment'},
-            {'class': 'comment-body'},
-            {'class': 'user-comment'},
-            {'id': re.compile(r'comment-\d+')},
-        ]
+        # Merge the remaining pages of a paginated comment section in order
+        for page in [soup] + self.fetch_comment_pages(soup, url):
+            comments.extend(self._extract_comments_from_soup(page, url))
+        
+        return comments
+    
+    def _extract_comments_from_soup(self, soup: BeautifulSoup, url: str) -> List[Comment]:
+        """
+        Extract comments from one parsed comment page.
         
-        for selector in comment_selectors:
-            comment_elements = soup.find_all('div', selector)
+        Args:
+            soup: Parsed page
+            url: The blog post URL
             
-            for element in comment_elements:
-                try:
-                    comment = self._parse_comment_element(element, url)
-                    if comment:
-                        comments.append(comment)
-                except Exception as e:
-                    logger.debug(f"Failed to parse comment element: {e}")
-                    continue
+        Returns:
+            List of Comment objects
+        """
+        comments = []
+        extracted = set()
+        
+        # One pass over the page in document order. A comment usually matches
+        # several selectors (e.g. a "comment-body" nested in a "comment"), so
+        # containers inside an already-extracted comment are skipped unless
+        # they are comments themselves (threaded replies).
+        for element in soup.find_all(self._is_comment_container):
+            if not self._is_comment_root(element) and any(id(parent) in extracted for parent in element.parents):
+                continue
+            
+            try:
+                comment = self._parse_comment_element(element, url)
+                if comment:
+                    comments.append(comment)
+                    extracted.add(id(element))
+            except Exception as e:
+                logger.debug(f"Failed to parse comment element: {e}")
+                continue
         
         return comments
     
+    @staticmethod
+    def _is_comment_container(tag) -> bool:
+        """Match the common comment container selectors (adapt based on actual blog structure)."""
+        if tag.name != 'div':
+            return False
+        if COMMENT_CLASSES.intersection(tag.get('class') or ()):
+            return True
+        return bool(COMMENT_ID_RE.search(tag.get('id') or ''))
+    
+    @staticmethod
+    def _is_comment_root(tag) -> bool:
+        """Match containers that hold one whole comment, as opposed to a part of one."""
+        if COMMENT_ROOT_CLASSES.intersection(tag.get('class') or ()):
+            return True
+        return bool(COMMENT_ROOT_ID_RE.match(tag.get('id') or ''))
+    
     def _parse_comment_element(self, element, source_url: str) -> Optional[Comment]:
         """
         Parse a comment element into a Comment object.
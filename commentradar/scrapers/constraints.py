@@ -0,0 +1,142 @@
+"""
+Filter constraints pushed down to scrapers.
+
+Date and length filters given on the command line are normally applied
+after everything has been fetched. Scrapers that receive the same
+constraints can ask the source for the date range only (search API
+parameters) and drop out-of-range comments while parsing, so limits count
+only comments that survive the final filter.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+import time
+
+from commentradar.models import Comment
+from commentradar.utils.dates import SECONDS_PER_DAY, parse_date_bound
+from commentradar.utils.filters import compile_filters
+
+
+# Reddit search time windows, smallest first
+REDDIT_TIME_WINDOWS = (
+    ('hour', 3600),
+    ('day', SECONDS_PER_DAY),
+    ('week', 7 * SECONDS_PER_DAY),
+    ('month', 31 * SECONDS_PER_DAY),
+    ('year', 366 * SECONDS_PER_DAY),
+)
+
+
+class SourceConstraints:
+    """Date and length constraints that scrapers can enforce early."""
+
+    def __init__(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None
+    ):
+        """
+        Initialize the constraints.
+
+        Args:
+            start_date: Earliest posting date
+            end_date: Latest posting date (a bare date covers the whole day)
+            min_length: Minimum comment text length
+            max_length: Maximum comment text length
+
+        Raises:
+            ValueError: If a date cannot be parsed
+        """
+        self.start = parse_date_bound(start_date) if start_date is not None else None
+        self.end = parse_date_bound(end_date, end=True) if end_date is not None else None
+        self.min_length = min_length
+        self.max_length = max_length
+        self._predicate = compile_filters(
+            start_date=start_date, end_date=end_date, min_length=min_length, max_length=max_length
+        )
+
+    def __bool__(self) -> bool:
+        return self._predicate is not None
+
+    @property
+    def has_date_range(self) -> bool:
+        """Whether a date bound is set (undated comments cannot match)."""
+        return self.start is not None or self.end is not None
+
+    def accepts(self, comment: Comment) -> bool:
+        """Check a comment against the constraints, like the final filter would."""
+        return self._predicate is None or self._predicate(comment)
+
+    def filter(self, comments: Iterable[Comment]) -> List[Comment]:
+        """Keep the comments that satisfy the constraints."""
+        if self._predicate is None:
+            return list(comments)
+        return [c for c in comments if self._predicate(c)]
+
+    def algolia_params(self) -> Dict[str, str]:
+        """Hacker News (Algolia) ``numericFilters`` on the creation time."""
+        filters = []
+        if self.start is not None:
+            filters.append(f"created_at_i>={self.start}")
+        if self.end is not None:
+            filters.append(f"created_at_i<={self.end}")
+        return {'numericFilters': ','.join(filters)} if filters else {}
+
+    def github_qualifier(self) -> str:
+        """GitHub search ``created:`` qualifier, at day granularity."""
+        start = _utc_date(self.start) if self.start is not None else None
+        end = _utc_date(self.end) if self.end is not None else None
+        if start and end:
+            return f"created:{start}..{end}"
+        if start:
+            return f"created:>={start}"
+        if end:
+            return f"created:<={end}"
+        return ''
+
+    def stackexchange_params(self) -> Dict[str, int]:
+        """Stack Exchange ``fromdate``/``todate`` parameters."""
+        params = {}
+        if self.start is not None:
+            params['fromdate'] = self.start
+        if self.end is not None:
+            params['todate'] = self.end
+        return params
+
+    def reddit_params(self, now: Optional[float] = None) -> Dict[str, str]:
+        """
+        Reddit search ``t`` parameter: the smallest window covering the start date.
+
+        Reddit windows are relative to now, so an end date cannot be pushed down.
+        """
+        if self.start is None:
+            return {}
+        age = (time.time() if now is None else now) - self.start
+        for window, seconds in REDDIT_TIME_WINDOWS:
+            if age <= seconds:
+                return {'t': window}
+        return {}
+
+    def wordpress_params(self) -> Dict[str, str]:
+        """
+        WordPress REST ``after``/``before`` parameters.
+
+        WordPress compares them in the site's time zone, so the range is
+        widened by a day on each side and the local check does the rest.
+        """
+        params = {}
+        if self.start is not None:
+            params['after'] = _utc_iso(self.start - SECONDS_PER_DAY)
+        if self.end is not None:
+            params['before'] = _utc_iso(self.end + SECONDS_PER_DAY)
+        return params
+
+
+def _utc_date(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def _utc_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
@@ -5,11 +5,13 @@ Extended sources scraper: YouTube, Play Store, Stack Overflow, Product Hunt, Dev
 import requests
 from bs4 import BeautifulSoup
 import logging
-from typing import List
+from typing import List, Optional
 import json
 import re
 
 from commentradar.models import Comment
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.scrapers.http import shared_get
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,17 @@ logger = logging.getLogger(__name__)
 class ExtendedSourcesScraper:
     """Scraper for additional high-value sources."""
     
-    def __init__(self, topic: str):
+    def __init__(self, topic: str, constraints: Optional[SourceConstraints] = None):
+        """
+        Initialize the scraper.
+        
+        Args:
+            topic: The topic to search for
+            constraints: Date and length constraints; date ranges are sent
+                to the search APIs that support them
+        """
         self.topic = topic
+        self.constraints = constraints or SourceConstraints()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -34,7 +45,7 @@ class ExtendedSourcesScraper:
         try:
             # Search for videos
             search_url = f"https://www.youtube.com/results?search_query={self.topic.replace(' ', '+')}"
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, timeout=10)
             
             if response.status_code == 200:
                 # Extract video IDs from search results
@@ -73,7 +84,7 @@ class ExtendedSourcesScraper:
             search_query = self.topic.replace(' ', '%20')
             search_url = f"https://play.google.com/store/search?q={search_query}&c=apps"
             
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -118,7 +129,7 @@ class ExtendedSourcesScraper:
             # Stack Overflow API (no auth required)
             api_url = f"https://api.stackexchange.com/2.3/search?order=desc&sort=relevance&intitle={self.topic}&site=stackoverflow"
             
-            response = self.session.get(api_url, timeout=10)
+            response = shared_get(self.session, api_url, params=self.constraints.stackexchange_params(), timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -134,7 +145,7 @@ class ExtendedSourcesScraper:
                         likes=item.get('score', 0)
                     )
                     
-                    if len(comment.comment_text.strip()) > 20:
+                    if len(comment.comment_text.strip()) > 20 and self.constraints.accepts(comment):
                         comments.append(comment)
                     
                     if limit and len(comments) >= limit:
@@ -157,7 +168,7 @@ class ExtendedSourcesScraper:
             # Product Hunt website scraping (they have GraphQL but we'll use web)
             search_url = f"https://www.producthunt.com/search?q={self.topic.replace(' ', '%20')}"
             
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -211,7 +222,7 @@ class ExtendedSourcesScraper:
             # Dev.to has a free public API
             api_url = f"https://dev.to/api/articles?tag={self.topic.replace(' ', '-')}&per_page=30"
             
-            response = self.session.get(api_url, timeout=10)
+            response = shared_get(self.session, api_url, timeout=10)
             
             if response.status_code == 200:
                 articles = response.json()
@@ -226,7 +237,7 @@ class ExtendedSourcesScraper:
                         likes=article.get('positive_reactions_count', 0)
                     )
                     
-                    if len(comment.comment_text.strip()) > 20:
+                    if len(comment.comment_text.strip()) > 20 and self.constraints.accepts(comment):
                         comments.append(comment)
                     
                     if limit and len(comments) >= limit:
@@ -247,19 +258,22 @@ class ExtendedSourcesScraper:
         
         logger.info(f"Scraping extended sources for: {self.topic}")
         
-        all_comments.extend(self.scrape_youtube_comments(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_play_store_reviews(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_stackoverflow(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_producthunt(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_devto(limit=limit_per_source))
+        # YouTube, Play Store and Product Hunt results carry no post date,
+        # so they are skipped when a date filter would discard them anyway
+        sources = [
+            (self.scrape_youtube_comments, False),
+            (self.scrape_play_store_reviews, False),
+            (self.scrape_stackoverflow, True),
+            (self.scrape_producthunt, False),
+            (self.scrape_devto, True),
+        ]
+        for i, (scrape_source, dated) in enumerate(sources):
+            if self.constraints.has_date_range and not dated:
+                logger.info(f"Skipping {scrape_source.__name__}: no post dates to filter on")
+                continue
+            if i:
+                time.sleep(1)
+            all_comments.extend(self.constraints.filter(scrape_source(limit=limit_per_source)))
         
         return all_comments
 
@@ -0,0 +1,57 @@
+"""
+Shared HTTP GETs for scrapers.
+
+Identical GET requests (same URL, query parameters and User-Agent) made by
+any scraper in the process go through one ``SingleFlight`` group: while a
+request is in flight, identical ones wait for it, and its response is
+reused for ``HTTP_TTL`` seconds. Error responses (rate limits, 403s,
+5xx) are shared with callers already waiting but never reused after that.
+Responses are shared, so callers must only read them.
+"""
+
+from typing import Any, Mapping, Optional
+import requests
+
+from commentradar.utils.singleflight import SingleFlight
+
+
+HTTP_TTL = 60.0
+
+# Pages can be large; keep only the most recent ones
+HTTP_MAXSIZE = 128
+
+
+def _is_success(response: requests.Response) -> bool:
+    return response.status_code < 400
+
+
+requests_in_flight = SingleFlight(ttl=HTTP_TTL, maxsize=HTTP_MAXSIZE, cacheable=_is_success)
+
+
+def shared_get(
+    session: requests.Session,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    timeout: float = 10
+) -> requests.Response:
+    """
+    GET a URL, sharing the request with identical concurrent or recent ones.
+
+    Args:
+        session: Session to send the request with (if it is not shared)
+        url: URL to fetch
+        params: Query parameters
+        timeout: Request timeout in seconds
+
+    Returns:
+        The response (read-only; it may be shared)
+
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    key = (
+        url,
+        tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        getattr(session, 'headers', {}).get('User-Agent'),
+    )
+    return requests_in_flight.do(key, lambda: session.get(url, params=params, timeout=timeout))
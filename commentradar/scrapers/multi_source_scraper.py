@@ -6,11 +6,13 @@ Includes: Reddit, Hacker News, Product Hunt, Twitter/X, GitHub, Quora, Medium
 import requests
 from bs4 import BeautifulSoup
 import logging
-from typing import List
+from typing import List, Optional
 import time
 import json
 
 from commentradar.models import Comment
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.scrapers.http import shared_get
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +20,17 @@ logger = logging.getLogger(__name__)
 class MultiSourceScraper:
     """Scraper that collects from multiple sources."""
     
-    def __init__(self, topic: str):
+    def __init__(self, topic: str, constraints: Optional[SourceConstraints] = None):
+        """
+        Initialize the scraper.
+        
+        Args:
+            topic: The topic to search for
+            constraints: Date and length constraints; date ranges are sent
+                to the search APIs that support them
+        """
         self.topic = topic
+        self.constraints = constraints or SourceConstraints()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -33,7 +44,7 @@ class MultiSourceScraper:
             # Reddit API max is 100 per request, default to 100 if unlimited
             api_limit = limit if limit else 100
             search_url = f"https://www.reddit.com/search.json?q={self.topic}&sort=relevance&limit={api_limit}"
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, params=self.constraints.reddit_params(), timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -51,7 +62,7 @@ class MultiSourceScraper:
                     likes=post_data.get('score', 0)
                 )
                 
-                if len(comment.comment_text.strip()) > 20:
+                if len(comment.comment_text.strip()) > 20 and self.constraints.accepts(comment):
                     comments.append(comment)
             
             logger.info(f"✓ Reddit: {len(comments)} posts")
@@ -67,7 +78,7 @@ class MultiSourceScraper:
         
         try:
             search_url = f"http://hn.algolia.com/api/v1/search?query={self.topic}&tags=story"
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, params=self.constraints.algolia_params(), timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -86,7 +97,7 @@ class MultiSourceScraper:
                     likes=hit.get('points', 0)
                 )
                 
-                if len(comment.comment_text.strip()) > 20:
+                if len(comment.comment_text.strip()) > 20 and self.constraints.accepts(comment):
                     comments.append(comment)
             
             logger.info(f"✓ Hacker News: {len(comments)} posts")
@@ -116,7 +127,7 @@ class MultiSourceScraper:
             for instance in nitter_instances:
                 try:
                     search_url = f"{instance}/search?f=tweets&q={search_query}"
-                    response = self.session.get(search_url, timeout=10)
+                    response = shared_get(self.session, search_url, timeout=10)
                     
                     if response.status_code == 200:
                         soup = BeautifulSoup(response.text, 'html.parser')
@@ -186,8 +197,10 @@ class MultiSourceScraper:
         try:
             # Search GitHub for relevant repositories and issues (max 100 per page)
             per_page = limit if limit and limit <= 100 else 100
-            search_url = f"https://api.github.com/search/issues?q={self.topic}+in:title,body&sort=updated&per_page={per_page}"
-            response = self.session.get(search_url, timeout=10)
+            created = self.constraints.github_qualifier()
+            query = f"{self.topic}+in:title,body" + (f"+{created}" if created else "")
+            search_url = f"https://api.github.com/search/issues?q={query}&sort=updated&per_page={per_page}"
+            response = shared_get(self.session, search_url, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -203,7 +216,7 @@ class MultiSourceScraper:
                         likes=item.get('reactions', {}).get('total_count', 0)
                     )
                     
-                    if len(comment.comment_text.strip()) > 20:
+                    if len(comment.comment_text.strip()) > 20 and self.constraints.accepts(comment):
                         comments.append(comment)
                 
                 logger.info(f"✓ GitHub: {len(comments)} issues/discussions")
@@ -222,7 +235,7 @@ class MultiSourceScraper:
         
         try:
             search_url = f"https://www.quora.com/search?q={self.topic.replace(' ', '+')}"
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -268,7 +281,7 @@ class MultiSourceScraper:
             search_query = self.topic.replace(' ', '-')
             search_url = f"https://medium.com/search?q={self.topic}"
             
-            response = self.session.get(search_url, timeout=10)
+            response = shared_get(self.session, search_url, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -332,29 +345,30 @@ class MultiSourceScraper:
         
         logger.info(f"Scraping from multiple sources for: {self.topic}")
         
-        # Scrape each platform (unlimited if limit_per_source is None)
-        all_comments.extend(self.scrape_reddit(limit=limit_per_source))
-        time.sleep(1)  # Rate limiting
-        
-        all_comments.extend(self.scrape_hackernews(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_twitter_nitter(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_github_discussions(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_quora(limit=limit_per_source))
-        time.sleep(1)
-        
-        all_comments.extend(self.scrape_medium(limit=limit_per_source))
+        # Scrape each platform (unlimited if limit_per_source is None).
+        # Twitter, Quora and Medium results carry no post date, so they are
+        # skipped when a date filter would discard them anyway.
+        sources = [
+            (self.scrape_reddit, True),
+            (self.scrape_hackernews, True),
+            (self.scrape_twitter_nitter, False),
+            (self.scrape_github_discussions, True),
+            (self.scrape_quora, False),
+            (self.scrape_medium, False),
+        ]
+        for i, (scrape_source, dated) in enumerate(sources):
+            if self.constraints.has_date_range and not dated:
+                logger.info(f"Skipping {scrape_source.__name__}: no post dates to filter on")
+                continue
+            if i:
+                time.sleep(1)  # Rate limiting
+            all_comments.extend(self.constraints.filter(scrape_source(limit=limit_per_source)))
         
         # Add extended sources if requested
         if include_extended:
             try:
                 from commentradar.scrapers.extended_sources import ExtendedSourcesScraper
-                extended_scraper = ExtendedSourcesScraper(topic=self.topic)
+                extended_scraper = ExtendedSourcesScraper(topic=self.topic, constraints=self.constraints)
                 all_comments.extend(extended_scraper.scrape_all(limit_per_source=limit_per_source))
             except Exception as e:
                 logger.warning(f"Extended sources not available: {e}")
@@ -0,0 +1,160 @@
+"""
+Detection of paginated comment sections.
+
+WordPress splits long threads into ``?cpage=N`` or ``/comment-page-N/``
+pages, and review and forum pages link further pages with ``rel=next`` or a
+pagination block. These helpers find the remaining pages of a comment
+section so they can be fetched alongside the first one.
+"""
+
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+import re
+
+from bs4 import BeautifulSoup
+
+
+MAX_COMMENT_PAGES = 20
+
+CPAGE_RE = re.compile(r'([?&]cpage=)(\d+)')
+COMMENT_PAGE_RE = re.compile(r'(/comment-page-)(\d+)')
+PAGE_PARAM_RE = re.compile(r'([?&]page=)(\d+)')
+PAGINATION_CLASS_RE = re.compile(r'pagination|page-numbers|comment-navigation|comments-nav|pager', re.I)
+
+COMMENT_PAGE_PATTERNS = (CPAGE_RE, COMMENT_PAGE_RE)
+
+
+def find_comment_pages(soup: BeautifulSoup, url: str, max_pages: int = MAX_COMMENT_PAGES) -> List[str]:
+    """
+    Find the other pages of a paginated comment section.
+
+    Numbered links are expanded to the full page range, so pages hidden
+    behind an ellipsis in the navigation (``1 2 3 … 10``) are included.
+    The current page is read from the URL, else from the navigation's
+    ``current`` marker; a bare post URL of a newest-first thread shows the
+    last page, so page 1 is only assumed current when nothing links to it.
+
+    Args:
+        soup: Parsed first page
+        url: URL of the first page
+        max_pages: Maximum number of pages, including the first one
+
+    Returns:
+        URLs of the remaining pages in page order, excluding ``url``
+    """
+    numbered: Dict[int, str] = {}
+    template = None
+
+    for link in soup.find_all('a', href=True):
+        href = urljoin(url, link['href']).split('#')[0]
+        patterns = COMMENT_PAGE_PATTERNS
+        if _in_pagination_block(link):
+            patterns = COMMENT_PAGE_PATTERNS + (PAGE_PARAM_RE,)
+
+        for pattern in patterns:
+            match = pattern.search(href)
+            if match and _same_document(href, url, pattern):
+                page = int(match.group(2))
+                numbered.setdefault(page, href)
+                template = template or (pattern, href)
+                break
+
+    if not numbered:
+        return []
+
+    # Fill gaps in the numbered range from one of the links
+    pattern, sample = template
+    current = _page_number(url, pattern) or _current_page(soup)
+    linked = set(numbered)
+    last = min(max(numbered), (current or 1) + max_pages - 1)
+    for page in range(1, last + 1):
+        if page not in numbered:
+            numbered[page] = pattern.sub(lambda m: f"{m.group(1)}{page}", sample, count=1)
+
+    pages = []
+    for page in sorted(numbered):
+        if page == current or (current is None and page == 1 and page not in linked):
+            continue
+        if numbered[page].rstrip('/') == url.split('#')[0].rstrip('/'):
+            continue
+        pages.append(numbered[page])
+
+    return pages[:max_pages - 1]
+
+
+def find_next_page(soup: BeautifulSoup, url: str) -> Optional[str]:
+    """
+    Find the ``rel=next`` link of a page.
+
+    Args:
+        soup: Parsed page
+        url: URL of the page
+
+    Returns:
+        Absolute URL of the next page, or None
+    """
+    for tag in ('link', 'a'):
+        element = soup.find(tag, rel='next', href=True)
+        if element:
+            next_url = urljoin(url, element['href']).split('#')[0]
+            if next_url != url:
+                return next_url
+    return None
+
+
+def is_same_post(candidate: str, url: str) -> bool:
+    """
+    Check that a page URL continues the post at ``url``.
+
+    Guards against ``rel=next`` links that point to the next post rather
+    than to the next page of comments.
+
+    Args:
+        candidate: URL of a possible continuation page
+        url: URL of the post
+
+    Returns:
+        True if the candidate is on the same host, under the post's path
+    """
+    a, b = urlparse(candidate), urlparse(url)
+    if a.netloc != b.netloc:
+        return False
+    base = COMMENT_PAGE_RE.sub('', b.path).rstrip('/')
+    if a.path.rstrip('/') == base:
+        return True
+    return bool(base) and a.path.startswith(base + '/')
+
+
+def _in_pagination_block(link) -> bool:
+    """Check whether a link sits inside a pagination block."""
+    for parent in link.parents:
+        if PAGINATION_CLASS_RE.search(' '.join(parent.get('class') or [])):
+            return True
+    return False
+
+
+def _current_page(soup: BeautifulSoup) -> Optional[int]:
+    """Read the page number marked current in a pagination block."""
+    for element in soup.find_all(class_='current'):
+        text = element.get_text(strip=True)
+        if not text.isdigit():
+            continue
+        if PAGINATION_CLASS_RE.search(' '.join(element['class'])) or _in_pagination_block(element):
+            return int(text)
+    return None
+
+
+def _same_document(href: str, url: str, pattern) -> bool:
+    """Check that a page link belongs to the same post as ``url``."""
+    a, b = urlparse(href), urlparse(url)
+    if a.netloc != b.netloc:
+        return False
+    if pattern is COMMENT_PAGE_RE:
+        base = COMMENT_PAGE_RE.sub('', a.path).rstrip('/')
+        return base == COMMENT_PAGE_RE.sub('', b.path).rstrip('/')
+    return a.path.rstrip('/') == b.path.rstrip('/')
+
+
+def _page_number(url: str, pattern) -> Optional[int]:
+    match = pattern.search(url)
+    return int(match.group(2)) if match else None
@@ -2,7 +2,8 @@
 Real blog scraper that searches for actual blog posts and extracts real comments.
 """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from itertools import islice
 from bs4 import BeautifulSoup
 import logging
 import re
@@ -10,15 +11,41 @@ from urllib.parse import urljoin, urlparse
 import json
 
 from commentradar.scrapers.base import BaseScraper
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.scrapers.streaming import iter_comments
+from commentradar.scrapers.wordpress import WordPressAdapter
 from commentradar.models import Comment
+from commentradar.utils.text import extract_text
 
 
 logger = logging.getLogger(__name__)
 
+MAX_COMMENT_LENGTH = 1000
+
 
 class RealBlogScraper(BaseScraper):
     """Scraper that finds real blog posts via search and extracts comments."""
     
+    def __init__(
+        self,
+        topic: str,
+        limit: Optional[int] = None,
+        streaming: bool = False,
+        constraints: Optional[SourceConstraints] = None
+    ):
+        """
+        Initialize the scraper.
+        
+        Args:
+            topic: The topic to search for
+            limit: Maximum number of comments to scrape
+            streaming: Extract comments incrementally while pages download,
+                for very large comment threads
+            constraints: Date and length constraints to enforce while scraping
+        """
+        super().__init__(topic, limit, constraints)
+        self.streaming = streaming
+    
     def get_platform_name(self) -> str:
         return "blog"
     
@@ -34,18 +61,39 @@ class RealBlogScraper(BaseScraper):
             logger.warning("No blog URLs found. Using fallback sources.")
             blog_urls = self._get_fallback_urls()
         
-        # Step 2: Extract comments from each blog
+        allowed_urls = []
         for url in blog_urls:
+            if not self.check_robots_permission(url):
+                logger.warning(f"robots.txt disallows: {url}")
+                continue
+            allowed_urls.append(url)
+        
+        # Step 2: Fetch comments through machine endpoints where available
+        endpoint_comments = WordPressAdapter(
+            self.session,
+            platform=self.get_platform_name(),
+            constraints=self.constraints,
+            throttle=self.throttle,
+            is_allowed=self.check_robots_permission,
+        ).fetch_comments(allowed_urls, limit=self.limit)
+        
+        # Step 3: Extract comments from each blog, scraping HTML as fallback
+        for url in allowed_urls:
             if self.limit and len(comments) >= self.limit:
                 break
             
-            logger.info(f"Scraping: {url}")
-            
-            if not self.check_robots_permission(url):
-                logger.warning(f"robots.txt disallows: {url}")
+            if url in endpoint_comments:
+                comments.extend(endpoint_comments[url])
                 continue
             
-            page_comments = self._extract_comments_from_page(url)
+            logger.info(f"Scraping: {url}")
+            
+            if self.streaming:
+                remaining = self.limit - len(comments) if self.limit else None
+                matching = filter(self.constraints.accepts, self.stream_comments(url))
+                page_comments = list(islice(matching, remaining))
+            else:
+                page_comments = self.constraints.filter(self._extract_comments_from_page(url))
             comments.extend(page_comments)
             
             # Rate limiting
@@ -118,6 +166,19 @@ class RealBlogScraper(BaseScraper):
             return comments
         
         soup = BeautifulSoup(html, 'html.parser')
+        comments = self._extract_comments_from_soup(soup, url)
+        
+        # Merge the remaining pages of a paginated comment section in order
+        if comments and not (self.limit and len(comments) >= self.limit):
+            for page in self.fetch_comment_pages(soup, url):
+                comments.extend(self._extract_comments_from_soup(page, url))
+        
+        logger.info(f"Extracted {len(comments)} comments from {url}")
+        return comments
+    
+    def _extract_comments_from_soup(self, soup: BeautifulSoup, url: str) -> List[Comment]:
+        """Extract comments from one parsed comment page."""
+        comments = []
         
         # Try multiple comment section patterns
         comment_patterns = [
@@ -164,9 +225,29 @@ class RealBlogScraper(BaseScraper):
         if not comments:
             comments = self._extract_reviews(soup, url)
         
-        logger.info(f"Extracted {len(comments)} comments from {url}")
         return comments
     
+    def stream_comments(self, url: str) -> Iterator[Comment]:
+        """
+        Extract comments from a blog page while it downloads.
+        
+        Memory stays proportional to one comment rather than the whole
+        page, and comments are yielded as soon as their containers close.
+        Closing the iterator early stops the download.
+        
+        Args:
+            url: The blog post URL
+            
+        Yields:
+            Comment objects in page order
+        """
+        yield from iter_comments(
+            self.fetch_stream(url),
+            source_url=url,
+            platform=self.get_platform_name(),
+            max_text_length=MAX_COMMENT_LENGTH
+        )
+    
     def _parse_comment_element(self, element, source_url: str) -> Optional[Comment]:
         """Parse a comment element into a Comment object."""
         try:
@@ -204,11 +285,12 @@ class RealBlogScraper(BaseScraper):
             
             # If no specific text element, get all text from element
             if not comment_text:
-                # Remove author name and date elements first
-                temp_elem = element.__copy__()
-                for unwanted in temp_elem.find_all(['time', 'footer', 'header']):
-                    unwanted.decompose()
-                comment_text = temp_elem.get_text(strip=True)
+                # Skip author name and date elements
+                comment_text = extract_text(
+                    element,
+                    exclude=('time', 'footer', 'header'),
+                    max_length=MAX_COMMENT_LENGTH
+                )
             
             # Validate
             if not comment_text or len(comment_text) < 10:
@@ -228,7 +310,7 @@ class RealBlogScraper(BaseScraper):
                 source_url=source_url,
                 platform=self.get_platform_name(),
                 commenter_name=author_name,
-                comment_text=comment_text[:1000],  # Limit length
+                comment_text=comment_text[:MAX_COMMENT_LENGTH],  # Limit length
                 date_posted=date_posted
             )
         except Exception as e:
@@ -271,7 +353,7 @@ class RealBlogScraper(BaseScraper):
                                 source_url=source_url,
                                 platform=self.get_platform_name(),
                                 commenter_name=author_name,
-                                comment_text=review_text[:1000],
+                                comment_text=review_text[:MAX_COMMENT_LENGTH],
                                 date_posted=None
                             )
                             comments.append(comment)
@@ -0,0 +1,244 @@
+"""
+Incremental, event-driven comment extraction for very large pages.
+
+The parser is fed chunks of markup as they arrive from a streamed response
+and emits Comment objects as soon as each comment container closes. No
+document tree is built, so memory stays proportional to a single comment
+rather than the whole page, and extraction overlaps with the download.
+"""
+
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional
+import logging
+import re
+
+from commentradar.models import Comment
+
+
+logger = logging.getLogger(__name__)
+
+
+# Class tokens that mark a comment container
+COMMENT_CONTAINER_CLASSES = frozenset(['comment', 'user-comment', 'review'])
+COMMENT_ID_RE = re.compile(r'^comment-\d+$')
+
+AUTHOR_CLASS_RE = re.compile(r'author|commenter|user.*name', re.I)
+TEXT_CLASS_RE = re.compile(r'comment.*(text|content|body)|description', re.I)
+DATE_CLASS_RE = re.compile(r'date', re.I)
+TEXT_TAGS = frozenset(['p', 'div', 'span'])
+
+# Subtrees whose text is not part of the fallback comment text
+EXCLUDED_TEXT_TAGS = frozenset(['time', 'footer', 'header'])
+IGNORED_TAGS = frozenset(['script', 'style', 'template'])
+
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+])
+
+
+class _CommentState:
+    """Text collected for one open comment container."""
+
+    __slots__ = ('depth', 'author', 'text', 'fallback', 'date')
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.author: Optional[List[str]] = None
+        self.text: Optional[List[str]] = None
+        self.fallback: List[str] = []
+        self.date: Optional[str] = None
+
+
+class StreamingCommentParser(HTMLParser):
+    """HTML parser that emits comments as their containers close."""
+
+    def __init__(self, source_url: str, platform: str = 'blog', max_text_length: int = 1000):
+        """
+        Initialize the parser.
+
+        Args:
+            source_url: URL of the page being parsed
+            platform: Platform name to stamp on produced comments
+            max_text_length: Maximum comment text length
+        """
+        super().__init__(convert_charrefs=True)
+        self.source_url = source_url
+        self.platform = platform
+        self.max_text_length = max_text_length
+
+        # Stack of (tag name, roles) for open elements
+        self._open: List[tuple] = []
+        self._comments: List[_CommentState] = []
+        self._ignored_depth = 0
+        self._excluded_depth = 0
+        self._pending_text: List[str] = []
+        self._ready: List[Comment] = []
+
+    def feed_chunk(self, chunk: str) -> List[Comment]:
+        """
+        Feed a chunk of markup.
+
+        Args:
+            chunk: Next piece of the document
+
+        Returns:
+            Comments whose containers closed within this chunk
+        """
+        self.feed(chunk)
+        return self._drain()
+
+    def finish(self) -> List[Comment]:
+        """
+        Flush the parser at the end of the document.
+
+        Returns:
+            Remaining comments, including ones left unclosed by bad markup
+        """
+        self.close()
+        self._flush_text()
+        while self._comments:
+            self._emit(self._comments.pop())
+        return self._drain()
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in VOID_TAGS:
+            return
+
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+        roles = set()
+
+        if tag in IGNORED_TAGS:
+            roles.add('ignored')
+            self._ignored_depth += 1
+        elif self._is_container(classes, attributes):
+            roles.add('comment')
+            self._comments.append(_CommentState(len(self._open)))
+        elif self._comments:
+            state = self._comments[-1]
+            class_attr = attributes.get('class') or ''
+            itemprop = attributes.get('itemprop')
+
+            if tag in EXCLUDED_TEXT_TAGS:
+                roles.add('excluded')
+                self._excluded_depth += 1
+
+            if tag == 'time' or (tag == 'span' and DATE_CLASS_RE.search(class_attr)):
+                if state.date is None:
+                    state.date = attributes.get('datetime') or ''
+                    roles.add('date')
+            elif state.author is None and (AUTHOR_CLASS_RE.search(class_attr) or itemprop == 'author'):
+                state.author = []
+                roles.add('author')
+            elif (state.text is None and tag in TEXT_TAGS
+                    and (TEXT_CLASS_RE.search(class_attr) or itemprop == 'text')):
+                state.text = []
+                roles.add('text')
+
+        self._open.append((tag, roles))
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in VOID_TAGS:
+            return
+
+        # Tolerate unclosed tags by popping up to the matching start tag
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                break
+        else:
+            return
+
+        while len(self._open) > index:
+            _, roles = self._open.pop()
+            if 'ignored' in roles:
+                self._ignored_depth -= 1
+            if 'excluded' in roles:
+                self._excluded_depth -= 1
+            if 'comment' in roles:
+                self._emit(self._comments.pop())
+
+    def handle_data(self, data):
+        # Text may arrive in pieces at chunk boundaries; it is handled as a
+        # whole at the next tag
+        if self._comments and not self._ignored_depth:
+            self._pending_text.append(data)
+
+    def _flush_text(self):
+        """Process the text node collected since the last tag."""
+        if not self._pending_text:
+            return
+
+        data = ''.join(self._pending_text)
+        self._pending_text = []
+        stripped = data.strip()
+        if not stripped:
+            return
+
+        state = self._comments[-1]
+        roles = set()
+        for _, element_roles in self._open[state.depth + 1:]:
+            roles |= element_roles
+
+        if 'author' in roles:
+            state.author.append(stripped)
+        if 'text' in roles:
+            self._append_capped(state.text, stripped)
+        if 'date' in roles and state.date == '':
+            state.date = stripped
+        if not self._excluded_depth:
+            self._append_capped(state.fallback, stripped)
+
+    def _is_container(self, classes: List[str], attributes: dict) -> bool:
+        """Check whether a start tag opens a comment container."""
+        if any(cls in COMMENT_CONTAINER_CLASSES for cls in classes):
+            return True
+        if attributes.get('itemprop') == 'comment':
+            return True
+        return bool(COMMENT_ID_RE.match(attributes.get('id') or ''))
+
+    def _append_capped(self, parts: List[str], text: str):
+        """Append text to a buffer without growing past the length cap."""
+        if sum(len(part) for part in parts) < self.max_text_length:
+            parts.append(text)
+
+    def _emit(self, state: _CommentState):
+        """Turn a closed container into a Comment, if it has enough text."""
+        comment_text = ''.join(state.text or []) or ''.join(state.fallback)
+        if len(comment_text) < 10:
+            return
+
+        author = ''.join(state.author or []) or "Anonymous"
+        self._ready.append(Comment(
+            source_url=self.source_url,
+            platform=self.platform,
+            commenter_name=author[:100],
+            comment_text=comment_text[:self.max_text_length],
+            date_posted=state.date or None
+        ))
+
+    def _drain(self) -> List[Comment]:
+        ready, self._ready = self._ready, []
+        return ready
+
+
+def iter_comments(chunks: Iterable[str], source_url: str, platform: str = 'blog',
+                  max_text_length: int = 1000) -> Iterator[Comment]:
+    """
+    Extract comments from a stream of markup chunks.
+
+    Args:
+        chunks: Iterable of decoded markup chunks
+        source_url: URL of the page being parsed
+        platform: Platform name to stamp on produced comments
+        max_text_length: Maximum comment text length
+
+    Yields:
+        Comment objects in document order of their closing tags
+    """
+    parser = StreamingCommentParser(source_url, platform, max_text_length)
+    for chunk in chunks:
+        yield from parser.feed_chunk(chunk)
+    yield from parser.finish()
@@ -0,0 +1,405 @@
+"""
+WordPress adapter for fetching blog comments through machine endpoints.
+
+WordPress exposes comments as JSON through the REST API
+(``/wp-json/wp/v2/comments``) and as RSS through per-post comment feeds
+(``<post-url>/feed/``, or ``?p=N&feed=rss2`` for plain permalinks). Both are a fraction of the size of the rendered
+page and need no DOM parsing, so blog scrapers try them before falling
+back to HTML scraping. Endpoints are only tried on sites detected as
+WordPress, and every request goes through ``shared_get`` under the
+scraper's robots.txt check and per-host throttle.
+"""
+
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from urllib.parse import urlparse, parse_qs
+from xml.etree import ElementTree
+import html
+import logging
+import re
+
+import requests
+
+from commentradar.models import Comment
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.scrapers.http import shared_get
+from commentradar.utils.throttle import HostThrottle
+
+
+logger = logging.getLogger(__name__)
+
+
+WORDPRESS = 'wordpress'
+
+# Hints that identify a WordPress site from its URL, headers or markup
+WORDPRESS_URL_HINTS = ('wordpress.com', '/wp-content/', '/wp-json/')
+WORDPRESS_HTML_HINTS = (
+    '/wp-content/',
+    '/wp-includes/',
+    '/wp-json/',
+    'content="WordPress',
+)
+WORDPRESS_API_REL = 'https://api.w.org/'
+
+# REST API caps per_page at 100
+REST_PAGE_SIZE = 100
+MAX_REST_PAGES = 20
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_POST_ID_RE = re.compile(r'^\d+$')
+
+_RSS_NAMESPACES = {
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+}
+
+
+def detect_blog_engine(url: str, html_text: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Detect the blog engine behind a URL.
+
+    Args:
+        url: The blog post URL
+        html_text: Page markup, if it has already been fetched
+        headers: Response headers, if a response is available
+
+    Returns:
+        Engine name (e.g. 'wordpress'), or None if unknown
+    """
+    url_lower = url.lower()
+    if any(hint in url_lower for hint in WORDPRESS_URL_HINTS):
+        return WORDPRESS
+
+    # WordPress permalinks in "plain" mode look like /?p=123
+    if _POST_ID_RE.match(parse_qs(urlparse(url).query).get('p', [''])[0]):
+        return WORDPRESS
+
+    if headers:
+        link_header = headers.get('Link', '') or headers.get('link', '')
+        if WORDPRESS_API_REL in link_header:
+            return WORDPRESS
+
+    if html_text and any(hint in html_text for hint in WORDPRESS_HTML_HINTS):
+        return WORDPRESS
+
+    return None
+
+
+def html_to_text(fragment: str) -> str:
+    """
+    Convert a rendered HTML fragment to plain text without building a DOM.
+
+    Args:
+        fragment: HTML fragment (e.g. REST ``content.rendered``)
+
+    Returns:
+        Plain text with collapsed whitespace
+    """
+    text = html.unescape(_TAG_RE.sub(' ', fragment or ''))
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def comment_feed_url(url: str) -> str:
+    """
+    Build the RSS comment feed URL of a post.
+
+    Args:
+        url: The blog post URL
+
+    Returns:
+        ``<post-url>/feed/`` for pretty permalinks, or ``?p=N&feed=rss2``
+        for plain ones (``/feed/`` there would be the site's posts feed)
+    """
+    parsed = urlparse(url)
+    post_param = parse_qs(parsed.query).get('p', [''])[0]
+    if _POST_ID_RE.match(post_param):
+        return f"{parsed.scheme}://{parsed.netloc}{parsed.path or '/'}?p={post_param}&feed=rss2"
+    return url.split('#')[0].split('?')[0].rstrip('/') + '/feed/'
+
+
+class WordPressAdapter:
+    """Fetch WordPress comments through the REST API or comment feeds."""
+
+    def __init__(self, session: requests.Session, platform: str = 'blog',
+                 timeout: int = 10, max_text_length: int = 1000,
+                 constraints: Optional[SourceConstraints] = None,
+                 throttle: Optional[HostThrottle] = None,
+                 is_allowed: Optional[Callable[[str], bool]] = None):
+        """
+        Initialize the adapter.
+
+        Args:
+            session: HTTP session to issue requests with
+            platform: Platform name to stamp on produced comments
+            timeout: Request timeout in seconds
+            max_text_length: Maximum comment text length
+            constraints: Date and length constraints; the date range is
+                passed to the REST API
+            throttle: Per-host politeness budget shared with the scraper
+                (requests are not throttled when omitted)
+            is_allowed: robots.txt check for a URL (everything is allowed
+                when omitted)
+        """
+        self.session = session
+        self.platform = platform
+        self.timeout = timeout
+        self.max_text_length = max_text_length
+        self.constraints = constraints or SourceConstraints()
+        self.throttle = throttle
+        self.is_allowed = is_allowed
+
+    def _get(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[requests.Response]:
+        """
+        GET a URL like the scrapers do: robots.txt, throttle, shared response.
+
+        Returns:
+            The response (read-only; it may be shared), or None if
+            robots.txt disallows the URL
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        if self.is_allowed is not None and not self.is_allowed(url):
+            logger.debug(f"robots.txt disallows: {url}")
+            return None
+        with self.throttle.slot(url) if self.throttle else nullcontext():
+            return shared_get(self.session, url, params=params, timeout=self.timeout)
+
+    def is_wordpress_site(self, urls: List[str]) -> bool:
+        """
+        Detect whether posts on one site are served by WordPress.
+
+        The URLs are checked first; otherwise the first post is fetched
+        and its headers and markup are checked. The response is shared,
+        so an HTML fallback fetching the same post reuses it.
+
+        Args:
+            urls: Post URLs on one site
+
+        Returns:
+            True if the site looks like WordPress
+        """
+        if any(detect_blog_engine(url) == WORDPRESS for url in urls):
+            return True
+        try:
+            response = self._get(urls[0])
+        except requests.RequestException as e:
+            logger.debug(f"Could not fetch {urls[0]} to detect its blog engine: {e}")
+            return False
+        if response is None or response.status_code != 200:
+            return False
+        return detect_blog_engine(urls[0], html_text=response.text, headers=response.headers) == WORDPRESS
+
+    def fetch_comments(self, urls: List[str], limit: Optional[int] = None) -> Dict[str, List[Comment]]:
+        """
+        Fetch comments for several posts, batched per site.
+
+        Only sites detected as WordPress are queried. Posts on the same
+        site share one slug lookup and one paginated comment query; sites
+        without a usable REST API fall back to the per-post comment feeds.
+
+        Args:
+            urls: Blog post URLs
+            limit: Maximum number of comments to return overall
+
+        Returns:
+            Mapping of post URL to its comments. URLs that could not be
+            served through a machine endpoint are absent from the mapping.
+        """
+        results: Dict[str, List[Comment]] = {}
+
+        for site, site_urls in self._group_by_site(urls).items():
+            remaining = None if limit is None else limit - sum(len(c) for c in results.values())
+            if remaining is not None and remaining <= 0:
+                break
+
+            if not self.is_wordpress_site(site_urls):
+                continue
+
+            site_results = self._fetch_rest(site, site_urls, remaining)
+            if site_results is None:
+                site_results = {}
+                for url in site_urls:
+                    feed_comments = self.fetch_feed_comments(url)
+                    if feed_comments is not None:
+                        site_results[url] = feed_comments
+
+            results.update(site_results)
+
+        return results
+
+    def fetch_feed_comments(self, url: str) -> Optional[List[Comment]]:
+        """
+        Fetch comments for one post from its RSS comment feed.
+
+        Args:
+            url: The blog post URL
+
+        Returns:
+            List of Comment objects, or None if the feed is unavailable
+        """
+        feed_url = comment_feed_url(url)
+
+        try:
+            response = self._get(feed_url)
+            if response is None or response.status_code != 200:
+                return None
+            root = ElementTree.fromstring(response.content)
+        except (requests.RequestException, ElementTree.ParseError) as e:
+            logger.debug(f"Comment feed unavailable for {url}: {e}")
+            return None
+
+        comments = []
+        for item in root.iter('item'):
+            author = item.findtext('dc:creator', default='', namespaces=_RSS_NAMESPACES)
+            body = (item.findtext('content:encoded', default='', namespaces=_RSS_NAMESPACES)
+                    or item.findtext('description', default=''))
+            comment = self._make_comment(url, author, body, item.findtext('pubDate'))
+            if comment and self.constraints.accepts(comment):
+                comments.append(comment)
+
+        logger.info(f"Fetched {len(comments)} comments from feed {feed_url}")
+        return comments
+
+    def _fetch_rest(self, site: str, urls: List[str], limit: Optional[int]) -> Optional[Dict[str, List[Comment]]]:
+        """
+        Fetch comments for posts on one site through the REST API.
+
+        Returns:
+            Mapping of post URL to comments, or None if the site has no
+            usable REST API or the comments query failed
+        """
+        post_ids = self._resolve_post_ids(site, urls)
+        if post_ids is None:
+            return None
+
+        results: Dict[str, List[Comment]] = {url: [] for url in post_ids.values()}
+        if not post_ids:
+            return results
+
+        comments_url = f"{site}/wp-json/wp/v2/comments"
+        params = {
+            'post': ','.join(str(post_id) for post_id in post_ids),
+            'per_page': REST_PAGE_SIZE,
+            'orderby': 'date',
+            'order': 'asc',
+            '_fields': 'post,author_name,content,date_gmt',
+            **self.constraints.wordpress_params(),
+        }
+
+        fetched = 0
+        page = 1
+        total_pages = 1
+        while page <= min(total_pages, MAX_REST_PAGES):
+            try:
+                response = self._get(comments_url, params=dict(params, page=page))
+                if response is None:
+                    return None
+                response.raise_for_status()
+                items = response.json()
+            except (requests.RequestException, ValueError) as e:
+                # Which posts are incomplete is unknown; leave them all to the fallbacks
+                logger.debug(f"WordPress comments query failed on {site}: {e}")
+                return None
+            if not isinstance(items, list):
+                return None
+
+            for item in items:
+                post_url = post_ids.get(item.get('post'))
+                if post_url is None:
+                    continue
+                comment = self._make_comment(
+                    post_url,
+                    item.get('author_name', ''),
+                    (item.get('content') or {}).get('rendered', ''),
+                    item.get('date_gmt'),
+                )
+                if comment and self.constraints.accepts(comment):
+                    results[post_url].append(comment)
+                    fetched += 1
+                    if limit and fetched >= limit:
+                        return results
+
+            total_pages = int(response.headers.get('X-WP-TotalPages', 1) or 1)
+            page += 1
+
+        logger.info(f"Fetched {fetched} comments for {len(post_ids)} posts via WordPress REST API on {site}")
+        return results
+
+    def _resolve_post_ids(self, site: str, urls: List[str]) -> Optional[Dict[int, str]]:
+        """
+        Map post URLs to WordPress post IDs with one batched slug lookup.
+
+        Returns:
+            Mapping of post ID to post URL, or None if the REST API is
+            not available on the site
+        """
+        post_ids: Dict[int, str] = {}
+        slugs: Dict[str, str] = {}
+
+        for url in urls:
+            parsed = urlparse(url)
+            post_param = parse_qs(parsed.query).get('p', [''])[0]
+            if _POST_ID_RE.match(post_param):
+                post_ids[int(post_param)] = url
+                continue
+            segments = [s for s in parsed.path.split('/') if s]
+            if segments:
+                slugs[segments[-1]] = url
+
+        if not slugs:
+            return post_ids
+
+        try:
+            response = self._get(
+                f"{site}/wp-json/wp/v2/posts",
+                params={
+                    'slug': ','.join(slugs),
+                    'per_page': REST_PAGE_SIZE,
+                    '_fields': 'id,slug',
+                },
+            )
+            if response is None or response.status_code != 200:
+                return None
+            posts = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.debug(f"WordPress REST API unavailable on {site}: {e}")
+            return None
+
+        if not isinstance(posts, list):
+            return None
+
+        for post in posts:
+            url = slugs.get(post.get('slug'))
+            if url and post.get('id') is not None:
+                post_ids[post['id']] = url
+
+        return post_ids
+
+    def _make_comment(self, source_url: str, author: Optional[str], body: Optional[str],
+                      date_posted: Optional[str]) -> Optional[Comment]:
+        """Build a Comment from endpoint fields, skipping empty bodies."""
+        comment_text = html_to_text(body or '')
+        if len(comment_text) < 10:
+            return None
+
+        return Comment(
+            source_url=source_url,
+            platform=self.platform,
+            commenter_name=(author or '').strip()[:100] or "Anonymous",
+            comment_text=comment_text[:self.max_text_length],
+            date_posted=date_posted or None
+        )
+
+    @staticmethod
+    def _group_by_site(urls: List[str]) -> Dict[str, List[str]]:
+        """Group URLs by scheme and host, preserving order."""
+        sites: Dict[str, List[str]] = {}
+        for url in urls:
+            parsed = urlparse(url)
+            if not parsed.scheme or not parsed.netloc:
+                continue
+            sites.setdefault(f"{parsed.scheme}://{parsed.netloc}", []).append(url)
+        return sites
@@ -0,0 +1,85 @@
+"""
+Serialization helpers for comments.
+
+Comments are converted to dictionaries with a precomputed field getter
+instead of ``dataclasses.asdict``, which deep-copies every field. JSON is
+encoded with ``orjson`` when it is installed (``pip install
+commentradar[fast]``) and with the standard library otherwise; both
+produce the same output.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Sequence
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+# Separators for compact output, for machine consumers
+COMPACT_SEPARATORS = (',', ':')
+
+
+def make_dict_encoder(field_names: Sequence[str]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Build a function that converts an object to a dictionary of fields.
+
+    Args:
+        field_names: Attribute names, in output order
+
+    Returns:
+        Function mapping an object to ``{name: value}``
+    """
+    names = tuple(field_names)
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda obj: {names[0]: getter(obj)}
+
+    getter = attrgetter(*names)
+    return lambda obj: dict(zip(names, getter(obj)))
+
+
+def dumps(data: Any, indent: Optional[int] = 2) -> str:
+    """
+    Encode data as JSON.
+
+    Non-ASCII characters are written as-is, like
+    ``json.dumps(..., ensure_ascii=False)``.
+
+    Args:
+        data: JSON-serializable data
+        indent: Indentation width, or None for compact single-line output
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None and indent in (None, 2):
+        try:
+            option = orjson.OPT_INDENT_2 if indent else 0
+            return orjson.dumps(data, option=option).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers beyond 64 bits or lone surrogates
+            pass
+
+    if indent is None:
+        return json.dumps(data, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+    return json.dumps(data, ensure_ascii=False, indent=indent)
+
+
+def loads(text: str) -> Any:
+    """
+    Decode a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def backend_name() -> str:
+    """Return the name of the JSON backend in use."""
+    return 'orjson' if orjson is not None else 'json'
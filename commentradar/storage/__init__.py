@@ -0,0 +1,52 @@
+"""
+Storage backends for scraped comments.
+"""
+
+from commentradar.storage.jsonl import (
+    is_jsonl_path,
+    write_jsonl,
+    append_jsonl,
+    append_unique,
+    iter_jsonl,
+    iter_comment_dicts,
+    convert_json_to_jsonl,
+)
+from commentradar.storage.append import AppendOnlyStore
+from commentradar.storage.archive import CommentArchive
+from commentradar.storage.base import CommentStore
+from commentradar.storage.bloom import ScalableBloomFilter
+from commentradar.storage.sqlite import SQLiteCommentStore, is_sqlite_path
+
+
+def open_store(path: str) -> CommentStore:
+    """
+    Open the comment store for a path, chosen by file extension.
+
+    Args:
+        path: Store path (.db, .sqlite or .sqlite3 for SQLite; JSON Lines
+            and JSON array files get an append-only store)
+
+    Returns:
+        An open CommentStore
+    """
+    if is_sqlite_path(path):
+        return SQLiteCommentStore(path)
+    return AppendOnlyStore(path)
+
+
+__all__ = [
+    'is_jsonl_path',
+    'write_jsonl',
+    'append_jsonl',
+    'append_unique',
+    'iter_jsonl',
+    'iter_comment_dicts',
+    'convert_json_to_jsonl',
+    'AppendOnlyStore',
+    'CommentArchive',
+    'CommentStore',
+    'ScalableBloomFilter',
+    'SQLiteCommentStore',
+    'is_sqlite_path',
+    'open_store',
+]
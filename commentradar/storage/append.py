@@ -0,0 +1,436 @@
+"""
+Append-only comment store for JSON Lines and JSON array files.
+
+New comments are appended to the end of the file; existing rows are never
+read or rewritten. The ``Comment.id`` of every stored row is kept in a
+sidecar file (``<file>.ids``, 8 bytes per comment), which is the
+authoritative dedup index.
+
+Deduplication checks a scalable Bloom filter of the ids first (persisted
+as ``<file>.bloom``, about 2 bytes per comment at the default 0.1%
+false-positive rate), so memory stays bounded however large the file
+grows. Ids the filter reports as possibly stored are checked against a
+small set of recently seen ids (re-scrapes mostly return recent comments)
+and then, in one pass per batch, against the sidecar file.
+
+The sidecar records how many bytes of the file it covers. Rows appended
+to a JSON Lines file by another writer are picked up by scanning only the
+uncovered tail; a file that was rewritten or truncated is re-indexed in
+one streaming pass. JSON array files are appended to in place, before
+their closing bracket.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set
+import hashlib
+import logging
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from commentradar.models import Comment, comment_id
+from commentradar.serialization import dumps, loads
+from commentradar.storage.base import CommentStore
+from commentradar.storage.bloom import BLOOM_SUFFIX, DEFAULT_ERROR_RATE, ScalableBloomFilter
+from commentradar.storage.jsonl import is_jsonl_path, iter_comment_dicts
+from commentradar.storage.lsh import _id_to_bytes
+from commentradar.storage.sqlite import COUNTABLE_FIELDS
+from commentradar.utils.dates import parse_date_bound
+
+
+logger = logging.getLogger(__name__)
+
+
+IDS_SUFFIX = '.ids'
+IDS_MAGIC = b'CRIDS001'
+
+# Magic, covered byte count of the data file, hash of its first bytes
+IDS_HEADER = struct.Struct('<8sQ8s')
+
+# Bytes fingerprinted to detect a rewritten data file
+HEAD_BYTES = 4096
+
+# Ids read from the sidecar at a time when verifying filter hits
+VERIFY_CHUNK = 1 << 20
+
+# Rows indexed per batch when (re)building the index
+INDEX_BATCH = 50_000
+
+# Recently stored or verified ids kept in memory
+RECENT_SIZE = 50_000
+
+_ID = struct.Struct('<Q')
+
+
+def _key(row_id: str) -> int:
+    """Comment id as the 64-bit integer stored in the sidecar."""
+    return _ID.unpack(_id_to_bytes(row_id))[0]
+
+
+class AppendOnlyStore(CommentStore):
+    """Comment store that appends to a JSON Lines or JSON array file."""
+
+    def __init__(self, path: str, ids_path: Optional[str] = None, error_rate: float = DEFAULT_ERROR_RATE):
+        """
+        Open a store, loading (or building) its id index.
+
+        Args:
+            path: Data file path (.jsonl/.ndjson, anything else is a JSON array)
+            ids_path: Id sidecar path (default: ``path + '.ids'``); the
+                Bloom filter is kept next to it
+            error_rate: False-positive rate of the Bloom filter; lower rates
+                cost memory, higher rates cost sidecar reads
+        """
+        self.path = path
+        self.ids_path = ids_path or path + IDS_SUFFIX
+        self.bloom_path = os.path.splitext(self.ids_path)[0] + BLOOM_SUFFIX
+        self.jsonl = is_jsonl_path(path)
+        self.error_rate = error_rate
+        self._bloom = ScalableBloomFilter(error_rate)
+        self._saved = 0
+        self._covered = 0
+        self._pending: Dict[int, None] = {}
+        self._recent: 'OrderedDict[int, None]' = OrderedDict()
+        self._load()
+        self._sync()
+
+    def _head_hash(self, length: int) -> bytes:
+        """Fingerprint of the first ``length`` bytes of the data file."""
+        with open(self.path, 'rb') as f:
+            return hashlib.blake2b(f.read(min(length, HEAD_BYTES)), digest_size=8).digest()
+
+    def _size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _load(self):
+        """Load the sidecar and filter if they match the data file."""
+        try:
+            with open(self.ids_path, 'rb') as f:
+                header = f.read(IDS_HEADER.size)
+                records = os.fstat(f.fileno()).st_size - IDS_HEADER.size
+        except OSError:
+            return
+        if len(header) != IDS_HEADER.size:
+            return
+        magic, covered, head = IDS_HEADER.unpack(header)
+        if magic != IDS_MAGIC or covered > self._size() or (covered and head != self._head_hash(covered)):
+            logger.info(f"{self.ids_path} does not match {self.path}, rebuilding it")
+            return
+        if records % _ID.size:
+            logger.warning(f"Ignoring a partial record at the end of {self.ids_path}")
+        self._saved = records // _ID.size
+        self._covered = covered
+
+        bloom = ScalableBloomFilter.load(self.bloom_path)
+        if bloom is None or bloom.error_rate != self.error_rate or bloom.count != self._saved:
+            logger.info(f"Rebuilding Bloom filter {self.bloom_path} from {self._saved} ids")
+            bloom = ScalableBloomFilter(self.error_rate)
+            for chunk in self._stored_chunks():
+                bloom.add_many(chunk)
+            self._save_filter(bloom)
+        self._bloom = bloom
+        logger.debug(f"Loaded {self._saved} ids for {self.path} ({bloom.nbytes} filter bytes)")
+
+    def _sync(self):
+        """Bring the id index up to date with the data file."""
+        size = self._size()
+        if size == self._covered:
+            return
+        if self._covered and size > self._covered and self.jsonl:
+            logger.info(f"Indexing rows appended to {self.path} by another writer")
+            self._scan_tail()
+        else:
+            if self._covered:
+                logger.info(f"{self.path} was rewritten, rebuilding {self.ids_path}")
+            self._rebuild()
+        self.flush()
+
+    def _reset(self):
+        self._bloom = ScalableBloomFilter(self.error_rate)
+        self._saved = 0
+        self._covered = 0
+        self._pending = {}
+        self._recent.clear()
+
+    def _rebuild(self):
+        """Index every row of the data file."""
+        self._reset()
+        if self._size():
+            self._index(comment_id(row) for row in iter_comment_dicts(self.path))
+        self._covered = self._size()
+
+    def _scan_tail(self):
+        """Index the complete JSON Lines rows past the covered bytes."""
+        ids = []
+        with open(self.path, 'rb') as f:
+            f.seek(self._covered)
+            position = self._covered
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # A write in progress
+                position += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    ids.append(comment_id(loads(line)))
+                except ValueError as e:
+                    logger.warning(f"Skipping malformed row in {self.path}: {e}")
+        self._index(ids)
+        self._covered = position
+
+    def _index(self, ids: Iterable[str]):
+        """Record the ids of existing rows, in bounded batches."""
+        batch: Dict[int, None] = {}
+        for row_id in ids:
+            batch[_key(row_id)] = None
+            if len(batch) >= INDEX_BATCH:
+                self._record(self._filter_new(list(batch)))
+                self._flush_ids()
+                batch = {}
+        if batch:
+            self._record(self._filter_new(list(batch)))
+
+    def _stored_chunks(self) -> Iterator[Sequence[int]]:
+        """Read the saved ids from the sidecar, a chunk at a time."""
+        if not self._saved:
+            return
+        with open(self.ids_path, 'rb') as f:
+            f.seek(IDS_HEADER.size)
+            remaining = self._saved
+            while remaining:
+                data = f.read(min(remaining, VERIFY_CHUNK) * _ID.size)
+                if not data:
+                    break
+                remaining -= len(data) // _ID.size
+                if np is not None:
+                    yield np.frombuffer(data, dtype='<u8')
+                else:
+                    yield [key for (key,) in _ID.iter_unpack(data)]
+
+    def _stored(self, keys: Sequence[int]) -> Set[int]:
+        """Return which of the keys are stored, reading the sidecar at most once."""
+        found = {key for key in keys if key in self._pending or key in self._recent}
+        missing = set(keys) - found
+        if missing:
+            for chunk in self._stored_chunks():
+                if np is not None:
+                    hits = chunk[np.isin(chunk, np.fromiter(missing, dtype=np.uint64, count=len(missing)))]
+                    hits = set(hits.tolist())
+                else:
+                    hits = missing.intersection(chunk)
+                found |= hits
+                missing -= hits
+                if not missing:
+                    break
+        for key in found:
+            self._remember(key)
+        return found
+
+    def _filter_new(self, keys: List[int]) -> List[int]:
+        """Return the distinct keys that are not stored yet, in order."""
+        maybe = self._bloom.contains_many(keys)
+        doubtful = [key for key, hit in zip(keys, maybe) if hit]
+        if not doubtful:
+            return keys
+        stored = self._stored(doubtful)
+        logger.debug(f"{len(doubtful)} Bloom filter hits, {len(stored)} already stored")
+        return [key for key in keys if key not in stored]
+
+    def _remember(self, key: int):
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        if len(self._recent) > RECENT_SIZE:
+            self._recent.popitem(last=False)
+
+    def _record(self, keys: List[int]):
+        """Add new keys to the filter and the pending sidecar records."""
+        self._bloom.add_many(keys)
+        self._pending.update(dict.fromkeys(keys))
+        for key in keys[-RECENT_SIZE:] if RECENT_SIZE else ():
+            self._remember(key)
+
+    def _flush_ids(self) -> bool:
+        """Append pending ids to the sidecar and update its header."""
+        head = self._head_hash(self._covered) if self._covered else b'\0' * 8
+        header = IDS_HEADER.pack(IDS_MAGIC, self._covered, head)
+        records = b''.join(_ID.pack(key) for key in self._pending)
+        try:
+            if self._saved and os.path.exists(self.ids_path):
+                with open(self.ids_path, 'r+b') as f:
+                    # Drops a partial record left by an interrupted write
+                    f.truncate(IDS_HEADER.size + self._saved * _ID.size)
+                    f.seek(0, os.SEEK_END)
+                    f.write(records)
+                    f.seek(0)
+                    f.write(header)
+            else:
+                with open(self.ids_path, 'wb') as f:
+                    f.write(header)
+                    f.write(records)
+        except OSError as e:
+            # A read-only location only costs a rebuild next time
+            logger.debug(f"Could not write {self.ids_path}: {e}")
+            return False
+        self._saved += len(self._pending)
+        self._pending = {}
+        return True
+
+    def _save_filter(self, bloom: ScalableBloomFilter):
+        try:
+            bloom.save(self.bloom_path)
+        except OSError as e:
+            logger.debug(f"Could not write {self.bloom_path}: {e}")
+
+    def flush(self):
+        """Write pending ids to the sidecar and save the Bloom filter."""
+        if self._flush_ids():
+            self._save_filter(self._bloom)
+
+    def _append_jsonl(self, comments: List[Comment]):
+        rows = ''.join(dumps(comment.to_dict(), indent=None) + '\n' for comment in comments)
+        with open(self.path, 'ab') as f:
+            if f.tell() and not self._ends_with_newline():
+                f.write(b'\n')  # Ends an interrupted row
+            f.write(rows.encode('utf-8'))
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _append_json(self, comments: List[Comment]):
+        """Insert rows before the closing bracket of the JSON array."""
+        rows = ',\n'.join(
+            '\n'.join('  ' + line for line in dumps(comment.to_dict(), indent=2).split('\n'))
+            for comment in comments
+        ).encode('utf-8')
+
+        if not self._size():
+            with open(self.path, 'wb') as f:
+                f.write(b'[\n' + rows + b'\n]')
+            return
+
+        with open(self.path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            tail_start = max(f.tell() - HEAD_BYTES, 0)
+            f.seek(tail_start)
+            tail = f.read().rstrip()
+            last = tail[:-1].rstrip()
+            if not tail.endswith(b']') or not last:
+                raise ValueError(f"{self.path} does not end with a JSON array")
+            # Cut after the last row (or the opening bracket) and re-close
+            f.seek(tail_start + len(last))
+            f.truncate()
+            f.write((b'\n' if last.endswith(b'[') else b',\n') + rows + b'\n]')
+
+    def add(self, comments: Iterable[Comment]) -> List[Comment]:
+        """
+        Append the comments whose id is not stored yet.
+
+        Args:
+            comments: Comments to store
+
+        Returns:
+            The comments that were appended
+
+        Raises:
+            ValueError: If a JSON array file is malformed at its end
+        """
+        self._sync()
+        keyed: Dict[int, Comment] = {}
+        for comment in comments:
+            keyed.setdefault(_key(comment.id), comment)
+        new_keys = self._filter_new(list(keyed))
+        if not new_keys:
+            return []
+
+        new_comments = [keyed[key] for key in new_keys]
+        if self.jsonl:
+            self._append_jsonl(new_comments)
+        else:
+            self._append_json(new_comments)
+        self._record(new_keys)
+        self._covered = self._size()
+        self.flush()
+        logger.debug(f"Appended {len(new_comments)} comments to {self.path}")
+        return new_comments
+
+    def __contains__(self, comment: Comment) -> bool:
+        key = _key(comment.id)
+        return key in self._bloom and bool(self._stored([key]))
+
+    def query(
+        self,
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Comment]:
+        """Return stored comments matching the given criteria, in file order (one streaming pass)."""
+        start = parse_date_bound(start_date) if start_date else None
+        end = parse_date_bound(end_date, end=True) if end_date else None
+        sentiment = sentiment.lower() if sentiment else None
+
+        matches = []
+        if limit == 0:
+            return matches
+        for comment in self:
+            if platform and comment.platform != platform:
+                continue
+            if sentiment and (comment.sentiment or '').lower() != sentiment:
+                continue
+            if start is not None or end is not None:
+                timestamp = comment.timestamp
+                if timestamp is None:
+                    continue
+                if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                    continue
+            matches.append(comment)
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        """Count stored comments per platform, sentiment or commenter."""
+        if field not in COUNTABLE_FIELDS:
+            raise ValueError(f"Cannot count by field: {field}")
+        values = (row.get(field) for row in self._iter_dicts())
+        if field == 'sentiment':
+            values = (value.lower() if value else value for value in values)
+        counts = Counter(values)
+        counts.pop(None, None)
+        return dict(counts.most_common())
+
+    def clear(self):
+        """Remove all stored comments."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            if not self.jsonl:
+                f.write('[]')
+        self._reset()
+        self._covered = self._size()
+        self.flush()
+
+    def _iter_dicts(self) -> Iterator[dict]:
+        if not self._size():
+            return iter(())
+        return iter_comment_dicts(self.path)
+
+    def __len__(self) -> int:
+        return self._saved + len(self._pending)
+
+    def __iter__(self) -> Iterator[Comment]:
+        for row in self._iter_dicts():
+            yield Comment.from_dict(row)
+
+    def close(self):
+        """Write pending ids."""
+        if self._pending:
+            self.flush()
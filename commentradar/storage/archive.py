@@ -0,0 +1,211 @@
+"""
+Memory-mapped, lazily decoded JSON Lines archives.
+
+A ``CommentArchive`` maps a JSON Lines file and keeps the byte offset of
+every row in a sidecar index (``<file>.idx``), so opening an archive costs
+a read of the index rather than a parse of every row. Rows are decoded
+only when accessed. When the file has grown since the index was written,
+only the appended bytes are scanned.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Union
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+
+from commentradar.models import Comment
+from commentradar.serialization import loads
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'CRIDX001'
+
+# Magic, indexed byte count, row count, hash of the first row
+INDEX_HEADER = struct.Struct('<8sQQ8s')
+
+
+def _head_hash(first_row: bytes) -> bytes:
+    """Fingerprint of the first row, to detect a rewritten file."""
+    return hashlib.blake2b(first_row, digest_size=8).digest()
+
+
+class CommentArchive:
+    """
+    Read-only, random-access view of a JSON Lines comment file.
+
+    Supports ``len()``, indexing and slicing (negative indices included),
+    and iteration; each access decodes only the rows it touches. Rows that
+    are not terminated by a newline yet (a write in progress) are not
+    visible until ``refresh()`` after the write completes.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        """
+        Open an archive, building or extending its index as needed.
+
+        Args:
+            path: JSON Lines file path
+            index_path: Sidecar index path (default: ``path + '.idx'``)
+        """
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+        self._file = open(path, 'rb')
+        self._mm = None
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self.offsets = array('Q')
+        self._indexed = 0
+        self._head = None
+
+    def refresh(self):
+        """Map the current file contents and index rows appended since the last call."""
+        size = os.fstat(self._file.fileno()).st_size
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        if not self._indexed:
+            self._load_index(size)
+        elif self._indexed > size or (self.offsets and _head_hash(self._row_bytes(0)) != self._head):
+            logger.info(f"{self.path} was rewritten, rebuilding its index")
+            self._reset()
+
+        if self._indexed < size:
+            previous = len(self.offsets)
+            self._scan(size)
+            if len(self.offsets) != previous or not os.path.exists(self.index_path):
+                self._save_index(previous)
+
+    def _load_index(self, size: int):
+        """Load the sidecar index if it is intact and matches the file."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                header = f.read(INDEX_HEADER.size)
+                if len(header) != INDEX_HEADER.size:
+                    return
+                magic, indexed, count, head = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC or indexed > size:
+                    return
+                offsets = array('Q')
+                offsets.frombytes(f.read(count * offsets.itemsize))
+        except (OSError, ValueError):
+            return
+
+        if len(offsets) != count or (offsets and offsets[0] >= indexed):
+            return
+        self.offsets = offsets
+        self._indexed = indexed
+        if offsets:
+            self._head = _head_hash(self._row_bytes(0))
+            if head != self._head:
+                self._reset()
+
+    def _scan(self, size: int):
+        """Record the offsets of complete, non-blank rows past the indexed bytes."""
+        mm = self._mm
+        find = mm.find
+        append = self.offsets.append
+        position = self._indexed
+        while position < size:
+            end = find(b'\n', position)
+            if end < 0:
+                break  # Incomplete last row
+            if mm[position:end].strip():
+                append(position)
+            position = end + 1
+        self._indexed = position
+        if self.offsets and self._head is None:
+            self._head = _head_hash(self._row_bytes(0))
+
+    def _save_index(self, previous: int):
+        """Write the index, appending only the offsets added since ``previous``."""
+        head = self._head or b'\0' * 8
+        header = INDEX_HEADER.pack(INDEX_MAGIC, self._indexed, len(self.offsets), head)
+        try:
+            if previous and os.path.exists(self.index_path):
+                with open(self.index_path, 'r+b') as f:
+                    f.seek(INDEX_HEADER.size + previous * self.offsets.itemsize)
+                    f.truncate()
+                    f.write(self.offsets[previous:].tobytes())
+                    f.seek(0)
+                    f.write(header)
+            else:
+                with open(self.index_path, 'wb') as f:
+                    f.write(header)
+                    f.write(self.offsets.tobytes())
+        except OSError as e:
+            # A read-only location only costs a rescan next time
+            logger.debug(f"Could not write index {self.index_path}: {e}")
+
+    def _row_bytes(self, i: int) -> bytes:
+        start = self.offsets[i]
+        end = self._mm.find(b'\n', start)
+        return self._mm[start:end]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """
+        Decode one row as a dictionary.
+
+        Args:
+            i: Row number (negative counts from the end)
+
+        Raises:
+            IndexError: If the row does not exist
+            json.JSONDecodeError: If the row is malformed
+        """
+        if i < 0:
+            i += len(self.offsets)
+        if not 0 <= i < len(self.offsets):
+            raise IndexError(f"Row {i} out of range")
+        return loads(self._row_bytes(i))
+
+    def iter_dicts(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Decode rows as dictionaries, skipping malformed ones.
+
+        Args:
+            start: First row number
+        """
+        for i in range(start, len(self.offsets)):
+            try:
+                yield loads(self._row_bytes(i))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed row {i} in {self.path}: {e}")
+
+    def tail(self, n: int) -> List[Comment]:
+        """Return the last ``n`` comments."""
+        return [Comment.from_dict(row) for row in self.iter_dicts(max(len(self.offsets) - n, 0))]
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Comment, List[Comment]]:
+        if isinstance(key, slice):
+            return [Comment.from_dict(self.row(i)) for i in range(*key.indices(len(self.offsets)))]
+        return Comment.from_dict(self.row(key))
+
+    def __iter__(self) -> Iterator[Comment]:
+        for row in self.iter_dicts():
+            yield Comment.from_dict(row)
+
+    def close(self):
+        """Unmap and close the file."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
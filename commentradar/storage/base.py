@@ -0,0 +1,86 @@
+"""
+Abstract comment store.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from commentradar.models import Comment
+
+
+class CommentStore(ABC):
+    """Persistent storage for comments, deduplicated by ``Comment.id``."""
+
+    @abstractmethod
+    def add(self, comments: Iterable[Comment]) -> List[Comment]:
+        """
+        Store comments, skipping ones that are already stored.
+
+        Args:
+            comments: Comments to store
+
+        Returns:
+            The comments that were not stored before
+        """
+        pass
+
+    @abstractmethod
+    def query(
+        self,
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Comment]:
+        """
+        Return stored comments matching the given criteria.
+
+        Args:
+            platform: Only comments from this platform
+            start_date: Only comments posted on or after this date
+            end_date: Only comments posted on or before this date (a bare
+                date covers the whole day)
+            sentiment: Only comments with this sentiment
+            limit: Maximum number of comments
+
+        Returns:
+            List of Comment objects
+        """
+        pass
+
+    @abstractmethod
+    def count_by(self, field: str) -> Dict[str, int]:
+        """
+        Count stored comments per value of a field.
+
+        Args:
+            field: 'platform', 'sentiment' or 'commenter_name'
+
+        Returns:
+            Mapping of value to count, most common first
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove all stored comments."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Comment]:
+        pass
+
+    def close(self):
+        """Release resources held by the store."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,242 @@
+"""
+Scalable Bloom filter over 64-bit keys.
+
+A Bloom filter answers "possibly stored" or "definitely not stored" in a
+fixed number of bits per key (about 14 at a 0.1% false-positive rate,
+against roughly 100 bytes per entry in a Python set). A scalable filter
+(Almeida et al., 2007) starts with one slice sized for
+``initial_capacity`` keys and adds larger slices with tighter error rates
+as it fills, so the overall false-positive rate stays below ``error_rate``
+without knowing the final size in advance.
+
+Keys are expected to be uniformly distributed already (``Comment.id`` is
+a hash), so bit positions are derived from the key itself by double
+hashing. NumPy is used for bulk operations when installed
+(``pip install commentradar[fast]``).
+"""
+
+from typing import List, Optional, Sequence
+import logging
+import math
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+logger = logging.getLogger(__name__)
+
+
+BLOOM_SUFFIX = '.bloom'
+BLOOM_MAGIC = b'CRBLM001'
+
+# Magic, target error rate, initial capacity, slice count
+BLOOM_HEADER = struct.Struct('<8sdQI')
+
+# Capacity, key count, bit count, hash count
+SLICE_HEADER = struct.Struct('<QQQI')
+
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_CAPACITY = 100_000
+
+# Each slice holds GROWTH times the keys of the previous one, at
+# TIGHTENING times its error rate
+GROWTH = 2
+TIGHTENING = 0.5
+
+_MASK64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over 64-bit keys."""
+
+    def __init__(self, capacity: int, error_rate: float, seed: int = 0):
+        """
+        Size a filter.
+
+        Args:
+            capacity: Keys the filter holds at ``error_rate``
+            error_rate: False-positive rate at capacity
+            seed: Varies the bit positions between filters
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.seed = seed
+        self.num_bits = max(8, math.ceil(capacity * math.log(1 / error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, math.ceil(math.log2(1 / error_rate)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: int) -> List[int]:
+        mixed = ((key ^ self.seed) * _MIX) & _MASK64
+        h1 = mixed & 0xFFFFFFFF
+        h2 = (mixed >> 32) | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def _positions_array(self, keys: 'np.ndarray') -> 'np.ndarray':
+        """Bit positions of many keys, shape (num_hashes, len(keys))."""
+        # uint64 arithmetic wraps, which is the mask of _positions
+        mixed = (keys ^ np.uint64(self.seed)) * np.uint64(_MIX)
+        h1 = mixed & np.uint64(0xFFFFFFFF)
+        h2 = (mixed >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)[:, None]
+        return (h1 + steps * h2) % np.uint64(self.num_bits)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def add(self, key: int):
+        """Add a key."""
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def add_many(self, keys: Sequence[int]):
+        """Add keys (vectorized when numpy is installed)."""
+        if np is None:
+            for key in keys:
+                self.add(key)
+            return
+        positions = self._positions_array(np.asarray(keys, dtype=np.uint64)).ravel()
+        view = np.frombuffer(self.bits, dtype=np.uint8)
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(view, positions >> np.uint64(3), masks)
+        self.count += len(keys)
+
+    def __contains__(self, key: int) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] >> (position & 7) & 1 for position in self._positions(key))
+
+    def contains_many(self, keys: 'np.ndarray') -> 'np.ndarray':
+        """Membership of many keys as a boolean array (needs numpy)."""
+        positions = self._positions_array(keys)
+        view = np.frombuffer(self.bits, dtype=np.uint8)
+        return ((view[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1).all(axis=0)
+
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by adding slices, with a bounded error rate."""
+
+    def __init__(self, error_rate: float = DEFAULT_ERROR_RATE, initial_capacity: int = DEFAULT_CAPACITY):
+        """
+        Create an empty filter.
+
+        Args:
+            error_rate: Bound on the overall false-positive rate
+            initial_capacity: Keys held by the first slice
+
+        Raises:
+            ValueError: If ``error_rate`` is not between 0 and 1
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError(f"Bloom filter error rate must be between 0 and 1, got {error_rate}")
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.filters: List[BloomFilter] = []
+
+    def _add_slice(self) -> BloomFilter:
+        i = len(self.filters)
+        # The slice error rates sum to at most error_rate
+        bloom = BloomFilter(
+            self.initial_capacity * GROWTH ** i,
+            self.error_rate * (1 - TIGHTENING) * TIGHTENING ** i,
+            seed=i
+        )
+        self.filters.append(bloom)
+        return bloom
+
+    def _current(self) -> BloomFilter:
+        if not self.filters or self.filters[-1].full:
+            return self._add_slice()
+        return self.filters[-1]
+
+    def add(self, key: int):
+        """Add a key."""
+        self._current().add(key)
+
+    def add_many(self, keys: Sequence[int]):
+        """Add keys, filling slices up to their capacity."""
+        start = 0
+        while start < len(keys):
+            bloom = self._current()
+            end = start + bloom.capacity - bloom.count
+            bloom.add_many(keys[start:end])
+            start = end
+
+    def __contains__(self, key: int) -> bool:
+        return any(key in bloom for bloom in self.filters)
+
+    def contains_many(self, keys: Sequence[int]) -> List[bool]:
+        """Membership of many keys (vectorized when numpy is installed)."""
+        if np is None or not self.filters:
+            return [key in self for key in keys]
+        array = np.asarray(keys, dtype=np.uint64)
+        found = np.zeros(len(array), dtype=bool)
+        for bloom in self.filters:
+            found |= bloom.contains_many(array)
+        return found.tolist()
+
+    @property
+    def count(self) -> int:
+        """Number of keys added."""
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit arrays."""
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    def save(self, path: str):
+        """Write the filter to a file, replacing it atomically."""
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.error_rate, self.initial_capacity, len(self.filters)))
+            for bloom in self.filters:
+                f.write(SLICE_HEADER.pack(bloom.capacity, bloom.count, bloom.num_bits, bloom.num_hashes))
+                f.write(bloom.bits)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['ScalableBloomFilter']:
+        """
+        Read a filter written by ``save``.
+
+        Returns:
+            The filter, or None if the file is missing or not a valid filter
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < BLOOM_HEADER.size:
+            return None
+        magic, error_rate, initial_capacity, slices = BLOOM_HEADER.unpack_from(data)
+        if magic != BLOOM_MAGIC:
+            return None
+
+        loaded = cls(error_rate, initial_capacity)
+        offset = BLOOM_HEADER.size
+        for i in range(slices):
+            if len(data) < offset + SLICE_HEADER.size:
+                return None
+            capacity, count, num_bits, num_hashes = SLICE_HEADER.unpack_from(data, offset)
+            offset += SLICE_HEADER.size
+            bloom = loaded._add_slice()
+            if (bloom.capacity, bloom.num_bits, bloom.num_hashes) != (capacity, num_bits, num_hashes):
+                logger.warning(f"Bloom filter {path} has unexpected slice sizes")
+                return None
+            size = len(bloom.bits)
+            if len(data) < offset + size:
+                return None
+            bloom.bits[:] = data[offset:offset + size]
+            bloom.count = count
+            offset += size
+        return loaded
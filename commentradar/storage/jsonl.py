@@ -0,0 +1,238 @@
+"""
+JSON Lines storage for comments.
+
+One comment per line means files can be written and read as streams and
+new comments can be appended without touching existing rows. Legacy JSON
+array files can be converted with::
+
+    python -m commentradar.storage.jsonl comments.json [comments.jsonl]
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+import json
+import logging
+import os
+
+from commentradar.models import Comment, comment_id
+from commentradar.serialization import dumps, loads
+
+
+logger = logging.getLogger(__name__)
+
+
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def is_jsonl_path(path: str) -> bool:
+    """Check whether a path names a JSON Lines file."""
+    return path.lower().endswith(JSONL_EXTENSIONS)
+
+
+def write_jsonl(comments: Iterable[Comment], path: str, append: bool = False) -> int:
+    """
+    Write comments as JSON Lines, one row at a time.
+
+    Args:
+        comments: Comments to write
+        path: Output file path
+        append: Append to the file instead of overwriting it
+
+    Returns:
+        Number of comments written
+    """
+    count = 0
+    with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+        for comment in comments:
+            f.write(dumps(comment.to_dict(), indent=None))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def append_jsonl(comments: Iterable[Comment], path: str) -> int:
+    """
+    Append comments to a JSON Lines file without reading it.
+
+    Args:
+        comments: Comments to append
+        path: File path (created if missing)
+
+    Returns:
+        Number of comments appended
+    """
+    return write_jsonl(comments, path, append=True)
+
+
+def append_unique(
+    comments: Iterable[Comment],
+    path: str,
+    key: Optional[Callable[[Dict[str, Any]], Hashable]] = None
+) -> List[Comment]:
+    """
+    Append the comments that are not already in a JSON Lines file.
+
+    Every call streams all existing rows to collect their keys, so it
+    costs time proportional to the file size; only new rows are written.
+    For repeated appends to the same file, use ``AppendOnlyStore``
+    (``commentradar.storage.open_store``), which keeps its id index
+    between calls.
+
+    Args:
+        comments: Candidate comments
+        path: File path (created if missing)
+        key: Function mapping a row dictionary to its dedup key
+            (default: the comment id)
+
+    Returns:
+        The comments that were appended
+    """
+    if key is None:
+        key = comment_id
+
+    existing_keys = set()
+    if os.path.exists(path):
+        existing_keys = {key(row) for row in iter_jsonl_dicts(path)}
+
+    unique_new = []
+    for comment in comments:
+        comment_key = comment.id if key is comment_id else key(comment.to_dict())
+        if comment_key not in existing_keys:
+            existing_keys.add(comment_key)
+            unique_new.append(comment)
+
+    append_jsonl(unique_new, path)
+    return unique_new
+
+
+def iter_jsonl_dicts(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows from a JSON Lines file as dictionaries.
+
+    Args:
+        path: File path
+
+    Yields:
+        One dictionary per non-empty line
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except json.JSONDecodeError as e:
+                # A partially written last line must not break readers
+                logger.warning(f"Skipping malformed line {line_number} in {path}: {e}")
+
+
+def iter_jsonl(path: str) -> Iterator[Comment]:
+    """
+    Stream comments from a JSON Lines file.
+
+    Args:
+        path: File path
+
+    Yields:
+        Comment objects
+    """
+    for row in iter_jsonl_dicts(path):
+        yield Comment.from_dict(row)
+
+
+def iter_json_array(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows from a legacy JSON array file without loading it whole.
+
+    Args:
+        path: File path
+
+    Yields:
+        One dictionary per array element
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+
+    with open(path, 'r', encoding='utf-8') as f:
+        eof = False
+        while True:
+            # Skip whitespace, the opening bracket and separators
+            while position < len(buffer) and buffer[position] in ' \t\r\n,[':
+                if buffer[position] == '[':
+                    started = True
+                position += 1
+
+            if position < len(buffer) and buffer[position] == ']':
+                return
+
+            if position < len(buffer) and started:
+                try:
+                    row, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield row
+                    position = end
+                    continue
+
+            if eof:
+                return
+
+            chunk = f.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def iter_comment_dicts(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a JSON Lines or legacy JSON array file."""
+    if is_jsonl_path(path):
+        return iter_jsonl_dicts(path)
+    return iter_json_array(path)
+
+
+def convert_json_to_jsonl(source: str, destination: Optional[str] = None) -> int:
+    """
+    Convert a legacy JSON array file to JSON Lines.
+
+    Args:
+        source: JSON array file
+        destination: Output path (default: ``source`` with a .jsonl extension)
+
+    Returns:
+        Number of rows converted
+    """
+    if destination is None:
+        destination = os.path.splitext(source)[0] + '.jsonl'
+
+    count = 0
+    with open(destination, 'w', encoding='utf-8') as f:
+        for row in iter_json_array(source):
+            f.write(dumps(row, indent=None))
+            f.write('\n')
+            count += 1
+
+    logger.info(f"Converted {count} rows from {source} to {destination}")
+    return count
+
+
+def main():
+    """CLI entry point for converting legacy JSON files."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert a CommentRadar JSON array file to JSON Lines')
+    parser.add_argument('source', help='Legacy JSON array file')
+    parser.add_argument('destination', nargs='?', help='Output .jsonl file (default: next to source)')
+    args = parser.parse_args()
+
+    count = convert_json_to_jsonl(args.source, args.destination)
+    print(f"✓ Converted {count} comments")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""
+Near-duplicate index over comment text.
+
+The same content is often cross-posted to several platforms with small
+edits, so exact ``Comment.id`` matching misses it and pairwise comparison
+is quadratic. ``NearDuplicateIndex`` keeps a MinHash signature per comment
+(see ``commentradar.utils.minhash``) and buckets its bands (LSH): a lookup
+hashes the new text, checks one bucket per band and verifies the few
+candidates by estimated Jaccard similarity, independent of the index size.
+
+Signatures are persisted in an append-only sidecar (``<output>.lsh`` by
+default) and only new entries are written, so an index over a large
+archive is loaded once and updated incrementally.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import hashlib
+import logging
+import os
+import struct
+
+from commentradar.models import Comment
+from commentradar.utils.minhash import DEFAULT_NUM_PERM, SEED, MinHasher, similarity, words
+
+
+logger = logging.getLogger(__name__)
+
+
+LSH_SUFFIX = '.lsh'
+LSH_MAGIC = b'CRLSH001'
+
+# Magic, signature length, band count, hash seed
+LSH_HEADER = struct.Struct('<8sHHQ')
+
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.7
+
+# Shorter texts ("Great post, thanks!") are too generic to call duplicates
+DEFAULT_MIN_WORDS = 6
+
+_ID_BYTES = 8
+
+
+def _id_to_bytes(comment_id: str) -> bytes:
+    try:
+        raw = bytes.fromhex(comment_id)
+    except ValueError:
+        raw = b''
+    if len(raw) != _ID_BYTES:
+        # Not a Comment.id; store a digest of it instead
+        raw = hashlib.blake2b(comment_id.encode('utf-8'), digest_size=_ID_BYTES).digest()
+    return raw
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index mapping comment text to the ids of similar comments.
+
+    With the defaults (64 hash functions in 16 bands of 4), pairs at 0.7
+    Jaccard similarity of their word shingles share a bucket with
+    probability 0.99, and candidates below ``threshold`` are discarded by
+    the signature check. One changed word in a 25-word comment is about 0.75.
+    Texts of fewer than ``min_words`` words are never indexed or collapsed.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        min_words: int = DEFAULT_MIN_WORDS
+    ):
+        """
+        Open an index, loading the sidecar file if it exists.
+
+        Args:
+            path: Sidecar file path (None keeps the index in memory only)
+            threshold: Minimum estimated Jaccard similarity of a near-duplicate
+            num_perm: Signature length, for a new index
+            bands: Number of LSH bands, for a new index (must divide num_perm)
+            min_words: Minimum word count of a text that can match or be matched
+
+        Raises:
+            ValueError: If ``bands`` does not divide ``num_perm``
+        """
+        self.path = path
+        self.threshold = threshold
+        self.min_words = min_words
+        seed = SEED
+
+        header = self._read_header()
+        if header is not None:
+            # The stored signatures fix the parameters
+            num_perm, bands, seed = header
+        if num_perm % bands:
+            raise ValueError(f"{bands} bands do not divide {num_perm} hash functions")
+
+        self.hasher = MinHasher(num_perm, seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._record = struct.Struct(f'<{_ID_BYTES}s{num_perm}I')
+
+        self.ids: List[str] = []
+        self.signatures = array('I')
+        self._positions: Dict[str, int] = {}
+        self._buckets: List[Dict[int, Union[int, List[int]]]] = [{} for _ in range(bands)]
+        self._saved = 0
+
+        if header is not None:
+            self._load()
+
+    def _read_header(self):
+        if not self.path or not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            data = f.read(LSH_HEADER.size)
+        if len(data) != LSH_HEADER.size:
+            return None
+        magic, num_perm, bands, seed = LSH_HEADER.unpack(data)
+        if magic != LSH_MAGIC:
+            logger.warning(f"{self.path} is not a near-duplicate index, starting a new one")
+            return None
+        return num_perm, bands, seed
+
+    def _load(self):
+        """Read every complete record from the sidecar file."""
+        size = self._record.size
+        with open(self.path, 'rb') as f:
+            f.seek(LSH_HEADER.size)
+            data = f.read()
+        count = len(data) // size
+        if len(data) % size:
+            logger.warning(f"Ignoring a partial record at the end of {self.path}")
+
+        for raw_id, *signature in self._record.iter_unpack(data[:count * size]):
+            self._insert(raw_id.hex(), signature)
+        self._saved = len(self.ids)
+        logger.debug(f"Loaded {self._saved} signatures from {self.path}")
+
+    def _band_keys(self, signature: Sequence[int]) -> List[int]:
+        rows = self.rows
+        return [hash(tuple(signature[i:i + rows])) for i in range(0, self.num_perm, rows)]
+
+    def _insert(self, comment_id: str, signature: Sequence[int]):
+        position = len(self.ids)
+        self.ids.append(comment_id)
+        self.signatures.extend(signature)
+        self._positions[comment_id] = position
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            entry = bucket.get(key)
+            if entry is None:
+                bucket[key] = position  # Most buckets hold one comment
+            elif isinstance(entry, list):
+                entry.append(position)
+            else:
+                bucket[key] = [entry, position]
+
+    def _signature_at(self, position: int) -> array:
+        start = position * self.num_perm
+        return self.signatures[start:start + self.num_perm]
+
+    def signature(self, text: str) -> List[int]:
+        """Compute the MinHash signature of a text."""
+        return self.hasher.signature(text)
+
+    def is_too_short(self, text: str) -> bool:
+        """Whether a text has too few words to take part in matching."""
+        return len(words(text)) < self.min_words
+
+    def query(self, text: Union[str, Sequence[int]]) -> List[str]:
+        """
+        Find indexed comments similar to a text.
+
+        Args:
+            text: Comment text, or its signature
+
+        Returns:
+            Ids of comments at or above the similarity threshold, most
+            similar first (none for a text that is too short)
+        """
+        if isinstance(text, str) and self.is_too_short(text):
+            return []
+        signature = self.signature(text) if isinstance(text, str) else text
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            entry = bucket.get(key)
+            if entry is None:
+                continue
+            if isinstance(entry, list):
+                candidates.update(entry)
+            else:
+                candidates.add(entry)
+
+        scored = []
+        for position in candidates:
+            score = similarity(signature, self._signature_at(position))
+            if score >= self.threshold:
+                scored.append((-score, position))
+        return [self.ids[position] for _, position in sorted(scored)]
+
+    def add(self, comment_id: str, text: Union[str, Sequence[int]]):
+        """
+        Index a comment (a no-op if its id is already indexed or its text
+        is too short).
+
+        Args:
+            comment_id: Comment id
+            text: Comment text, or its signature
+        """
+        if comment_id in self._positions or (isinstance(text, str) and self.is_too_short(text)):
+            return
+        signature = self.signature(text) if isinstance(text, str) else text
+        self._insert(comment_id, signature)
+
+    def collapse(self, comments: Iterable[Comment]) -> List[Comment]:
+        """
+        Drop comments that near-duplicate an indexed or earlier comment.
+
+        Comments whose id is already indexed are kept (an exact re-scrape is
+        left to the store's own deduplication), as are comments too short
+        to compare; the kept new ones are added to the index.
+
+        Args:
+            comments: Comments in arrival order
+
+        Returns:
+            Comments that are not near-duplicates
+        """
+        kept = []
+        collapsed = 0
+        for comment in comments:
+            comment_id = comment.id
+            if comment_id in self._positions or self.is_too_short(comment.comment_text):
+                kept.append(comment)
+                continue
+            signature = self.signature(comment.comment_text)
+            matches = self.query(signature)
+            if matches:
+                collapsed += 1
+                logger.debug(f"Comment {comment_id} ({comment.platform}) near-duplicates {matches[0]}")
+                continue
+            self._insert(comment_id, signature)
+            kept.append(comment)
+        if collapsed:
+            logger.info(f"Collapsed {collapsed} near-duplicate comments")
+        return kept
+
+    def flush(self):
+        """Append the entries added since the last flush to the sidecar file."""
+        if not self.path or self._saved == len(self.ids):
+            return
+        pack = self._record.pack
+        num_perm = self.num_perm
+        records = b''.join(
+            pack(_id_to_bytes(self.ids[i]), *self.signatures[i * num_perm:(i + 1) * num_perm])
+            for i in range(self._saved, len(self.ids))
+        )
+        try:
+            if self._saved and os.path.exists(self.path):
+                with open(self.path, 'r+b') as f:
+                    # Drops a partial record left by an interrupted write
+                    f.truncate(LSH_HEADER.size + self._saved * self._record.size)
+                    f.seek(0, os.SEEK_END)
+                    f.write(records)
+            else:
+                with open(self.path, 'wb') as f:
+                    f.write(LSH_HEADER.pack(LSH_MAGIC, num_perm, self.bands, self.hasher.seed))
+                    f.write(records)
+        except OSError as e:
+            logger.warning(f"Could not write near-duplicate index {self.path}: {e}")
+            return
+        self._saved = len(self.ids)
+
+    def clear(self):
+        """Remove every entry, including from the sidecar file."""
+        self.ids = []
+        self.signatures = array('I')
+        self._positions = {}
+        self._buckets = [{} for _ in range(self.bands)]
+        self._saved = 0
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, comment_id: str) -> bool:
+        return comment_id in self._positions
+
+    def close(self):
+        """Write pending entries."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,232 @@
+"""
+SQLite comment store.
+
+Comments are keyed by ``Comment.id``, so deduplication is an index lookup
+instead of a scan of every stored row. The database runs in WAL mode so
+analysis scripts can read while a scheduler writes.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+import logging
+import sqlite3
+
+from commentradar.models import Comment
+from commentradar.storage.base import CommentStore
+from commentradar.utils.dates import parse_date_bound, parse_date_to_epoch
+
+
+logger = logging.getLogger(__name__)
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# SQLite limits the number of bound parameters per statement
+BATCH_SIZE = 500
+
+COLUMNS = (
+    'source_url', 'platform', 'commenter_name', 'comment_text',
+    'date_posted', 'sentiment', 'likes', 'replies',
+)
+
+SELECTED = ', '.join(('id',) + COLUMNS)
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    source_url TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    commenter_name TEXT,
+    comment_text TEXT NOT NULL,
+    date_posted TEXT,
+    sentiment TEXT,
+    likes INTEGER,
+    replies INTEGER,
+    posted_at INTEGER
+)
+"""
+
+# posted_at is date_posted as epoch seconds, so date ranges are index scans;
+# sentiment is matched case-insensitively, like the other backends
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_comments_platform_posted ON comments (platform, posted_at);
+CREATE INDEX IF NOT EXISTS idx_comments_posted ON comments (posted_at);
+DROP INDEX IF EXISTS idx_comments_sentiment;
+CREATE INDEX IF NOT EXISTS idx_comments_sentiment_lower ON comments (LOWER(sentiment));
+"""
+
+# Re-scraped comments refresh their counters and keep known sentiment
+UPSERT = f"""
+INSERT INTO comments (id, {', '.join(COLUMNS)}, posted_at)
+VALUES ({', '.join('?' * (len(COLUMNS) + 2))})
+ON CONFLICT (id) DO UPDATE SET
+    likes = COALESCE(excluded.likes, comments.likes),
+    replies = COALESCE(excluded.replies, comments.replies),
+    sentiment = COALESCE(excluded.sentiment, comments.sentiment)
+"""
+
+# Column expression grouped by count_by
+COUNTABLE_FIELDS = {
+    'platform': 'platform',
+    'sentiment': 'LOWER(sentiment)',
+    'commenter_name': 'commenter_name',
+}
+
+
+def is_sqlite_path(path: str) -> bool:
+    """Check whether a path names a SQLite database."""
+    return path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+class SQLiteCommentStore(CommentStore):
+    """Comment store backed by a SQLite database file."""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) a SQLite comment store.
+
+        Args:
+            path: Database file path
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(TABLE)
+        self._migrate()
+        self.connection.executescript(INDEXES)
+
+    def _migrate(self):
+        """Add and backfill posted_at in databases created without it."""
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(comments)")}
+        if 'posted_at' in columns:
+            return
+        logger.info(f"Adding posted_at column to {self.path}")
+        with self.connection:
+            self.connection.execute("ALTER TABLE comments ADD COLUMN posted_at INTEGER")
+            self.connection.execute("DROP INDEX IF EXISTS idx_comments_platform_date")
+            rows = self.connection.execute(
+                "SELECT id, platform, date_posted FROM comments WHERE date_posted IS NOT NULL"
+            ).fetchall()
+            self.connection.executemany(
+                "UPDATE comments SET posted_at = ? WHERE id = ?",
+                ((parse_date_to_epoch(date_posted, platform), key) for key, platform, date_posted in rows)
+            )
+
+    def add(self, comments: Iterable[Comment]) -> List[Comment]:
+        """Upsert comments in batches and return the ones that were new."""
+        keyed = {}
+        for comment in comments:
+            keyed.setdefault(comment.id, comment)
+
+        keys = list(keyed)
+        existing = set()
+        for i in range(0, len(keys), BATCH_SIZE):
+            batch = keys[i:i + BATCH_SIZE]
+            rows = self.connection.execute(
+                f"SELECT id FROM comments WHERE id IN ({', '.join('?' * len(batch))})",
+                batch
+            )
+            existing.update(row[0] for row in rows)
+
+        with self.connection:
+            self.connection.executemany(
+                UPSERT,
+                ((key,) + tuple(getattr(comment, column) for column in COLUMNS) + (comment.timestamp,)
+                 for key, comment in keyed.items())
+            )
+
+        new_comments = [comment for key, comment in keyed.items() if key not in existing]
+        logger.debug(f"Stored {len(keyed)} comments in {self.path} ({len(new_comments)} new)")
+        return new_comments
+
+    def __contains__(self, comment: Comment) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM comments WHERE id = ?", (comment.id,)
+        ).fetchone()
+        return row is not None
+
+    def query(
+        self,
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Comment]:
+        """
+        Return stored comments matching the given criteria, in insertion order.
+
+        Date bounds are compared as epoch timestamps; a bare ``YYYY-MM-DD``
+        end date covers that whole day.
+        """
+        clauses = []
+        params = []
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        if start_date:
+            clauses.append("posted_at >= ?")
+            params.append(parse_date_bound(start_date))
+        if end_date:
+            clauses.append("posted_at <= ?")
+            params.append(parse_date_bound(end_date, end=True))
+        if sentiment:
+            clauses.append("LOWER(sentiment) = ?")
+            params.append(sentiment.lower())
+
+        sql = f"SELECT {SELECTED} FROM comments"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [self._to_comment(row) for row in self.connection.execute(sql, params)]
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        """Count stored comments per platform, sentiment or commenter."""
+        if field not in COUNTABLE_FIELDS:
+            raise ValueError(f"Cannot count by field: {field}")
+        column = COUNTABLE_FIELDS[field]
+        rows = self.connection.execute(
+            f"SELECT {column} AS value, COUNT(*) AS n FROM comments WHERE value IS NOT NULL "
+            f"GROUP BY value ORDER BY n DESC"
+        )
+        return {value: count for value, count in rows}
+
+    def top_liked(self, k: int) -> List[Comment]:
+        """Return the ``k`` most liked comments."""
+        rows = self.connection.execute(
+            f"SELECT {SELECTED} FROM comments WHERE likes > 0 ORDER BY likes DESC LIMIT ?", (k,)
+        )
+        return [self._to_comment(row) for row in rows]
+
+    def latest(self, k: int) -> List[Comment]:
+        """Return the ``k`` comments with the latest posting date."""
+        rows = self.connection.execute(
+            f"SELECT {SELECTED} FROM comments WHERE posted_at IS NOT NULL ORDER BY posted_at DESC LIMIT ?", (k,)
+        )
+        return [self._to_comment(row) for row in rows]
+
+    def clear(self):
+        """Remove all stored comments."""
+        with self.connection:
+            self.connection.execute("DELETE FROM comments")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Comment]:
+        for row in self.connection.execute(f"SELECT {SELECTED} FROM comments ORDER BY rowid"):
+            yield self._to_comment(row)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    @staticmethod
+    def _to_comment(row) -> Comment:
+        comment = Comment(*row[1:])
+        comment._id = row[0]
+        return comment
@@ -4,11 +4,12 @@ Utility functions for CommentRadar.
 
 from commentradar.utils.robots import check_robots_txt
 from commentradar.utils.filters import apply_filters
-from commentradar.utils.sentiment import analyze_sentiment
+from commentradar.utils.sentiment import analyze_sentiment, score_batch
 
 __all__ = [
     'check_robots_txt',
     'apply_filters',
     'analyze_sentiment',
+    'score_batch',
 ]
 
@@ -0,0 +1,148 @@
+"""
+Date normalization for comments.
+
+Sources report ``date_posted`` in different shapes: Reddit and Stack
+Exchange give epoch seconds, the JSON APIs give ISO 8601, RSS feeds give
+RFC 2822 and blogs give free text. Everything is parsed once to integer
+epoch seconds (UTC) so dates compare numerically.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+import re
+
+
+EPOCH_RE = re.compile(r'^\d{9,11}(?:\.\d*)?$')
+DATE_ONLY_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Free-text formats seen on blogs, tried in this order after ISO 8601 and
+# RFC 2822 (so an ambiguous 03/04/2024 is always March 4)
+FREE_TEXT_FORMATS = (
+    '%B %d, %Y',
+    '%b %d, %Y',
+    '%B %d, %Y at %I:%M %p',
+    '%B %d, %Y at %H:%M',
+    '%d %B %Y',
+    '%d %b %Y',
+    '%d %B %Y at %H:%M',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y/%m/%d',
+    '%d.%m.%Y',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+)
+
+SECONDS_PER_DAY = 86400
+
+
+def _epoch_from_datetime(parsed: datetime) -> int:
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def parse_epoch(value: str) -> Optional[int]:
+    """Parse epoch seconds such as ``"1704067200.0"``."""
+    if EPOCH_RE.match(value):
+        return int(float(value))
+    return None
+
+
+def parse_iso(value: str) -> Optional[int]:
+    """Parse an ISO 8601 date or datetime, with or without a ``Z`` suffix."""
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    try:
+        return _epoch_from_datetime(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_free_text(value: str) -> Optional[int]:
+    """
+    Parse a free-text date with the known formats.
+
+    Results are cached, since blog pages repeat the same date strings.
+    Formats are tried in a fixed order, so the result does not depend on
+    what was parsed before.
+    """
+    try:
+        return _epoch_from_datetime(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    for fmt in FREE_TEXT_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return _epoch_from_datetime(parsed)
+
+    return None
+
+
+# Fast paths for sources with a known date format
+SOURCE_PARSERS: Dict[str, Callable[[str], Optional[int]]] = {
+    'reddit': parse_epoch,
+    'stackoverflow': parse_epoch,
+    'hackernews': parse_iso,
+    'github': parse_iso,
+    'devto': parse_iso,
+}
+
+
+def parse_date_to_epoch(value: Optional[str], platform: Optional[str] = None) -> Optional[int]:
+    """
+    Normalize a date string to epoch seconds.
+
+    Args:
+        value: Date as epoch seconds, ISO 8601, RFC 2822 or free text
+        platform: Source platform, used to pick a fast parser
+
+    Returns:
+        Epoch seconds (UTC; naive dates are taken as UTC), or None if the
+        date is missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    parser = SOURCE_PARSERS.get(platform)
+    if parser is not None:
+        epoch = parser(value)
+        if epoch is not None:
+            return epoch
+
+    epoch = parse_epoch(value)
+    if epoch is None:
+        epoch = parse_iso(value)
+    if epoch is None:
+        epoch = parse_free_text(value)
+    return epoch
+
+
+def parse_date_bound(value: str, end: bool = False) -> int:
+    """
+    Parse a date filter bound.
+
+    A bare date as an end bound covers that whole day.
+
+    Args:
+        value: Date string
+        end: Whether this is the inclusive upper bound
+
+    Returns:
+        Epoch seconds
+
+    Raises:
+        ValueError: If the date cannot be parsed
+    """
+    epoch = parse_date_to_epoch(value)
+    if epoch is None:
+        raise ValueError(f"Invalid date: {value}")
+    if end and DATE_ONLY_RE.match(value.strip()):
+        epoch += SECONDS_PER_DAY - 1
+    return epoch
@@ -2,56 +2,129 @@
 Filtering utilities for comments.
 """
 
-from typing import List, Optional
-from datetime import datetime
+from typing import Callable, List, Optional, Union
 import logging
 
-from commentradar.models import Comment
+from commentradar.models import Comment, CommentCollection
+from commentradar.utils.dates import parse_date_bound
+from commentradar.utils.query import compile_query
 
 
 logger = logging.getLogger(__name__)
 
 
 def apply_filters(
-    comments: List[Comment],
+    comments: Union[List[Comment], CommentCollection],
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     sentiment: Optional[str] = None,
     min_length: Optional[int] = None,
-    max_length: Optional[int] = None
+    max_length: Optional[int] = None,
+    where: Optional[str] = None
 ) -> List[Comment]:
     """
     Apply various filters to a list of comments.
     
+    All filters are compiled into one predicate and evaluated in a single
+    pass. A CommentCollection with the columnar backend evaluates the
+    fixed filters as one vectorized mask instead; otherwise its date index
+    narrows the date range first.
+    
     Args:
-        comments: List of Comment objects
+        comments: List of Comment objects, or a CommentCollection
         start_date: Filter comments after this date (ISO format)
         end_date: Filter comments before this date (ISO format)
         sentiment: Filter by sentiment (positive, negative, neutral)
         min_length: Minimum comment text length
         max_length: Maximum comment text length
+        where: Query expression (see ``commentradar.utils.query``)
         
     Returns:
         Filtered list of Comment objects
-    """
-    filtered = comments
     
-    # Date filtering
-    if start_date or end_date:
-        filtered = filter_by_date(filtered, start_date, end_date)
+    Raises:
+        ValueError: If a date or the query expression is invalid
+    """
+    total = len(comments)
     
-    # Sentiment filtering
-    if sentiment:
-        filtered = filter_by_sentiment(filtered, sentiment)
+    if isinstance(comments, CommentCollection) and comments.columnar:
+        columns = comments.columns
+        candidates = columns.select(columns.mask(
+            start_date=start_date,
+            end_date=end_date,
+            sentiment=sentiment,
+            min_length=min_length,
+            max_length=max_length
+        ))
+        predicate = compile_filters(where=where)
+    elif isinstance(comments, CommentCollection):
+        candidates = comments.filter_by_date(start_date, end_date)
+        predicate = compile_filters(
+            sentiment=sentiment, min_length=min_length, max_length=max_length, where=where
+        )
+    else:
+        candidates = comments
+        predicate = compile_filters(
+            start_date, end_date, sentiment, min_length, max_length, where
+        )
     
-    # Length filtering
-    if min_length or max_length:
-        filtered = filter_by_length(filtered, min_length, max_length)
+    filtered = candidates if predicate is None else [c for c in candidates if predicate(c)]
     
-    logger.info(f"Filtered {len(comments)} comments down to {len(filtered)}")
+    logger.info(f"Filtered {total} comments down to {len(filtered)}")
     return filtered
 
 
+def compile_filters(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    where: Optional[str] = None
+) -> Optional[Callable[[Comment], bool]]:
+    """
+    Compile filter options into a single predicate.
+    
+    Options left as None are not applied; ``0`` is a real bound.
+    
+    Returns:
+        Predicate over comments, or None if no filter is set
+    """
+    checks = []
+    
+    if start_date is not None or end_date is not None:
+        start = parse_date_bound(start_date) if start_date is not None else None
+        end = parse_date_bound(end_date, end=True) if end_date is not None else None
+        
+        def in_date_range(comment: Comment) -> bool:
+            timestamp = comment.timestamp
+            return (
+                timestamp is not None
+                and (start is None or timestamp >= start)
+                and (end is None or timestamp <= end)
+            )
+        
+        checks.append(in_date_range)
+    
+    if sentiment is not None:
+        wanted = sentiment.lower()
+        checks.append(lambda c: c.sentiment is not None and c.sentiment.lower() == wanted)
+    
+    if min_length is not None:
+        checks.append(lambda c: len(c.comment_text) >= min_length)
+    if max_length is not None:
+        checks.append(lambda c: len(c.comment_text) <= max_length)
+    
+    if where:
+        checks.append(compile_query(where))
+    
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda c: all(check(c) for check in checks)
+
+
 def filter_by_date(
     comments: List[Comment],
     start_date: Optional[str] = None,
@@ -60,31 +133,31 @@ def filter_by_date(
     """
     Filter comments by date range.
     
+    Dates are compared as epoch timestamps, so epoch, ISO 8601 and
+    free-text dates from different sources compare correctly.
+    
     Args:
         comments: List of Comment objects
         start_date: Start date (ISO format)
-        end_date: End date (ISO format)
+        end_date: End date (ISO format, a bare date covers the whole day)
         
     Returns:
         Filtered list of Comment objects
     """
+    start = parse_date_bound(start_date) if start_date else None
+    end = parse_date_bound(end_date, end=True) if end_date else None
+    
     filtered = []
     
     for comment in comments:
-        if not comment.date_posted:
+        timestamp = comment.timestamp
+        if timestamp is None:
             continue
-        
-        try:
-            # Simple string comparison for ISO dates
-            if start_date and comment.date_posted < start_date:
-                continue
-            if end_date and comment.date_posted > end_date:
-                continue
-            
-            filtered.append(comment)
-        except Exception as e:
-            logger.debug(f"Error filtering date for comment: {e}")
+        if start is not None and timestamp < start:
+            continue
+        if end is not None and timestamp > end:
             continue
+        filtered.append(comment)
     
     return filtered
 
@@ -125,9 +198,9 @@ def filter_by_length(
     for comment in comments:
         text_length = len(comment.comment_text)
         
-        if min_length and text_length < min_length:
+        if min_length is not None and text_length < min_length:
             continue
-        if max_length and text_length > max_length:
+        if max_length is not None and text_length > max_length:
             continue
         
         filtered.append(comment)
@@ -0,0 +1,107 @@
+"""
+MinHash signatures for near-duplicate detection.
+
+Text is normalized and split into overlapping word shingles; a signature
+keeps, for each of ``num_perm`` hash functions, the minimum hash over the
+shingles. The fraction of equal positions between two signatures
+estimates the Jaccard similarity of their shingle sets.
+
+Hash functions are multiply-shift hashes ``((a * x + b) mod 2**64) >> 32``
+with fixed seeds, so signatures are stable across runs and can be stored.
+NumPy is used when installed (``pip install commentradar[fast]``); the
+pure Python path gives identical signatures.
+"""
+
+from typing import List, Sequence, Set
+import random
+import re
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+DEFAULT_NUM_PERM = 64
+SHINGLE_SIZE = 3
+SEED = 0x5EED
+
+_MASK64 = (1 << 64) - 1
+_WORD_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def words(text: str) -> List[str]:
+    """Split a text into casefolded words, ignoring punctuation."""
+    return _WORD_RE.findall(text.casefold())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Hash the word shingles of a text.
+
+    Case, punctuation and whitespace are ignored. Texts shorter than
+    ``size`` words form a single shingle.
+
+    Args:
+        text: Text to shingle
+        size: Words per shingle
+
+    Returns:
+        Set of 32-bit shingle hashes
+    """
+    tokens = words(text)
+    if len(tokens) <= size:
+        return {zlib.crc32(' '.join(tokens).encode('utf-8'))} if tokens else set()
+    return {
+        zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+class MinHasher:
+    """Compute MinHash signatures with a fixed family of hash functions."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = SEED):
+        """
+        Initialize the hash family.
+
+        Args:
+            num_perm: Number of hash functions (signature length)
+            seed: Seed for the hash parameters
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        self.a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self.b = [rng.getrandbits(64) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, text: str) -> List[int]:
+        """
+        Compute the signature of a text.
+
+        Returns:
+            ``num_perm`` 32-bit values; all ``0xFFFFFFFF`` for a text
+            without words
+        """
+        hashes = shingles(text)
+        if not hashes:
+            return [0xFFFFFFFF] * self.num_perm
+
+        if np is not None:
+            xs = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[None, :]
+            # uint64 arithmetic wraps, which is the mod 2**64 of the hash
+            return ((self._a * xs + self._b) >> np.uint64(32)).min(axis=1).tolist()
+
+        return [
+            min(((a * x + b) & _MASK64) >> 32 for x in hashes)
+            for a, b in zip(self.a, self.b)
+        ]
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(first, second)) / len(first)
@@ -0,0 +1,282 @@
+"""
+Query language for filtering comments.
+
+Expressions compare comment fields and combine with ``and``, ``or``,
+``not`` and parentheses::
+
+    platform = reddit and likes >= 10
+    (sentiment = negative or text ~ /refund|cancel/i) and date >= 2024-01-01
+    platform in (github, hackernews) and not text contains "hiring"
+
+Fields: ``platform``, ``author``, ``sentiment``, ``text``, ``url``
+(strings, compared case-insensitively), ``likes``, ``replies``,
+``length`` (numbers; missing counts are 0) and ``date`` (compared as a
+timestamp; a bare ``YYYY-MM-DD`` stands for that whole day, and comments
+without a date never match).
+
+Operators: ``=`` (or ``==``), ``!=``, ``<``, ``<=``, ``>``, ``>=``,
+``in (a, b, ...)``, ``contains`` (substring) and ``~`` / ``!~`` (regular
+expression search, written ``/pattern/flags`` with flags ``i``, ``m``, ``s``).
+
+An expression compiles once to a plain predicate function, so filtering
+is a single pass over the comments.
+"""
+
+from typing import Callable, List, Optional, Tuple
+import operator
+import re
+
+from commentradar.models import Comment
+from commentradar.utils.dates import DATE_ONLY_RE, SECONDS_PER_DAY, parse_date_to_epoch
+
+
+Predicate = Callable[[Comment], bool]
+
+
+class QueryError(ValueError):
+    """Raised for a malformed query expression."""
+
+
+TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<regex>/(?:\\.|[^/\\])*/[a-z]*)
+      | (?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+      | (?P<op><=|>=|!=|==|!~|=|<|>|~)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s()<>=!~,"']+)
+    )''', re.VERBOSE)
+
+KEYWORDS = ('and', 'or', 'not', 'in', 'contains')
+
+STRING_FIELDS = {
+    'platform': lambda c: c.platform,
+    'author': lambda c: c.commenter_name,
+    'sentiment': lambda c: c.sentiment,
+    'text': lambda c: c.comment_text,
+    'url': lambda c: c.source_url,
+}
+
+NUMBER_FIELDS = {
+    'likes': lambda c: c.likes or 0,
+    'replies': lambda c: c.replies or 0,
+    'length': lambda c: len(c.comment_text),
+}
+
+COMPARISONS = {
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL}
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """Split an expression into ``(kind, text)`` tokens."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN_RE.match(expression, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected character at position {position}: {expression[position:]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'word' and text.lower() in KEYWORDS:
+            kind, text = 'keyword', text.lower()
+        elif kind == 'string':
+            text = re.sub(r'\\(.)', r'\1', text[1:-1])
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser that builds predicates directly."""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def peek(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def take(self, kind: Optional[str] = None, text: Optional[str] = None) -> str:
+        token_kind, token_text = self.peek()
+        if token_kind is None:
+            raise QueryError("Unexpected end of expression")
+        if (kind and token_kind != kind) or (text and token_text != text):
+            raise QueryError(f"Expected {text or kind}, found {token_text!r}")
+        self.position += 1
+        return token_text
+
+    def accept(self, kind: str, text: str) -> bool:
+        if self.peek() == (kind, text):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> Predicate:
+        predicate = self.parse_or()
+        if self.position != len(self.tokens):
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return predicate
+
+    def parse_or(self) -> Predicate:
+        operands = [self.parse_and()]
+        while self.accept('keyword', 'or'):
+            operands.append(self.parse_and())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda c: any(p(c) for p in operands)
+
+    def parse_and(self) -> Predicate:
+        operands = [self.parse_not()]
+        while self.accept('keyword', 'and'):
+            operands.append(self.parse_not())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda c: all(p(c) for p in operands)
+
+    def parse_not(self) -> Predicate:
+        if self.accept('keyword', 'not'):
+            operand = self.parse_not()
+            return lambda c: not operand(c)
+        if self.accept('punct', '('):
+            predicate = self.parse_or()
+            self.take('punct', ')')
+            return predicate
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Predicate:
+        field = self.take('word').lower()
+        kind, op = self.peek()
+
+        if (kind, op) == ('keyword', 'in'):
+            self.position += 1
+            return self.field_in(field, self.parse_list())
+        if (kind, op) == ('keyword', 'contains'):
+            self.position += 1
+            return self.field_contains(field, self.parse_value())
+        if kind != 'op':
+            raise QueryError(f"Expected an operator after {field!r}")
+        self.position += 1
+
+        if op in ('~', '!~'):
+            pattern = self.take('regex')
+            predicate = self.field_matches(field, pattern)
+            return predicate if op == '~' else (lambda c: not predicate(c))
+        return self.field_compare(field, op, self.parse_value())
+
+    def parse_value(self) -> str:
+        kind, text = self.peek()
+        if kind not in ('word', 'string'):
+            raise QueryError(f"Expected a value, found {text!r}")
+        self.position += 1
+        return text
+
+    def parse_list(self) -> List[str]:
+        self.take('punct', '(')
+        values = [self.parse_value()]
+        while self.accept('punct', ','):
+            values.append(self.parse_value())
+        self.take('punct', ')')
+        return values
+
+    def field_compare(self, field: str, op: str, value: str) -> Predicate:
+        compare = COMPARISONS[op]
+
+        if field in STRING_FIELDS:
+            get = STRING_FIELDS[field]
+            value = value.lower()
+            return lambda c: compare((get(c) or '').lower(), value)
+
+        if field in NUMBER_FIELDS:
+            get = NUMBER_FIELDS[field]
+            try:
+                number = float(value)
+            except ValueError:
+                raise QueryError(f"{field} needs a number, got {value!r}")
+            return lambda c: compare(get(c), number)
+
+        if field == 'date':
+            return _date_comparison(op, value)
+
+        raise QueryError(f"Unknown field: {field}")
+
+    def field_in(self, field: str, values: List[str]) -> Predicate:
+        if field not in STRING_FIELDS:
+            raise QueryError(f"'in' needs a text field, got {field!r}")
+        get = STRING_FIELDS[field]
+        choices = frozenset(value.lower() for value in values)
+        return lambda c: (get(c) or '').lower() in choices
+
+    def field_contains(self, field: str, value: str) -> Predicate:
+        if field not in STRING_FIELDS:
+            raise QueryError(f"'contains' needs a text field, got {field!r}")
+        get = STRING_FIELDS[field]
+        value = value.lower()
+        return lambda c: value in (get(c) or '').lower()
+
+    def field_matches(self, field: str, literal: str) -> Predicate:
+        if field not in STRING_FIELDS:
+            raise QueryError(f"'~' needs a text field, got {field!r}")
+        body, _, flag_letters = literal[1:].rpartition('/')
+        flags = 0
+        for letter in flag_letters:
+            if letter not in REGEX_FLAGS:
+                raise QueryError(f"Unknown regex flag: {letter}")
+            flags |= REGEX_FLAGS[letter]
+        try:
+            search = re.compile(body.replace('\\/', '/'), flags).search
+        except re.error as e:
+            raise QueryError(f"Invalid regex {literal}: {e}")
+        get = STRING_FIELDS[field]
+        return lambda c: search(get(c) or '') is not None
+
+
+def _date_comparison(op: str, value: str) -> Predicate:
+    """Compare timestamps, treating a bare date as the whole day."""
+    start = parse_date_to_epoch(value)
+    if start is None:
+        raise QueryError(f"Invalid date: {value}")
+    end = start + SECONDS_PER_DAY - 1 if DATE_ONLY_RE.match(value.strip()) else start
+
+    bounds = {
+        '=': lambda ts: start <= ts <= end,
+        '==': lambda ts: start <= ts <= end,
+        '!=': lambda ts: not start <= ts <= end,
+        '<': lambda ts: ts < start,
+        '<=': lambda ts: ts <= end,
+        '>': lambda ts: ts > end,
+        '>=': lambda ts: ts >= start,
+    }
+    check = bounds[op]
+
+    def predicate(comment: Comment) -> bool:
+        timestamp = comment.timestamp
+        return timestamp is not None and check(timestamp)
+
+    return predicate
+
+
+def compile_query(expression: str) -> Predicate:
+    """
+    Compile a query expression to a predicate.
+
+    Args:
+        expression: Query, e.g. ``"platform = reddit and likes > 5"``
+
+    Returns:
+        Function returning True for matching comments
+
+    Raises:
+        QueryError: If the expression is malformed
+    """
+    return _Parser(expression).parse()
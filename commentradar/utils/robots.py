@@ -1,15 +1,47 @@
 """
 Utilities for checking robots.txt compliance.
+
+Each robots.txt is fetched and parsed once per host per hour and shared by
+every scraper in the process, including concurrent ones.
 """
 
 import urllib.robotparser
 from urllib.parse import urlparse
 import logging
 
+from commentradar.utils.singleflight import SingleFlight
+
 
 logger = logging.getLogger(__name__)
 
 
+ROBOTS_TTL = 3600.0
+
+_robots = SingleFlight(ttl=ROBOTS_TTL)
+
+
+def _read_robots(robots_url: str) -> urllib.robotparser.RobotFileParser:
+    rp = urllib.robotparser.RobotFileParser()
+    rp.set_url(robots_url)
+    rp.read()
+    return rp
+
+
+def get_robots_parser(url: str) -> urllib.robotparser.RobotFileParser:
+    """
+    Get the parsed robots.txt of a URL's host.
+    
+    Args:
+        url: Any URL on the host
+        
+    Returns:
+        Parsed robots.txt (shared; do not modify)
+    """
+    parsed_url = urlparse(url)
+    robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
+    return _robots.do(robots_url, lambda: _read_robots(robots_url))
+
+
 def check_robots_txt(url: str, user_agent: str = "*") -> bool:
     """
     Check if a URL can be scraped according to robots.txt.
@@ -22,12 +54,7 @@ def check_robots_txt(url: str, user_agent: str = "*") -> bool:
         True if scraping is allowed, False otherwise
     """
     try:
-        parsed_url = urlparse(url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        
-        rp = urllib.robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
+        rp = get_robots_parser(url)
         
         can_fetch = rp.can_fetch(user_agent, url)
         
@@ -53,12 +80,7 @@ def get_crawl_delay(url: str, user_agent: str = "*") -> float:
         Crawl delay in seconds (default: 1.0)
     """
     try:
-        parsed_url = urlparse(url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        
-        rp = urllib.robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
+        rp = get_robots_parser(url)
         
         delay = rp.crawl_delay(user_agent)
         return float(delay) if delay else 1.0
@@ -1,21 +1,448 @@
 """
 Sentiment analysis utilities.
+
+Texts are scored against a compiled lexicon: the text is tokenized once
+and each token (or run of tokens, for multi-word terms) is a dictionary
+lookup, so scoring costs one pass over the text whatever the lexicon
+size. Terms match whole words only, and a negation within the three
+preceding tokens of the same clause flips a term's weight.
+
+Other scorers plug in through a backend registry (``register_backend``).
+Backends are created on first use, once per process, so importing this
+module never loads a model; long-running processes can call ``warm_up``
+to pay that cost up front. ``score_batch`` scores many texts at once and
+spreads large batches over a process pool.
 """
 
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import hashlib
 import logging
-from typing import List
+import math
+import os
+import re
+import threading
 
 from commentradar.models import Comment
+from commentradar.utils.sentiment_cache import SentimentCache
 
 
 logger = logging.getLogger(__name__)
 
 
+# Punctuation that ends a clause, and with it the scope of a negation
+CLAUSE_BREAKS = '.,;:!?'
+
+# Words, keeping contractions whole, and runs of clause punctuation
+TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*|[.,;:!?]+")
+
+NEGATIONS = frozenset({
+    'not', 'no', 'never', 'nothing', 'nobody', 'none', 'neither', 'nor',
+    'cannot', 'without', 'hardly', 'barely',
+})
+
+# Tokens before a term that can negate it
+NEGATION_WINDOW = 3
+
+POSITIVE_WORDS = ('good', 'great', 'excellent', 'amazing', 'wonderful', 'love', 'best', 'awesome')
+NEGATIVE_WORDS = ('bad', 'terrible', 'awful', 'hate', 'worst', 'horrible', 'poor', 'disappointing')
+
+DEFAULT_TERMS: Dict[str, float] = {
+    **{word: 1.0 for word in POSITIVE_WORDS},
+    **{word: -1.0 for word in NEGATIVE_WORDS},
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens, keeping contractions whole.
+
+    Each run of clause punctuation (``CLAUSE_BREAKS``) becomes one token
+    of its own, so terms and negations do not reach across it.
+    """
+    return TOKEN_RE.findall(text.lower().replace('’', "'"))
+
+
+def _is_negation(token: str) -> bool:
+    return token in NEGATIONS or token.endswith("n't")
+
+
+class Lexicon:
+    """Sentiment lexicon compiled for single-pass scoring."""
+
+    def __init__(self, terms: Mapping[str, float]):
+        """
+        Compile a lexicon.
+
+        Args:
+            terms: Term weights, positive or negative; a term may span
+                several words (``"waste of money"``)
+        """
+        self.words: Dict[str, float] = {}
+        self.phrases: Dict[Tuple[str, ...], float] = {}
+        for term, weight in terms.items():
+            tokens = tuple(tokenize(term))
+            if len(tokens) == 1:
+                self.words[tokens[0]] = weight
+            elif tokens:
+                self.phrases[tokens] = weight
+        self.phrase_starts = frozenset(phrase[0] for phrase in self.phrases)
+        self.max_phrase = max((len(phrase) for phrase in self.phrases), default=1)
+
+    def __len__(self) -> int:
+        return len(self.words) + len(self.phrases)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the terms, weights and negation rules; changes with any of them."""
+        content = repr((
+            sorted(self.words.items()),
+            sorted(self.phrases.items()),
+            sorted(NEGATIONS),
+            NEGATION_WINDOW,
+            CLAUSE_BREAKS,
+        ))
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+    def score(self, text: str) -> float:
+        """
+        Sum the weights of the lexicon terms in a text.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            Positive for positive text, negative for negative text, 0 if
+            no term matches or they cancel out
+        """
+        tokens = tokenize(text)
+        words = self.words
+        phrases = self.phrases
+        phrase_starts = self.phrase_starts
+        score = 0.0
+        last_negation = -NEGATION_WINDOW - 1
+
+        i = 0
+        count = len(tokens)
+        while i < count:
+            token = tokens[i]
+            weight = None
+            length = 1
+            if token in phrase_starts:
+                for n in range(min(self.max_phrase, count - i), 1, -1):
+                    weight = phrases.get(tuple(tokens[i:i + n]))
+                    if weight is not None:
+                        length = n
+                        break
+            if weight is None:
+                weight = words.get(token)
+
+            if weight is not None:
+                score += -weight if i - last_negation <= NEGATION_WINDOW else weight
+            elif _is_negation(token):
+                last_negation = i
+            elif token[0] in CLAUSE_BREAKS:
+                last_negation = -NEGATION_WINDOW - 1
+            i += length
+
+        return score
+
+
+DEFAULT_LEXICON = Lexicon(DEFAULT_TERMS)
+
+
+def sentiment_score(text: str, lexicon: Lexicon = DEFAULT_LEXICON) -> float:
+    """
+    Score the sentiment of a text.
+
+    Args:
+        text: The text to score
+        lexicon: Lexicon to score against
+
+    Returns:
+        Sum of matched term weights (negated terms count against their sign)
+    """
+    return lexicon.score(text)
+
+
+# Batches from this size are scored with NumPy (sentiment_vectorized)
+VECTORIZE_THRESHOLD = 256
+
+
+class SentimentBackend:
+    """
+    Base class for sentiment scorers.
+
+    Subclasses implement ``score``; scores above ``neutral_band`` are
+    positive and scores below ``-neutral_band`` negative.
+    """
+
+    name = ''
+    neutral_band = 0.0
+
+    @property
+    def version(self) -> str:
+        """Identifies the scoring logic, for caching; override when it can change."""
+        return self.name
+
+    def score(self, text: str) -> float:
+        """Score one text."""
+        raise NotImplementedError
+
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        """Score several texts (override when the scorer has a batch API)."""
+        score = self.score
+        return [score(text) for text in texts]
+
+    def warm_up(self):
+        """Prepare anything built lazily on first scoring (nothing by default)."""
+
+    def label(self, score: float) -> str:
+        """Map a score to 'positive', 'negative' or 'neutral'."""
+        if score > self.neutral_band:
+            return 'positive'
+        elif score < -self.neutral_band:
+            return 'negative'
+        return 'neutral'
+
+
+class KeywordBackend(SentimentBackend):
+    """Compiled lexicon scorer (the default)."""
+
+    name = 'keyword'
+
+    def __init__(self, lexicon: Lexicon = DEFAULT_LEXICON):
+        self.lexicon = lexicon
+        self._vectorized = None
+
+    @property
+    def version(self) -> str:
+        return f"keyword-{self.lexicon.fingerprint}"
+
+    def score(self, text: str) -> float:
+        return self.lexicon.score(text)
+
+    def warm_up(self):
+        """Build the NumPy batch scorer (and import numpy) if available."""
+        if self._vectorized is None:
+            from commentradar.utils.sentiment_vectorized import VectorizedLexiconScorer
+            try:
+                self._vectorized = VectorizedLexiconScorer(self.lexicon)
+            except ImportError:
+                self._vectorized = False
+
+    def score_many(self, texts: Sequence[str]) -> List[float]:
+        """Score texts, with the NumPy scorer for large batches when available."""
+        if len(texts) >= VECTORIZE_THRESHOLD:
+            self.warm_up()
+            if self._vectorized:
+                return self._vectorized.score(texts).tolist()
+        return super().score_many(texts)
+
+
+def _distribution_version(name: str) -> str:
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return 'unknown'
+
+
+class VaderBackend(SentimentBackend):
+    """VADER compound score (``pip install commentradar[sentiment]``)."""
+
+    name = 'vader'
+    neutral_band = 0.05  # VADER's recommended neutral range
+
+    def __init__(self):
+        try:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        except ImportError:
+            raise ImportError("The vader backend needs vaderSentiment: pip install commentradar[sentiment]")
+        self.analyzer = SentimentIntensityAnalyzer()
+
+    @property
+    def version(self) -> str:
+        return f"vader-{_distribution_version('vaderSentiment')}"
+
+    def score(self, text: str) -> float:
+        return self.analyzer.polarity_scores(text)['compound']
+
+
+class TextBlobBackend(SentimentBackend):
+    """TextBlob polarity (``pip install commentradar[sentiment]``)."""
+
+    name = 'textblob'
+
+    def __init__(self):
+        try:
+            from textblob import TextBlob
+        except ImportError:
+            raise ImportError("The textblob backend needs textblob: pip install commentradar[sentiment]")
+        self.blob = TextBlob
+
+    @property
+    def version(self) -> str:
+        return f"textblob-{_distribution_version('textblob')}"
+
+    def score(self, text: str) -> float:
+        return self.blob(text).sentiment.polarity
+
+
+BACKENDS: Dict[str, Callable[[], SentimentBackend]] = {
+    'keyword': KeywordBackend,
+    'vader': VaderBackend,
+    'textblob': TextBlobBackend,
+}
+
+DEFAULT_BACKEND = 'keyword'
+
+# Below this many texts a process pool costs more than it saves
+PARALLEL_THRESHOLD = 5000
+
+# Chunks per worker, so uneven chunks still balance
+CHUNKS_PER_WORKER = 4
+
+_instances: Dict[str, SentimentBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], SentimentBackend]):
+    """
+    Register a sentiment backend.
+
+    The factory is only called when the backend is first used, so it is
+    the place to import and load heavy libraries. Backends used with a
+    process pool must be registered at import time of a module the workers
+    import, since workers look them up by name.
+
+    Args:
+        name: Backend name
+        factory: Callable returning a SentimentBackend
+    """
+    with _instances_lock:
+        BACKENDS[name] = factory
+        _instances.pop(name, None)
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends (none of them is loaded)."""
+    return list(BACKENDS)
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> SentimentBackend:
+    """
+    Get a backend instance, created on first use.
+
+    Creation is serialized, so concurrent first calls load a backend once.
+
+    Raises:
+        ValueError: If no backend has that name
+        ImportError: If the backend's library is not installed
+    """
+    backend = _instances.get(name)
+    if backend is not None:
+        return backend
+    with _instances_lock:
+        backend = _instances.get(name)
+        if backend is None:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown sentiment backend: {name} (choose from {', '.join(BACKENDS)})")
+            logger.debug(f"Loading sentiment backend {name}")
+            backend = _instances[name] = BACKENDS[name]()
+    return backend
+
+
+def warm_up(name: str = DEFAULT_BACKEND) -> SentimentBackend:
+    """
+    Load a backend now instead of on the first comment.
+
+    Meant for long-running processes (schedulers), so the first scrape
+    does not pay for model loading.
+
+    Args:
+        name: Backend name
+
+    Returns:
+        The loaded backend
+    """
+    backend = get_backend(name)
+    backend.warm_up()
+    return backend
+
+
+def _score_chunk(name: str, texts: List[str]) -> List[float]:
+    """Process pool worker: score a chunk with the named backend."""
+    return get_backend(name).score_many(texts)
+
+
+def score_batch(
+    texts: Sequence[str],
+    backend: str = DEFAULT_BACKEND,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    cache: Optional[SentimentCache] = None
+) -> Tuple[List[str], List[float]]:
+    """
+    Score many texts, in parallel processes for large batches.
+
+    Args:
+        texts: Texts to score
+        backend: Registered backend name
+        workers: Worker processes; None uses every core for batches of at
+            least PARALLEL_THRESHOLD texts, 1 scores in this process
+        chunk_size: Texts per task (default: spread evenly over the workers)
+        cache: Score cache; only texts it does not know are scored
+
+    Returns:
+        Labels and scores, in the order of ``texts``
+    """
+    texts = list(texts)
+    scorer = get_backend(backend)
+
+    if cache is not None:
+        version = scorer.version
+        scores = cache.get_many(backend, version, texts)
+        # Each distinct unknown text is scored once
+        missing = list(dict.fromkeys(text for text, score in zip(texts, scores) if score is None))
+        if missing:
+            _, new_scores = score_batch(missing, backend, workers, chunk_size)
+            cache.put_many(backend, version, missing, new_scores)
+            known = dict(zip(missing, new_scores))
+            scores = [known[text] if score is None else score for text, score in zip(texts, scores)]
+        logger.debug(f"Sentiment cache: {len(texts) - len(missing)} of {len(texts)} texts known")
+        return [scorer.label(score) for score in scores], scores
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(texts) >= PARALLEL_THRESHOLD else 1
+    workers = min(workers, len(texts))
+
+    scores = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        chunk_size = chunk_size or math.ceil(len(texts) / (workers * CHUNKS_PER_WORKER))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                scores = [
+                    score
+                    for chunk_scores in executor.map(_score_chunk, [backend] * len(chunks), chunks)
+                    for score in chunk_scores
+                ]
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Process pool unavailable, scoring in one process: {e}")
+    if scores is None:
+        scores = scorer.score_many(texts)
+
+    return [scorer.label(score) for score in scores], scores
+
+
 def analyze_sentiment(text: str) -> str:
     """
     Analyze the sentiment of a text.
     
-    This is a placeholder implementation. In production, this would use:
+    This is a lexicon-based implementation. In production, this would use:
     - TextBlob
     - VADER sentiment analyzer
     - Transformers (BERT-based models)
@@ -27,36 +454,40 @@ def analyze_sentiment(text: str) -> str:
     Returns:
         Sentiment label: 'positive', 'negative', or 'neutral'
     """
-    # Simple keyword-based sentiment (placeholder)
-    positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'love', 'best', 'awesome']
-    negative_words = ['bad', 'terrible', 'awful', 'hate', 'worst', 'horrible', 'poor', 'disappointing']
-    
-    text_lower = text.lower()
-    
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
-    
-    if positive_count > negative_count:
+    score = sentiment_score(text)
+    if score > 0:
         return 'positive'
-    elif negative_count > positive_count:
+    elif score < 0:
         return 'negative'
     else:
         return 'neutral'
 
 
-def add_sentiment_to_comments(comments: List[Comment]) -> List[Comment]:
+def add_sentiment_to_comments(
+    comments: List[Comment],
+    backend: str = DEFAULT_BACKEND,
+    workers: Optional[int] = None,
+    cache: Optional[SentimentCache] = None
+) -> List[Comment]:
     """
     Add sentiment analysis to a list of comments.
     
     Args:
         comments: List of Comment objects
+        backend: Registered backend name
+        workers: Worker processes (see ``score_batch``)
+        cache: Score cache, so known texts are not scored again
         
     Returns:
         List of Comment objects with sentiment added
     """
-    for comment in comments:
-        if not comment.sentiment:
-            comment.sentiment = analyze_sentiment(comment.comment_text)
+    pending = [comment for comment in comments if not comment.sentiment]
+    if pending:
+        labels, _ = score_batch(
+            [c.comment_text for c in pending], backend=backend, workers=workers, cache=cache
+        )
+        for comment, label in zip(pending, labels):
+            comment.sentiment = label
     
     logger.info(f"Added sentiment analysis to {len(comments)} comments")
     return comments
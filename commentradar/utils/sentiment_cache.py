@@ -0,0 +1,168 @@
+"""
+Content-addressed cache of sentiment scores.
+
+Scores are keyed by a hash of the text and the version of the backend
+that produced them, so a text is scored once per backend version, across
+runs. A backend version changes whenever its lexicon or model does;
+entries of the old version stop matching and are deleted the first time
+the new version is used with the cache.
+
+Lookups go through an in-memory LRU first and a SQLite file second.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import logging
+import sqlite3
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_SUFFIX = '.sentiment'
+DEFAULT_MAXSIZE = 100_000
+
+# SQLite limits the number of bound parameters per statement
+BATCH_SIZE = 500
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS scores (
+    backend TEXT NOT NULL,
+    version TEXT NOT NULL,
+    text_hash BLOB NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (backend, version, text_hash)
+) WITHOUT ROWID
+"""
+
+
+def text_hash(text: str) -> bytes:
+    """16-byte content hash of a text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class SentimentCache:
+    """Two-level (memory, then disk) cache of sentiment scores."""
+
+    def __init__(self, path: Optional[str] = None, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Open a cache.
+
+        Args:
+            path: SQLite file for persistence (None keeps scores in memory only)
+            maxsize: Scores kept in the in-memory LRU
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self._memory: 'OrderedDict[Tuple[str, str, bytes], float]' = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(TABLE)
+            self._conn.commit()
+
+    def _use_version(self, backend: str, version: str):
+        """Forget the entries of other versions of a backend."""
+        if self._versions.get(backend) == version:
+            return
+        self._versions[backend] = version
+        stale = [key for key in self._memory if key[0] == backend and key[1] != version]
+        for key in stale:
+            del self._memory[key]
+        if self._conn is not None:
+            deleted = self._conn.execute(
+                'DELETE FROM scores WHERE backend = ? AND version != ?', (backend, version)
+            ).rowcount
+            self._conn.commit()
+            if deleted:
+                logger.info(f"Dropped {deleted} cached {backend} scores from an older version")
+
+    def _remember(self, key: Tuple[str, str, bytes], score: float):
+        self._memory[key] = score
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get_many(self, backend: str, version: str, texts: Sequence[str]) -> List[Optional[float]]:
+        """
+        Look up cached scores.
+
+        Args:
+            backend: Backend name
+            version: Backend version
+            texts: Texts to look up
+
+        Returns:
+            Score for each text, or None where it is not cached
+        """
+        with self._lock:
+            self._use_version(backend, version)
+            hashes = [text_hash(text) for text in texts]
+            scores: List[Optional[float]] = []
+            missing: Dict[bytes, List[int]] = {}
+            for i, digest in enumerate(hashes):
+                key = (backend, version, digest)
+                score = self._memory.get(key)
+                if score is not None:
+                    self._memory.move_to_end(key)
+                else:
+                    missing.setdefault(digest, []).append(i)
+                scores.append(score)
+
+            if missing and self._conn is not None:
+                digests = list(missing)
+                for start in range(0, len(digests), BATCH_SIZE):
+                    batch = digests[start:start + BATCH_SIZE]
+                    rows = self._conn.execute(
+                        f"SELECT text_hash, score FROM scores WHERE backend = ? AND version = ? "
+                        f"AND text_hash IN ({', '.join('?' * len(batch))})",
+                        [backend, version, *batch]
+                    )
+                    for digest, score in rows:
+                        self._remember((backend, version, digest), score)
+                        for i in missing[digest]:
+                            scores[i] = score
+            return scores
+
+    def put_many(self, backend: str, version: str, texts: Sequence[str], scores: Sequence[float]):
+        """
+        Store scores.
+
+        Args:
+            backend: Backend name
+            version: Backend version
+            texts: Scored texts
+            scores: Their scores
+        """
+        with self._lock:
+            self._use_version(backend, version)
+            rows = []
+            for text, score in zip(texts, scores):
+                digest = text_hash(text)
+                self._remember((backend, version, digest), score)
+                rows.append((backend, version, digest, score))
+            if self._conn is not None and rows:
+                self._conn.executemany('INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)', rows)
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        if self._conn is not None:
+            return self._conn.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+        return len(self._memory)
+
+    def close(self):
+        """Close the database file."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
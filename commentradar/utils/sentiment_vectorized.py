@@ -0,0 +1,271 @@
+"""
+Vectorized lexicon scoring for large batches.
+
+Scoring a whole archive one comment at a time spends its time creating
+token strings and looking them up one by one. Here a batch of texts is
+lowercased into one byte array and tokenized with array operations. Each
+token is keyed by its length and its first and last eight bytes (read as
+integers through an unaligned strided view), giving a sparse
+document-term matrix in coordinate form that is multiplied by the
+lexicon weights with ``np.bincount``. Negation is a shifted-array test
+over the same token stream, cut at clause punctuation by a running count
+of the punctuation bytes.
+
+Tokens follow ``sentiment.tokenize`` exactly and keys are exact for
+words of up to 16 characters (longer matches are verified), so scores
+equal ``Lexicon.score`` and labels match ``analyze_sentiment``. Texts
+with non-ASCII characters, and texts containing a multi-word term, are
+scored by the lexicon itself.
+
+Requires the optional ``numpy`` dependency (``pip install commentradar[fast]``).
+"""
+
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from commentradar.utils.sentiment import CLAUSE_BREAKS, DEFAULT_LEXICON, NEGATION_WINDOW, NEGATIONS, Lexicon
+
+
+# Texts tokenized together; bounds the size of the per-byte arrays
+CHUNK_SIZE = 20_000
+
+_SEPARATOR = 0
+_SPACE = 32
+_APOSTROPHE = 39
+_BREAK = ord('.')
+_NT = int.from_bytes(b"n't", 'little')
+
+
+def _ascii_table() -> bytes:
+    """Translation table: lowercase letters, keep digits, apostrophes and separators, mark clause breaks."""
+    table = bytearray([_SPACE] * 256)
+    for c in b"abcdefghijklmnopqrstuvwxyz0123456789'\x00":
+        table[c] = c
+    for c in b'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        table[c] = c + 32
+    for c in CLAUSE_BREAKS.encode('ascii'):
+        table[c] = _BREAK
+    return bytes(table)
+
+
+_ASCII_TABLE = _ascii_table()
+
+if np is not None:
+    # _PREFIX_MASKS[k] keeps the first k bytes of a little-endian word
+    _PREFIX_MASKS = np.array([(1 << (8 * k)) - 1 for k in range(8)] + [2 ** 64 - 1], dtype=np.uint64)
+    _MIX_FIRST = np.uint64(0x9E3779B97F4A7C15)
+    _MIX_LAST = np.uint64(0xC2B2AE3D27D4EB4F)
+    _LABELS = np.array(['negative', 'neutral', 'positive'], dtype=object)
+
+
+def _word_key(word: bytes) -> Tuple[int, int, int]:
+    """Key of a token: first eight bytes, last eight bytes (if longer), length."""
+    first = int.from_bytes(word[:8].ljust(8, b'\0'), 'little')
+    last = int.from_bytes(word[-8:], 'little') if len(word) > 8 else 0
+    return first, last, len(word)
+
+
+def _tokenize(joined: bytes) -> Tuple['np.ndarray', ...]:
+    """
+    Tokenize lowercased ASCII bytes like ``sentiment.TOKEN_RE``.
+
+    Args:
+        joined: Translated texts, separated by NUL bytes
+
+    Returns:
+        Document row, start, first-eight-bytes key, last-eight-bytes key,
+        length and "ends in n't" flag of each token, and the number of
+        clause-break bytes before each token
+    """
+    n = len(joined)
+    padded = joined + b' ' * 8
+    data = np.frombuffer(padded, dtype=np.uint8)[:n]
+    # windows[i] is the eight bytes starting at i, as a little-endian integer
+    windows = np.ndarray((n + 1,), dtype='<u8', buffer=padded, strides=(1,))
+
+    breaks = data == _BREAK
+    alnum = (data != _SPACE) & (data != _SEPARATOR) & (data != _APOSTROPHE) & ~breaks
+    word = alnum.copy()
+    # An apostrophe belongs to a token only between two letters or digits
+    word[1:-1] |= (data[1:-1] == _APOSTROPHE) & alnum[:-2] & alnum[2:]
+
+    # Token boundaries alternate: start, end, start, end, ...
+    bounded = np.zeros(n + 2, dtype=bool)
+    bounded[1:-1] = word
+    edges = np.flatnonzero(bounded[1:] != bounded[:-1])
+    starts = edges[0::2]
+    ends = edges[1::2]
+
+    separators = np.flatnonzero(data == _SEPARATOR)
+    per_document = np.diff(np.searchsorted(starts, separators), prepend=0, append=len(starts))
+    rows = np.repeat(np.arange(len(per_document)), per_document)
+
+    lengths = ends - starts
+    first = windows[starts] & _PREFIX_MASKS[np.minimum(lengths, 8)]
+    last = np.where(lengths > 8, windows[np.maximum(ends - 8, 0)], np.uint64(0))
+    nt = (lengths >= 3) & ((windows[np.maximum(ends - 3, 0)] & np.uint64(0xFFFFFF)) == _NT)
+    # Tokens i < j are in one clause when clauses[i] == clauses[j]
+    clauses = np.concatenate(([0], np.cumsum(breaks)))[starts]
+    return rows, starts, first, last, lengths, nt, clauses
+
+
+# Flags of the words the scorer looks for
+_TERM = 1
+_NEGATION = 2
+_PHRASE_START = 4
+
+
+class _WordTable:
+    """
+    Hash table of the lexicon terms, negations and phrase starts.
+
+    The table size is chosen so every word has its own slot, so a lookup
+    is one gather plus a key comparison.
+    """
+
+    def __init__(self, lexicon: Lexicon):
+        entries = {}
+        for word, weight in lexicon.words.items():
+            entries[word] = [weight, _TERM]
+        for word in NEGATIONS:
+            entries.setdefault(word, [0.0, 0])[1] |= _NEGATION
+        for word in lexicon.phrase_starts:
+            entries.setdefault(word, [0.0, 0])[1] |= _PHRASE_START
+        # Non-ASCII words cannot occur in ASCII text
+        words = [word for word in entries if word.isascii()]
+        keys = [_word_key(word.encode('ascii')) for word in words]
+        first = np.array([k[0] for k in keys], dtype=np.uint64)
+        last = np.array([k[1] for k in keys], dtype=np.uint64)
+        lengths = np.array([k[2] for k in keys], dtype=np.int64)
+
+        bits = max(len(words), 1).bit_length() + 1
+        while True:
+            slots = self._slots(first, last, lengths, bits)
+            if len(np.unique(slots)) == len(slots):
+                break
+            bits += 1
+        self.bits = bits
+
+        size = 1 << bits
+        self.first = np.zeros(size, dtype=np.uint64)
+        self.last = np.zeros(size, dtype=np.uint64)
+        self.lengths = np.full(size, -1, dtype=np.int64)
+        self.weights = np.zeros(size, dtype=np.float64)
+        self.flags = np.zeros(size, dtype=np.uint8)
+        self.first[slots] = first
+        self.last[slots] = last
+        self.lengths[slots] = lengths
+        self.weights[slots] = [entries[word][0] for word in words]
+        self.flags[slots] = [entries[word][1] for word in words]
+        # Words longer than the key covers need their matches verified
+        self.long_words = {int(slot): word.encode('ascii') for slot, word in zip(slots, words) if len(word) > 16}
+
+    @staticmethod
+    def _slots(first, last, lengths, bits: int) -> 'np.ndarray':
+        mixed = first * _MIX_FIRST + last * _MIX_LAST + lengths.astype(np.uint64)
+        return (mixed * _MIX_FIRST) >> np.uint64(64 - bits)
+
+    def lookup(self, joined: bytes, starts, first, last, lengths) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Return the weight and flags of each token (0 for other words)."""
+        slots = self._slots(first, last, lengths, self.bits)
+        found = (self.first[slots] == first) & (self.last[slots] == last) & (self.lengths[slots] == lengths)
+        if self.long_words:
+            for i in np.flatnonzero(found & (lengths > 16)).tolist():
+                start = int(starts[i])
+                if joined[start:start + int(lengths[i])] != self.long_words[int(slots[i])]:
+                    found[i] = False
+        return np.where(found, self.weights[slots], 0.0), np.where(found, self.flags[slots], 0)
+
+
+class VectorizedLexiconScorer:
+    """Score batches of texts against a lexicon with NumPy."""
+
+    def __init__(self, lexicon: Lexicon = DEFAULT_LEXICON):
+        """
+        Prepare a scorer.
+
+        Args:
+            lexicon: Compiled lexicon
+
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if np is None:
+            raise ImportError("Vectorized sentiment scoring needs numpy: pip install commentradar[fast]")
+        self.lexicon = lexicon
+        self._table = _WordTable(lexicon)
+
+    def document_terms(self, texts: Sequence[str]) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Build the document-term matrix of ASCII texts in coordinate form.
+
+        Args:
+            texts: ASCII texts
+
+        Returns:
+            Row (document) of each token, its term weight, its flags
+            (term, negation, phrase start) and its clause number
+        """
+        joined = '\x00'.join(texts).encode('ascii').translate(_ASCII_TABLE)
+        rows, starts, first, last, lengths, nt, clauses = _tokenize(joined)
+        weights, flags = self._table.lookup(joined, starts, first, last, lengths)
+        flags = flags | np.where(nt, _NEGATION, 0).astype(flags.dtype)
+        return rows, weights, flags, clauses
+
+    def _score_ascii(self, texts: List[str]) -> 'np.ndarray':
+        rows, weights, flags, clauses = self.document_terms(texts)
+        # The term match takes precedence over negation
+        is_negation = (flags & (_NEGATION | _TERM)) == _NEGATION
+
+        negated = np.zeros(len(rows), dtype=bool)
+        for shift in range(1, NEGATION_WINDOW + 1):
+            # Texts are separated by NUL, not a clause break, so rows are compared too
+            negated[shift:] |= (
+                is_negation[:-shift] & (rows[shift:] == rows[:-shift]) & (clauses[shift:] == clauses[:-shift])
+            )
+
+        scores = np.bincount(rows, weights=np.where(negated, -weights, weights), minlength=len(texts))
+
+        if self.lexicon.phrases:
+            for i in np.unique(rows[(flags & _PHRASE_START) != 0]).tolist():
+                scores[i] = self.lexicon.score(texts[i])
+        return scores
+
+    def score(self, texts: Sequence[str]) -> 'np.ndarray':
+        """
+        Score a batch of texts.
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Float array of scores, in the order of ``texts``
+        """
+        texts = list(texts)
+        scores = np.zeros(len(texts), dtype=np.float64)
+        for start in range(0, len(texts), CHUNK_SIZE):
+            chunk = texts[start:start + CHUNK_SIZE]
+            ascii_rows = [i for i, text in enumerate(chunk) if text.isascii() and '\x00' not in text]
+            if len(ascii_rows) == len(chunk):
+                scores[start:start + len(chunk)] = self._score_ascii(chunk)
+                continue
+            if ascii_rows:
+                ascii_scores = self._score_ascii([chunk[i] for i in ascii_rows])
+                scores[start + np.array(ascii_rows)] = ascii_scores
+            for i in set(range(len(chunk))).difference(ascii_rows):
+                scores[start + i] = self.lexicon.score(chunk[i])
+        return scores
+
+    def label(self, texts: Sequence[str]) -> List[str]:
+        """
+        Label a batch of texts like ``analyze_sentiment``.
+
+        Returns:
+            'positive', 'negative' or 'neutral' for each text
+        """
+        signs = np.sign(self.score(texts)).astype(np.int64)
+        return _LABELS[signs + 1].tolist()
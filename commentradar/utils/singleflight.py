@@ -0,0 +1,123 @@
+"""
+Request coalescing for work shared between scrapers.
+
+When several topics run in one process (see ``SchedulerService``), their
+scrapers often ask for the same thing at about the same time: the same
+robots.txt, the same post, the same API search. ``SingleFlight.do`` runs
+one call per key at a time; concurrent callers with the same key wait for
+that call and share its result (or its exception), and successful results
+are kept for ``ttl`` seconds so callers shortly after get them too.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+import threading
+import time
+
+
+T = TypeVar('T')
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAXSIZE = 256
+
+
+class _Call:
+    """An in-flight call and, once it ends, its outcome."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Share in-flight calls and memoize their results briefly."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE,
+                 cacheable: Optional[Callable[[Any], bool]] = None):
+        """
+        Initialize the group.
+
+        Args:
+            ttl: Seconds a successful result is reused (0 only shares
+                in-flight calls)
+            maxsize: Results kept at most, least recently used dropped first
+            cacheable: Decides whether a returned result is reused after
+                its call ends (e.g. only successful HTTP responses); all
+                results are kept by default
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.cacheable = cacheable
+        self.calls = 0
+        self.shared = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._results: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Call ``fn`` unless a call for ``key`` is running or recently finished.
+
+        Args:
+            key: Identity of the work (e.g. the URL)
+            fn: Function doing the work
+
+        Returns:
+            The result of ``fn``, possibly from another caller's call
+
+        Raises:
+            Exception: Whatever ``fn`` raised, in every caller that shared
+                the call (failures are not memoized, nor are results
+                rejected by ``cacheable``)
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._results.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._results[key]
+
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.error is None and self.ttl > 0 and (self.cacheable is None or self.cacheable(call.result)):
+                    self._results[key] = (time.monotonic() + self.ttl, call.result)
+                    if len(self._results) > self.maxsize:
+                        self._results.popitem(last=False)
+            call.done.set()
+        return call.result
+
+    def forget(self, key: Hashable):
+        """Drop the memoized result of a key."""
+        with self._lock:
+            self._results.pop(key, None)
+
+    def clear(self):
+        """Drop every memoized result."""
+        with self._lock:
+            self._results.clear()
@@ -0,0 +1,66 @@
+"""
+Text extraction utilities for parsed HTML elements.
+"""
+
+from typing import Iterable, Optional
+
+from bs4.element import CData, NavigableString, Tag
+
+
+DEFAULT_STRING_TYPES = (NavigableString, CData)
+
+
+def extract_text(
+    element: Tag,
+    exclude: Iterable[str] = (),
+    max_length: Optional[int] = None
+) -> str:
+    """
+    Extract stripped text from an element, skipping excluded tags.
+
+    Equivalent to ``element.get_text(strip=True)`` on a copy of the element
+    with the excluded tags decomposed, truncated to ``max_length``. The
+    original subtree is walked in place and the walk stops as soon as
+    enough text has been collected, so nothing is copied and large
+    subtrees are not visited past the cap.
+
+    Args:
+        element: BeautifulSoup element to extract text from
+        exclude: Tag names whose subtrees are skipped
+        max_length: Maximum length of the returned text
+
+    Returns:
+        Extracted text
+    """
+    excluded = frozenset(exclude)
+    types = element.interesting_string_types or DEFAULT_STRING_TYPES
+
+    parts = []
+    length = 0
+    stack = [iter(element.contents)]
+
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+
+        if isinstance(node, Tag):
+            if node.name not in excluded:
+                stack.append(iter(node.contents))
+            continue
+
+        if type(node) not in types:
+            continue
+
+        stripped = node.strip()
+        if not stripped:
+            continue
+
+        parts.append(stripped)
+        length += len(stripped)
+        if max_length is not None and length >= max_length:
+            break
+
+    text = ''.join(parts)
+    return text if max_length is None else text[:max_length]
@@ -0,0 +1,61 @@
+"""
+Per-host politeness budget for concurrent requests.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import urlparse
+import threading
+import time
+
+
+class HostThrottle:
+    """
+    Limit concurrency and request rate per host.
+
+    Requests to different hosts proceed independently. Requests to the same
+    host are capped at ``max_concurrent`` in flight, and their start times
+    are spaced at least ``min_interval`` seconds apart.
+    """
+
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 1.0):
+        """
+        Initialize the throttle.
+
+        Args:
+            max_concurrent: Maximum in-flight requests per host
+            min_interval: Minimum delay between request starts per host
+        """
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """
+        Wait for a request slot on the URL's host.
+
+        Args:
+            url: The URL about to be requested
+        """
+        host = urlparse(url).netloc.lower()
+
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.Semaphore(self.max_concurrent)
+
+        with semaphore:
+            # Reserve the next start time under the lock, then sleep outside it
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+
+            delay = start - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            yield
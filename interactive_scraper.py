@@ -9,6 +9,7 @@ from datetime import datetime
 from commentradar.scrapers.multi_source_scraper import MultiSourceScraper
 from commentradar.models import CommentCollection
 from commentradar.utils.sentiment import add_sentiment_to_comments
+from commentradar.storage import open_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -95,7 +96,7 @@ def get_user_input():
     output_file = input(f"   Filename (default '{default_filename}'): ").strip()
     if not output_file:
         output_file = default_filename
-    if not output_file.endswith('.json'):
+    if not output_file.endswith(('.json', '.jsonl')):
         output_file += '.json'
     
     # Sentiment analysis
@@ -195,10 +196,10 @@ def run_scheduled_scrape(settings):
     
     import time
     import schedule
-    import json
-    import os
     
     run_count = [0]
+    # Kept open across cycles, so each one only writes its new posts
+    store = open_store(settings['output_file'])
     
     def scrape_job():
         """Single scrape cycle."""
@@ -224,27 +225,12 @@ def run_scheduled_scrape(settings):
             if settings['analyze_sentiment']:
                 add_sentiment_to_comments(comments)
             
-            # Load existing data
-            if os.path.exists(settings['output_file']):
-                with open(settings['output_file'], 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            else:
-                existing_data = []
-            
-            # Remove duplicates
-            existing_urls = {c['source_url'] for c in existing_data}
-            new_comments = [c for c in comments if c.source_url not in existing_urls]
-            
-            # Merge
-            merged_data = existing_data + [c.to_dict() for c in new_comments]
-            
-            # Save
-            with open(settings['output_file'], 'w', encoding='utf-8') as f:
-                json.dump(merged_data, f, ensure_ascii=False, indent=2)
+            # Append only the new posts
+            new_comments = store.add(comments)
             
             # Report
             print(f"✅ Added {len(new_comments)} new posts")
-            print(f"📊 Total in database: {len(merged_data)}")
+            print(f"📊 Total in database: {len(store)}")
             print(f"💾 Saved to: {settings['output_file']}")
             
             if new_comments:
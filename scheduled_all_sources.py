@@ -7,11 +7,12 @@ import time
 import schedule
 from datetime import datetime
 import logging
-import json
 import os
 
 from commentradar.scrapers.multi_source_scraper import MultiSourceScraper
 from commentradar.utils.sentiment import add_sentiment_to_comments
+from commentradar.utils.sentiment_cache import CACHE_SUFFIX, SentimentCache
+from commentradar.storage import open_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +36,22 @@ class AllSourcesScheduler:
         self.output_file = output_file
         self.run_count = 0
         self.scraper = MultiSourceScraper(topic="nutrition SaaS platform software")
+        self._store = None
+        self._sentiment_cache = None
+    
+    @property
+    def store(self):
+        """Store for the output file, opened on first use and kept open, so its id index is loaded once."""
+        if self._store is None:
+            self._store = open_store(self.output_file)
+        return self._store
+    
+    @property
+    def sentiment_cache(self) -> SentimentCache:
+        """Sentiment score cache next to the output file, opened on first use."""
+        if self._sentiment_cache is None:
+            self._sentiment_cache = SentimentCache(self.output_file + CACHE_SUFFIX)
+        return self._sentiment_cache
     
     def scrape_job(self):
         """Execute one scraping cycle."""
@@ -54,31 +71,15 @@ class AllSourcesScheduler:
                 return
             
             # Add sentiment
-            add_sentiment_to_comments(new_comments)
-            
-            # Load existing data
-            if os.path.exists(self.output_file):
-                with open(self.output_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            else:
-                existing_data = []
-            
-            # Remove duplicates
-            existing_urls = {c['source_url'] for c in existing_data}
-            unique_new = [
-                c.to_dict() for c in new_comments 
-                if c.source_url not in existing_urls
-            ]
-            
-            # Merge and save
-            merged_data = existing_data + unique_new
+            add_sentiment_to_comments(new_comments, cache=self.sentiment_cache)
             
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(merged_data, f, ensure_ascii=False, indent=2)
+            # Only the new posts are written
+            unique_new = [c.to_dict() for c in self.store.add(new_comments)]
+            total = len(self.store)
             
             # Report
             print(f"\n✅ Added {len(unique_new)} new posts")
-            print(f"📊 Total in database: {len(merged_data)}")
+            print(f"📊 Total in database: {total}")
             print(f"💾 Saved to: {self.output_file}")
             
             # Platform breakdown
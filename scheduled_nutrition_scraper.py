@@ -10,6 +10,7 @@ import logging
 from scrape_nutrition_targeted import scrape_reddit_posts, scrape_hackernews, scrape_producthunt
 from commentradar.models import CommentCollection
 from commentradar.utils.sentiment import add_sentiment_to_comments
+from commentradar.utils.sentiment_cache import CACHE_SUFFIX, SentimentCache
 import json
 import os
 
@@ -34,6 +35,14 @@ class NutritionSaaSScheduler:
         
         self.output_file = output_file
         self.run_count = 0
+        self._sentiment_cache = None
+    
+    @property
+    def sentiment_cache(self) -> SentimentCache:
+        """Sentiment score cache next to the output file, opened on first use."""
+        if self._sentiment_cache is None:
+            self._sentiment_cache = SentimentCache(self.output_file + CACHE_SUFFIX)
+        return self._sentiment_cache
     
     def scrape_job(self):
         """Execute one scraping cycle."""
@@ -55,7 +64,7 @@ class NutritionSaaSScheduler:
                 return
             
             # Add sentiment
-            add_sentiment_to_comments(new_comments)
+            add_sentiment_to_comments(new_comments, cache=self.sentiment_cache)
             
             # Load existing data
             if os.path.exists(self.output_file):
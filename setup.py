@@ -53,6 +53,10 @@ setup(
             'textblob>=0.17.0',
             'vaderSentiment>=3.3.2',
         ],
+        'fast': [
+            'numpy>=1.21.0',
+            'orjson>=3.9.0',
+        ],
     },
     entry_points={
         'console_scripts': [
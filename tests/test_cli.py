@@ -2,6 +2,8 @@
 Tests for CLI functionality.
 """
 
+import subprocess
+import sys
 import pytest
 from commentradar.cli import create_parser
 
@@ -66,3 +68,35 @@ def test_parser_multiple_platforms():
     assert 'blog' in args.platform
     assert 'google' in args.platform
 
+
+def test_parser_validates_where_expression():
+    """Test that a malformed --where expression is rejected up front."""
+    parser = create_parser()
+
+    args = parser.parse_args(['--topic', 'test', '--where', 'likes >= 10 and text ~ /price/i'])
+    assert args.where == 'likes >= 10 and text ~ /price/i'
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--topic', 'test', '--where', 'likes >= '])
+
+
+def test_parser_sentiment_backend_choice():
+    """Test that --sentiment-backend defaults to the keyword scorer and rejects unknown names."""
+    parser = create_parser()
+
+    assert parser.parse_args(['--topic', 'test']).sentiment_backend == 'keyword'
+    assert parser.parse_args(['--topic', 'test', '--sentiment-backend', 'vader']).sentiment_backend == 'vader'
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--topic', 'test', '--sentiment-backend', 'nope'])
+
+
+def test_cli_import_does_not_load_sentiment_models():
+    """Test that starting the CLI imports no optional sentiment library."""
+    code = (
+        "import sys, commentradar.cli; "
+        "print(sorted(m for m in ('numpy', 'vaderSentiment', 'textblob', 'concurrent.futures.process') "
+        "if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
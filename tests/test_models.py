@@ -2,9 +2,14 @@
 Tests for data models.
 """
 
+import copy
+import dataclasses
 import json
+import pickle
 import pytest
+from commentradar import serialization
 from commentradar.models import Comment, CommentCollection
+from commentradar.utils.filters import apply_filters
 
 
 def test_comment_creation():
@@ -118,3 +123,130 @@ def test_comment_collection_iteration():
     
     assert count == 3
 
+
+def test_comment_is_slotted_and_interns_repeated_values():
+    """Test the compact Comment representation."""
+    a = Comment(''.join(['https://example.com/', 'post']), ''.join(['bl', 'og']), ''.join(['Us', 'er']), "One")
+    b = Comment(''.join(['https://example.com/', 'post']), ''.join(['bl', 'og']), ''.join(['Us', 'er']), "Two")
+
+    assert not hasattr(a, '__dict__')
+    assert a.platform is b.platform
+    assert a.source_url is b.source_url
+    assert a.commenter_name is b.commenter_name
+    assert list(a.to_dict()) == [
+        'source_url', 'platform', 'commenter_name', 'comment_text',
+        'date_posted', 'sentiment', 'likes', 'replies', 'id',
+    ]
+
+
+def test_columnar_collection_matches_list_backend():
+    """Test vectorized filters, counts and top-k against the list backend."""
+    pytest.importorskip('numpy')
+
+    rows = [
+        Comment("u1", "reddit", "A", "Short", date_posted="2024-01-05T10:00:00", sentiment="positive", likes=3),
+        Comment("u2", "github", "B", "A much longer comment", date_posted="2024-02-01", sentiment="negative", likes=9),
+        Comment("u3", "reddit", "C", "Medium text", date_posted=None, sentiment="positive", likes=None),
+        Comment("u4", "reddit", "D", "Another long comment", date_posted="2024-01-20", sentiment="Positive", likes=1),
+    ]
+    plain = CommentCollection()
+    columnar = CommentCollection(columnar=True)
+    plain.extend(rows)
+    columnar.extend(rows)
+
+    assert columnar.filter_by_sentiment("Positive") == plain.filter_by_sentiment("positive") == [rows[0], rows[2], rows[3]]
+    assert columnar.filter_by_date("2024-01-01", "2024-01-31") == [rows[0], rows[3]]
+    assert columnar.count_by('platform') == plain.count_by('platform') == {'reddit': 3, 'github': 1}
+    assert columnar.top_k(2) == plain.top_k(2) == [rows[1], rows[0]]
+    assert apply_filters(columnar, sentiment="positive", min_length=10) == \
+        apply_filters(plain, sentiment="positive", min_length=10) == [rows[2], rows[3]]
+
+    # Adding comments rebuilds the columns
+    columnar.add(Comment("u5", "devto", "E", "Newest comment", sentiment="negative"))
+    plain.add(Comment("u5", "devto", "E", "Newest comment", sentiment="negative"))
+    assert columnar.count_by('sentiment') == plain.count_by('sentiment') == {'positive': 3, 'negative': 2}
+
+    # So does appending to the list directly
+    columnar.comments.append(Comment("u6", "devto", "F", "Appended comment", likes=3))
+    assert columnar.count_by('platform') == {'reddit': 3, 'devto': 2, 'github': 1}
+
+
+def test_columnar_top_k_breaks_ties_like_list_backend():
+    """Test that both backends return the earlier comments among equal values."""
+    pytest.importorskip('numpy')
+
+    rows = [Comment(f"u{i}", "blog", "A", "Same length", likes=likes) for i, likes in enumerate([5, 1, 5, 3, 5, 1, 5])]
+    plain = CommentCollection()
+    columnar = CommentCollection(columnar=True)
+    plain.extend(rows)
+    columnar.extend(rows)
+
+    for k in range(1, len(rows) + 1):
+        assert columnar.top_k(k) == plain.top_k(k)
+        assert columnar.top_k(k, by='text_length') == plain.top_k(k, by='text_length')
+
+
+def test_serialization_parity_with_stdlib(monkeypatch):
+    """Test that the fast path produces the same output as asdict + json."""
+    comments = [
+        Comment("https://example.com/ü", "blog", "Zoë", 'Quote " and \\ and \n newline', likes=2 ** 40),
+        Comment("https://example.com/2", "reddit", "Bob", "Emoji 🎉 text", "2024-01-01", "positive", 0, 3),
+    ]
+    collection = CommentCollection()
+    collection.extend(comments)
+
+    def as_dict(comment):
+        return {**dataclasses.asdict(comment), 'id': comment.id}
+
+    for comment in comments:
+        assert comment.to_dict() == as_dict(comment)
+        assert comment.to_json() == json.dumps(as_dict(comment), ensure_ascii=False, indent=2)
+
+    expected = json.dumps([as_dict(c) for c in comments], ensure_ascii=False, indent=2)
+    fast_output = collection.to_json()
+    compact_output = collection.to_json(indent=None)
+
+    monkeypatch.setattr(serialization, 'orjson', None)
+    assert fast_output == collection.to_json() == expected
+    assert compact_output == collection.to_json(indent=None)
+    assert '\n' not in compact_output
+    assert json.loads(compact_output) == json.loads(expected)
+
+
+def test_comment_id_is_stable_and_normalized():
+    """Test that the id ignores formatting noise but not content."""
+    a = Comment("https://example.com/post/", "Blog", "Ann", "Great  post!\n")
+    b = Comment("https://example.com/post#comment-3", "blog", "ann", "great post!")
+    c = Comment("https://example.com/post", "blog", "Ann", "Different post")
+
+    assert a.id == b.id
+    assert a.id != c.id
+    assert len(a.id) == 16
+    assert a == Comment.from_dict(a.to_dict())
+    assert Comment.from_dict({**c.to_dict(), 'id': 'stored'}).id == 'stored'
+
+
+def test_comment_timestamp_survives_pickle_and_copy():
+    """Test that pickled and copied comments still parse their timestamp."""
+    original = Comment("https://example.com/post", "blog", "Ann", "Nice post", date_posted="2024-01-01")
+    parsed = Comment("https://example.com/post", "blog", "Bob", "Nice post", date_posted="2024-01-01")
+    assert parsed.timestamp == 1704067200
+
+    for comment in (original, parsed):
+        for clone in (pickle.loads(pickle.dumps(comment)), copy.deepcopy(comment), copy.copy(comment)):
+            assert clone.timestamp == 1704067200
+
+
+def test_comment_id_and_timestamp_follow_field_changes():
+    """Test that the cached id and timestamp are recomputed after their fields change."""
+    comment = Comment("https://example.com/post", "blog", "Ann", "First text", date_posted="2024-01-01")
+    first_id, first_timestamp = comment.id, comment.timestamp
+
+    comment.comment_text = "Edited text"
+    comment.date_posted = "2024-01-02"
+    assert comment.id == Comment("https://example.com/post", "blog", "Ann", "Edited text").id != first_id
+    assert comment.timestamp == first_timestamp + 86400
+
+    comment.sentiment = "positive"
+    assert comment.id == Comment("https://example.com/post", "blog", "Ann", "Edited text").id
+    assert Comment.from_dict({**comment.to_dict(), 'id': 'stored'}).id == 'stored'
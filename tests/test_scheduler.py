@@ -0,0 +1,124 @@
+"""
+Tests for the scheduler service.
+"""
+
+from concurrent.futures import Future
+import pytest
+from commentradar import scheduler
+from commentradar.scheduler import SchedulerService, TopicJob
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class ManualExecutor:
+    """Executor that runs submitted jobs only when the test finishes them."""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn, job):
+        future = Future()
+        self.pending.append((fn, job, future))
+        return future
+
+    def finish(self, name):
+        for fn, job, future in [entry for entry in self.pending if entry[1].name == name]:
+            self.pending.remove((fn, job, future))
+            fn(job)
+            future.set_result(None)
+
+
+def test_service_skips_overlapping_runs_without_blocking_other_jobs():
+    """Test that a running job skips its cycles while other jobs keep their schedule."""
+    clock = FakeClock()
+    slow = TopicJob("slow", lambda: clock.advance(0.3), interval=0.05)
+    fast = TopicJob("fast", lambda: None, interval=0.05, jitter=0.01)
+    service = SchedulerService([slow, fast], workers=2, clock=clock)
+    executor = ManualExecutor()
+
+    queue = service._schedule(clock())
+    for cycle in range(10):
+        # Past the due time plus the largest jitter
+        clock.now = cycle * 0.05 + 0.01
+        service._dispatch(queue, clock(), executor)
+        executor.finish("fast")
+
+    assert (fast.runs, fast.skipped) == (10, 0)
+    assert (slow.runs, slow.skipped) == (0, 9) and slow.running
+
+    executor.finish("slow")
+    clock.now = 10 * 0.05 + 0.01
+    service._dispatch(queue, clock(), executor)
+
+    assert [job.name for _, job, _ in executor.pending] == ["slow", "fast"]
+    report = {row['name']: row for row in service.report()}
+    assert report['slow']['runs'] == 1 and report['slow']['max'] == pytest.approx(0.3)
+    assert report['fast']['mean'] == 0.0 and report['fast']['failures'] == 0
+
+
+def test_service_from_config(tmp_path, monkeypatch):
+    """Test building jobs from an INI file with shared defaults."""
+    config = tmp_path / "topics.ini"
+    config.write_text(
+        "[DEFAULT]\n"
+        "interval = 15  # minutes\n"
+        "platforms = blog, google\n"
+        "\n"
+        "[scheduler]\n"
+        "workers = 3\n"
+        "\n"
+        f"[job:dental]\noutput = {tmp_path / 'dental.jsonl'}\n"
+        "\n"
+        f"[job:travel]\ntopic = travel apps\ninterval = 60\noutput = {tmp_path / 'travel.db'}\n"
+        "analyze_sentiment = true\n",
+        encoding="utf-8"
+    )
+
+    service = SchedulerService.from_config(str(config))
+    assert service.workers == 3
+    assert [(job.name, job.interval) for job in service.jobs] == [("dental", 900.0), ("travel", 3600.0)]
+    assert service.jobs[1].run.__self__.topic == "travel apps"
+    assert service.jobs[0].run.__self__.platforms == ["blog", "google"]
+
+    warmed = []
+    monkeypatch.setattr("commentradar.scheduler.warm_up", warmed.append)
+    service.stop()
+    service.run()
+    assert warmed == ["keyword"] and service.jobs[1].runs == 0
+
+    config.write_text(
+        "[job:a]\noutput = same.jsonl\n\n[job:b]\noutput = same.jsonl\n", encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="same file"):
+        SchedulerService.from_config(str(config))
+
+
+def test_service_counts_failed_scrapes(monkeypatch, tmp_path):
+    """Test that scrape errors, which scrape_job logs instead of raising, count as failures."""
+    class BrokenManager:
+        def __init__(self, **kwargs):
+            pass
+
+        def scrape_all(self):
+            raise ConnectionError("source down")
+
+    monkeypatch.setattr(scheduler, 'ScraperManager', BrokenManager)
+    scraper = scheduler.ScheduledScraper("queues", ["blog"], output_file=str(tmp_path / "out.jsonl"))
+    job = TopicJob("queues", scraper.scrape_job, interval=60)
+    service = SchedulerService([job, TopicJob("ok", lambda: None, interval=60)])
+
+    for each in service.jobs:
+        service._execute(each)
+
+    assert [(row['runs'], row['failures']) for row in service.report()] == [(1, 1), (1, 0)]
@@ -0,0 +1,365 @@
+"""
+Tests for scrapers.
+"""
+
+from bs4 import BeautifulSoup
+import pytest
+import requests
+from commentradar.scrapers import multi_source_scraper
+from commentradar.scrapers.blog_scraper import BlogScraper
+from commentradar.scrapers.constraints import SourceConstraints
+from commentradar.scrapers.http import requests_in_flight, shared_get
+from commentradar.scrapers.multi_source_scraper import MultiSourceScraper
+from commentradar.scrapers.pagination import find_comment_pages, find_next_page
+from commentradar.scrapers.streaming import iter_comments
+from commentradar.scrapers.wordpress import WordPressAdapter, comment_feed_url, detect_blog_engine, html_to_text
+from commentradar.utils.throttle import HostThrottle
+
+
+@pytest.fixture(autouse=True)
+def fresh_requests():
+    """Keep shared responses from leaking between tests."""
+    requests_in_flight.clear()
+    yield
+    requests_in_flight.clear()
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code=200, json_data=None, text='', headers=None):
+        self.status_code = status_code
+        self._json = json_data
+        self.text = text
+        self.content = text.encode('utf-8')
+        self.headers = headers or {}
+
+    def json(self):
+        if self._json is None:
+            raise ValueError("No JSON")
+        return self._json
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+
+class FakeSession:
+    """Session that serves canned responses keyed by URL."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.calls.append((url, params))
+        route = self.routes.get(url)
+        if callable(route):
+            return route(params or {})
+        return route or FakeResponse(status_code=404)
+
+
+def test_detect_blog_engine():
+    """Test WordPress detection from URL, headers and markup."""
+    assert detect_blog_engine("https://someone.wordpress.com/2024/01/post/") == 'wordpress'
+    assert detect_blog_engine("https://example.com/?p=42") == 'wordpress'
+    assert detect_blog_engine(
+        "https://example.com/post",
+        headers={'Link': '<https://example.com/wp-json/>; rel="https://api.w.org/"'}
+    ) == 'wordpress'
+    assert detect_blog_engine("https://example.com/post", html_text='<link href="/wp-content/x.css">') == 'wordpress'
+    assert detect_blog_engine("https://example.com/post") is None
+
+
+def test_html_to_text():
+    """Test rendered HTML conversion without a DOM."""
+    assert html_to_text("<p>Great &amp; useful\n post</p>") == "Great & useful post"
+
+
+def test_wordpress_adapter_rest_batches_posts_per_site():
+    """Test that posts on one site share a slug lookup and comment query."""
+    def comments(params):
+        assert params['post'] == '11,12'
+        if params['page'] == 1:
+            return FakeResponse(json_data=[
+                {'post': 11, 'author_name': 'Ann', 'content': {'rendered': '<p>First comment here</p>'},
+                 'date_gmt': '2024-01-01T10:00:00'},
+            ], headers={'X-WP-TotalPages': '2'})
+        return FakeResponse(json_data=[
+            {'post': 12, 'author_name': 'Bob', 'content': {'rendered': '<p>Second comment here</p>'},
+             'date_gmt': '2024-01-02T10:00:00'},
+        ], headers={'X-WP-TotalPages': '2'})
+
+    session = FakeSession({
+        'https://blog.example.com/first-post/': FakeResponse(text='<link href="/wp-content/x.css">'),
+        'https://blog.example.com/wp-json/wp/v2/posts': FakeResponse(json_data=[
+            {'id': 11, 'slug': 'first-post'},
+            {'id': 12, 'slug': 'second-post'},
+        ]),
+        'https://blog.example.com/wp-json/wp/v2/comments': comments,
+    })
+
+    adapter = WordPressAdapter(session)
+    results = adapter.fetch_comments([
+        'https://blog.example.com/first-post/',
+        'https://blog.example.com/second-post/',
+    ])
+
+    # One page fetch to detect WordPress, one slug lookup, two comment pages
+    assert len(session.calls) == 4
+    assert [c.commenter_name for c in results['https://blog.example.com/first-post/']] == ['Ann']
+    assert results['https://blog.example.com/second-post/'][0].comment_text == 'Second comment here'
+
+
+def test_wordpress_adapter_feed_fallback():
+    """Test the comment feed fallback when the REST API is disabled."""
+    feed = """<?xml version="1.0"?>
+    <rss xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>
+      <item><dc:creator>Carol</dc:creator><description>Loved this article a lot</description>
+      <pubDate>Mon, 01 Jan 2024 10:00:00 +0000</pubDate></item>
+    </channel></rss>"""
+    session = FakeSession({
+        'https://me.wordpress.com/post/feed/': FakeResponse(text=feed),
+    })
+
+    results = WordPressAdapter(session).fetch_comments(['https://me.wordpress.com/post/'])
+
+    assert results['https://me.wordpress.com/post/'][0].commenter_name == 'Carol'
+
+
+def test_wordpress_adapter_feed_for_plain_permalinks():
+    """Test that ?p=N posts use their comment feed, not the site's posts feed."""
+    feed = """<?xml version="1.0"?>
+    <rss xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>
+      <item><dc:creator>Dan</dc:creator><description>A comment on post 42</description></item>
+    </channel></rss>"""
+    session = FakeSession({
+        'https://example.com/?p=42&feed=rss2': FakeResponse(text=feed),
+        'https://example.com/feed/': FakeResponse(text=feed.replace('Dan', 'Posts feed')),
+    })
+
+    results = WordPressAdapter(session).fetch_comments(['https://example.com/?p=42'])
+
+    assert [c.commenter_name for c in results['https://example.com/?p=42']] == ['Dan']
+    assert comment_feed_url('https://example.com/blog/?p=7#comments') == 'https://example.com/blog/?p=7&feed=rss2'
+    assert comment_feed_url('https://example.com/a-post/?utm=x') == 'https://example.com/a-post/feed/'
+
+
+def test_wordpress_adapter_skips_unknown_sites():
+    """Test that non-WordPress sites are left to HTML scraping."""
+    session = FakeSession({})
+
+    results = WordPressAdapter(session).fetch_comments(['https://example.com/article/foo'])
+
+    assert results == {}
+    assert [url for url, params in session.calls] == ['https://example.com/article/foo']
+
+
+def test_wordpress_adapter_goes_through_robots_and_throttle():
+    """Test that adapter requests are checked against robots.txt and throttled."""
+    class CountingThrottle(HostThrottle):
+        def slot(self, url):
+            slotted.append(url)
+            return super().slot(url)
+
+    slotted = []
+    session = FakeSession({})
+    adapter = WordPressAdapter(
+        session,
+        throttle=CountingThrottle(min_interval=0),
+        is_allowed=lambda url: '/wp-json/' not in url,
+    )
+
+    assert adapter.fetch_comments(['https://example.com/?p=42']) == {}
+    assert [url for url, params in session.calls] == ['https://example.com/?p=42&feed=rss2']
+    assert slotted == ['https://example.com/?p=42&feed=rss2']
+
+
+def test_wordpress_adapter_leaves_posts_to_fallbacks_when_rest_fails():
+    """Test that a failed REST comments query does not report posts as empty."""
+    session = FakeSession({})
+
+    results = WordPressAdapter(session).fetch_comments(['https://example.com/?p=42'])
+
+    assert results == {}
+    assert "https://example.com/wp-json/wp/v2/comments" in [url for url, params in session.calls]
+
+
+WORDPRESS_THREAD = """
+<html><head><script>var comment = "<div class='comment'>nope</div>";</script></head><body>
+<ol class="comment-list">
+  <li id="comment-1" class="comment depth-1">
+    <article class="comment-body">
+      <footer><div class="comment-author"><b>Ann</b></div><time datetime="2024-01-01T10:00:00">Jan 1</time></footer>
+      <div class="comment-content"><p>This was a really useful post &amp; guide.</p></div>
+    </article>
+    <ol class="children">
+      <li id="comment-2" class="comment depth-2">
+        <div class="comment-author">Bob</div>
+        <div class="comment-content"><p>Agreed, thanks for sharing<br>this!</p></div>
+      </li>
+    </ol>
+  </li>
+</ol>
+</body></html>
+"""
+
+
+def test_streaming_parser_emits_comments_as_containers_close():
+    """Test incremental extraction across arbitrary chunk boundaries."""
+    chunks = [WORDPRESS_THREAD[i:i + 7] for i in range(0, len(WORDPRESS_THREAD), 7)]
+    comments = list(iter_comments(chunks, source_url="https://blog.example.com/post"))
+
+    # The nested reply closes first
+    assert [c.commenter_name for c in comments] == ['Bob', 'Ann']
+    assert comments[0].comment_text == "Agreed, thanks for sharingthis!"
+    assert comments[1].comment_text == "This was a really useful post & guide."
+    assert comments[1].date_posted == "2024-01-01T10:00:00"
+    assert comments == list(iter_comments([WORDPRESS_THREAD], source_url="https://blog.example.com/post"))
+
+
+def test_find_comment_pages_expands_numbered_range():
+    """Test WordPress comment page detection, including hidden pages."""
+    url = "https://blog.example.com/post/"
+    soup = BeautifulSoup(
+        '<div class="comment-navigation">'
+        '<a href="/post/comment-page-2/#comments">2</a> … '
+        '<a href="https://blog.example.com/post/comment-page-4/">4</a></div>'
+        '<a href="/other-post/comment-page-2/">elsewhere</a>'
+        '<link rel="next" href="/post/comment-page-2/">',
+        'html.parser'
+    )
+
+    assert find_comment_pages(soup, url) == [
+        "https://blog.example.com/post/comment-page-2/",
+        "https://blog.example.com/post/comment-page-3/",
+        "https://blog.example.com/post/comment-page-4/",
+    ]
+    assert find_next_page(soup, url) == "https://blog.example.com/post/comment-page-2/"
+
+
+def test_find_comment_pages_keeps_page_one_of_newest_first_thread():
+    """Test that a bare post URL showing the last page still yields page 1."""
+    url = "https://blog.example.com/post/"
+    links = (
+        '<a class="page-numbers" href="/post/comment-page-1/#comments">1</a>'
+        '<a class="page-numbers" href="/post/comment-page-2/#comments">2</a>'
+    )
+    marked = BeautifulSoup(
+        f'<div class="nav-links">{links}<span aria-current="page" class="page-numbers current">3</span></div>',
+        'html.parser'
+    )
+    unmarked = BeautifulSoup(f'<div class="nav-links">{links}</div>', 'html.parser')
+
+    expected = [
+        "https://blog.example.com/post/comment-page-1/",
+        "https://blog.example.com/post/comment-page-2/",
+    ]
+    assert find_comment_pages(marked, url) == expected
+    assert find_comment_pages(unmarked, url) == expected
+
+
+def test_blog_scraper_merges_comment_pages_in_order():
+    """Test that paginated comment sections are fetched and merged in order."""
+    def page(n, links=''):
+        return FakeResponse(text=(
+            f'<div class="comment"><span class="author">User{n}</span>'
+            f'<p class="text">Comment on page {n}</p></div>{links}'
+        ))
+
+    url = "https://blog.example.com/post"
+    scraper = BlogScraper(topic="test")
+    scraper.session = FakeSession({
+        url: page(1, '<a href="?cpage=2">2</a><a href="?cpage=3">3</a>'),
+        url + "?cpage=2": page(2),
+        url + "?cpage=3": page(3),
+    })
+    scraper.throttle.min_interval = 0
+    scraper.check_robots_permission = lambda u: True
+
+    comments = scraper._extract_comments_from_page(url)
+
+    assert [c.commenter_name for c in comments] == ['User1', 'User2', 'User3']
+    assert all(c.source_url == url for c in comments)
+
+
+def test_blog_scraper_skips_nested_comment_containers():
+    """Test that a comment matching several selectors is emitted once."""
+    soup = BeautifulSoup(
+        '<div id="comment-1" class="comment">'
+        '  <div class="comment-body"><span class="author">Ann</span><p class="text">First comment</p></div>'
+        '</div>'
+        '<div class="user-comment"><span class="author">Bob</span><p class="text">Second comment</p></div>',
+        'html.parser'
+    )
+
+    comments = BlogScraper(topic="test")._extract_comments_from_soup(soup, "https://blog.example.com/post")
+
+    assert [c.commenter_name for c in comments] == ['Ann', 'Bob']
+
+
+def test_blog_scraper_keeps_threaded_replies():
+    """Test that replies nested inside their parent comment are still extracted."""
+    soup = BeautifulSoup(
+        '<div id="comment-1" class="comment">'
+        '  <div id="div-comment-1" class="comment-body"><span class="author">Ann</span><p class="text">Parent comment</p></div>'
+        '  <div class="children">'
+        '    <div id="comment-2" class="comment">'
+        '      <div id="div-comment-2" class="comment-body"><span class="author">Bob</span><p class="text">Nested reply</p></div>'
+        '    </div>'
+        '  </div>'
+        '</div>',
+        'html.parser'
+    )
+
+    comments = BlogScraper(topic="test")._extract_comments_from_soup(soup, "https://blog.example.com/post")
+
+    assert [c.commenter_name for c in comments] == ['Ann', 'Bob']
+    assert 'Nested reply' not in comments[0].comment_text and comments[1].comment_text.endswith('Nested reply')
+
+
+def test_source_constraints_push_down_date_ranges():
+    """Test the source-side parameters derived from filter options."""
+    constraints = SourceConstraints(start_date="2024-01-01", end_date="2024-01-31")
+    start, end = 1704067200, 1706745599
+
+    assert constraints.algolia_params() == {'numericFilters': f"created_at_i>={start},created_at_i<={end}"}
+    assert constraints.github_qualifier() == "created:2024-01-01..2024-01-31"
+    assert constraints.stackexchange_params() == {'fromdate': start, 'todate': end}
+    assert constraints.reddit_params(now=start + 3 * 86400) == {'t': 'week'}
+    assert SourceConstraints(end_date="2024-01-31").reddit_params() == {}
+    assert not SourceConstraints()
+    assert SourceConstraints().algolia_params() == {}
+
+
+def test_shared_get_reuses_only_successful_responses():
+    """Test that rate-limit and server errors are fetched again instead of reused."""
+    statuses = iter([429, 503, 200, 404])
+    session = FakeSession({'https://api.example.com/search': lambda params: FakeResponse(status_code=next(statuses))})
+
+    codes = [shared_get(session, 'https://api.example.com/search').status_code for _ in range(4)]
+
+    assert codes == [429, 503, 200, 200]
+    assert len(session.calls) == 3
+
+
+def test_multi_source_scraper_pushes_filters_to_sources(monkeypatch):
+    """Test that date filters reach the APIs and undated sources are skipped."""
+    monkeypatch.setattr(multi_source_scraper.time, 'sleep', lambda seconds: None)
+    hn_url = "http://hn.algolia.com/api/v1/search?query=apps&tags=story"
+    session = FakeSession({
+        hn_url: FakeResponse(json_data={'hits': [
+            {'objectID': '1', 'author': 'a', 'title': 'A story inside the range', 'created_at': '2024-01-10T00:00:00Z'},
+            {'objectID': '2', 'author': 'b', 'title': 'A story outside the range', 'created_at': '2023-06-01T00:00:00Z'},
+        ]}),
+    })
+
+    scraper = MultiSourceScraper("apps", constraints=SourceConstraints(start_date="2024-01-01", end_date="2024-01-31"))
+    scraper.session = session
+    comments = scraper.scrape_all(include_extended=False)
+
+    requested = dict(session.calls)
+    assert requested[hn_url] == {'numericFilters': 'created_at_i>=1704067200,created_at_i<=1706745599'}
+    assert any('created:2024-01-01..2024-01-31' in url for url in requested)
+    assert not any('nitter' in url or 'quora' in url or 'medium' in url for url in requested)
+    assert [c.commenter_name for c in comments] == ['a']
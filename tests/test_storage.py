@@ -0,0 +1,300 @@
+"""
+Tests for storage backends.
+"""
+
+import json
+import os
+import random
+from commentradar import scheduler
+from commentradar.models import Comment, CommentCollection
+from commentradar.storage import AppendOnlyStore, SQLiteCommentStore, append, bloom, jsonl, open_store
+from commentradar.storage.archive import CommentArchive
+from commentradar.storage.lsh import LSH_HEADER, NearDuplicateIndex
+from commentradar.storage.jsonl import (
+    append_unique,
+    convert_json_to_jsonl,
+    iter_json_array,
+    iter_jsonl,
+    write_jsonl,
+)
+
+
+def make_comments(n, prefix="Comment"):
+    return [
+        Comment(f"https://example.com/{i}", "blog", f"User{i}", f"{prefix} {i} with ünïcode")
+        for i in range(n)
+    ]
+
+
+def test_jsonl_round_trip(tmp_path):
+    """Test streaming write and read of JSON Lines."""
+    path = str(tmp_path / "comments.jsonl")
+    comments = make_comments(3)
+
+    assert write_jsonl(comments, path) == 3
+    assert list(iter_jsonl(path)) == comments
+    assert len(open(path, encoding='utf-8').read().splitlines()) == 3
+
+
+def test_append_unique_writes_only_new_rows(tmp_path):
+    """Test O(new) appends with deduplication against existing rows."""
+    path = str(tmp_path / "comments.jsonl")
+    write_jsonl(make_comments(2), path)
+
+    appended = append_unique(make_comments(4), path, key=lambda c: (c['source_url'], c['comment_text']))
+
+    assert [c.source_url for c in appended] == ["https://example.com/2", "https://example.com/3"]
+    assert len(list(iter_jsonl(path))) == 4
+
+
+def test_legacy_json_array_streaming_and_conversion(tmp_path, monkeypatch):
+    """Test reading a JSON array in small chunks and converting it."""
+    source = tmp_path / "comments.json"
+    collection = CommentCollection()
+    collection.extend(make_comments(5))
+    collection.save_to_file(str(source))
+
+    monkeypatch.setattr(jsonl, 'READ_CHUNK_SIZE', 7)
+    assert list(iter_json_array(str(source))) == json.loads(source.read_text(encoding='utf-8'))
+
+    assert convert_json_to_jsonl(str(source)) == 5
+    loaded = CommentCollection.load_from_file(str(tmp_path / "comments.jsonl"))
+    assert loaded.comments == collection.comments
+
+
+def test_sqlite_store_upserts_and_queries(tmp_path):
+    """Test deduplicating upserts, counter refresh and indexed queries."""
+    path = str(tmp_path / "comments.db")
+    with open_store(path) as store:
+        assert len(store.add(make_comments(3))) == 3
+
+        again = make_comments(4)
+        again[0].likes = 7
+        again[0].sentiment = 'positive'
+        new = store.add(again)
+
+        assert [c.source_url for c in new] == ["https://example.com/3"]
+        assert len(store) == 4
+        assert store.count_by('sentiment') == {'positive': 1}
+        assert store.top_liked(1)[0].likes == 7
+        assert len(store.query(platform='blog', limit=2)) == 2
+        assert store.query(sentiment='Positive')[0].source_url == "https://example.com/0"
+
+    loaded = CommentCollection.load_from_file(path)
+    assert [c.comment_text for c in loaded] == [c.comment_text for c in make_comments(4)]
+
+
+def test_stores_match_sentiment_case_insensitively(tmp_path):
+    """Test that sentiment labels stored with any casing are queried and counted together."""
+    comments = [
+        Comment("https://example.com/1", "blog", "A", "Stored lowercase", sentiment='positive'),
+        Comment("https://example.com/2", "blog", "B", "Stored capitalized", sentiment='Positive'),
+        Comment("https://example.com/3", "blog", "C", "Stored uppercase", sentiment='NEGATIVE'),
+    ]
+    for name in ("comments.db", "comments.jsonl"):
+        with open_store(str(tmp_path / name)) as store:
+            store.add(comments)
+            assert [c.commenter_name for c in store.query(sentiment='positive')] == ['A', 'B']
+            assert [c.commenter_name for c in store.query(sentiment='Negative')] == ['C']
+            assert store.count_by('sentiment') == {'positive': 2, 'negative': 1}
+
+
+def test_append_unique_dedups_by_comment_id(tmp_path):
+    """Test that comments sharing a page are kept and legacy rows are matched."""
+    path = tmp_path / "comments.jsonl"
+    legacy = make_comments(1)[0].to_dict()
+    del legacy['id']
+    path.write_text(json.dumps(legacy) + "\n", encoding='utf-8')
+
+    same_page = [
+        make_comments(1)[0],
+        Comment("https://example.com/0", "blog", "User9", "Another comment on the same page"),
+    ]
+    appended = append_unique(same_page, str(path))
+
+    assert [c.commenter_name for c in appended] == ["User9"]
+
+
+def test_sqlite_store_date_queries_use_epochs(tmp_path):
+    """Test date range queries on the normalized posted_at column."""
+    with SQLiteCommentStore(str(tmp_path / "comments.db")) as store:
+        store.add([
+            Comment("u1", "reddit", "A", "Epoch date", date_posted="1706745600.0"),
+            Comment("u2", "github", "B", "ISO date", date_posted="2024-01-15T12:00:00Z"),
+            Comment("u3", "blog", "C", "No date"),
+        ])
+
+        assert [c.commenter_name for c in store.query(start_date="2024-01-01", end_date="2024-01-31")] == ['B']
+        assert [c.commenter_name for c in store.latest(5)] == ['A', 'B']
+
+
+def test_comment_archive_random_access_and_incremental_index(tmp_path):
+    """Test lazy row access, tail reads and index reuse after appends."""
+    path = str(tmp_path / "comments.jsonl")
+    comments = make_comments(5)
+    write_jsonl(comments[:3], path)
+
+    with CommentArchive(path) as archive:
+        assert len(archive) == 3
+        assert archive[1] == comments[1]
+        assert archive[-1] == comments[2]
+        assert archive[0:3:2] == [comments[0], comments[2]]
+
+        # A partially written row stays hidden until it is complete
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(comments[3].to_json(indent=None) + "\n" + comments[4].to_json(indent=None)[:10])
+        archive.refresh()
+        assert archive.tail(2) == comments[2:4]
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(comments[4].to_json(indent=None)[10:] + "\n")
+
+    with CommentArchive(path) as reopened:
+        assert list(reopened) == comments
+
+    # A rewritten file invalidates the index
+    write_jsonl(make_comments(2, prefix="Rewritten"), path)
+    with CommentArchive(path) as rewritten:
+        assert [c.comment_text for c in rewritten] == [c.comment_text for c in make_comments(2, prefix="Rewritten")]
+
+
+def test_near_duplicate_index_persists_incrementally(tmp_path):
+    """Test LSH lookups, collapsing of cross-posts and append-only persistence."""
+    path = str(tmp_path / "comments.jsonl.lsh")
+    text = "We moved our whole build pipeline to the new runner and cut CI time in half for every team"
+    original = Comment("https://reddit.com/r/devops/1", "reddit", "ana", text)
+    crosspost = Comment("https://dev.to/ana/ci", "devto", "ana", "Cross-post: " + text)
+    other = Comment("https://news.ycombinator.com/item?id=2", "hackernews", "bo", "Anyone tried the new SQLite release?")
+
+    with NearDuplicateIndex(path) as index:
+        assert index.collapse([original, crosspost, original]) == [original, original]
+    size = os.path.getsize(path)
+
+    index = NearDuplicateIndex(path)
+    assert len(index) == 1 and original.id in index
+    assert index.query(crosspost.comment_text) == [original.id]
+    assert index.collapse([other, crosspost]) == [other]
+    index.flush()
+    assert os.path.getsize(path) == size + (size - LSH_HEADER.size)
+    assert len(NearDuplicateIndex(path)) == 2
+
+
+def test_near_duplicate_index_keeps_short_comments():
+    """Test that short generic comments are neither collapsed nor indexed."""
+    index = NearDuplicateIndex()
+    short = Comment("https://a.com/post", "blog", "ana", "Great post, thanks!")
+    echo = Comment("https://b.com/post", "blog", "bo", "great post thanks")
+    reply = Comment("https://b.com/post", "blog", "cy", "Great post!")
+
+    assert index.collapse([short, echo, reply]) == [short, echo, reply]
+    assert len(index) == 0
+    assert index.query("Great post, thanks!") == []
+
+
+def test_scheduled_scraper_collapses_near_duplicates(tmp_path, monkeypatch):
+    """Test that the scheduler skips cross-posts of stored comments."""
+    path = str(tmp_path / "comments.jsonl")
+    text = "Our team finally replaced the legacy cron jobs with a proper queue and it has been great"
+    write_jsonl([Comment("https://reddit.com/1", "reddit", "ana", text)], path)
+    scraped = [
+        Comment("https://medium.com/@ana/queues", "medium", "ana", text + " Thanks for reading!"),
+        Comment("https://news.ycombinator.com/item?id=3", "hackernews", "bo", "What queue did you pick?"),
+    ]
+
+    class FakeManager:
+        def __init__(self, **kwargs):
+            self.collection = CommentCollection()
+
+        def scrape_all(self):
+            self.collection.extend(scraped)
+            return self.collection
+
+    monkeypatch.setattr(scheduler, 'ScraperManager', FakeManager)
+    job = scheduler.ScheduledScraper("queues", ["blog"], output_file=path, collapse_near_duplicates=True)
+    job.scrape_job()
+    job.scrape_job()
+
+    assert [c.platform for c in iter_jsonl(path)] == ["reddit", "hackernews"]
+    assert os.path.exists(path + ".lsh")
+
+
+def test_append_only_store_keeps_id_sidecar_in_step(tmp_path):
+    """Test that JSON Lines appends reuse the id sidecar and pick up rows written by others."""
+    path = str(tmp_path / "comments.jsonl")
+    with AppendOnlyStore(path) as store:
+        assert store.add(make_comments(3)) == make_comments(3)
+        assert store.add(make_comments(4)) == make_comments(4)[3:]
+    assert os.path.getsize(path + ".ids") == 24 + 4 * 8
+
+    # Another writer appends; reopening scans only the new tail
+    write_jsonl(make_comments(2, prefix="Other"), path, append=True)
+    store = AppendOnlyStore(path)
+    assert len(store) == 6
+    assert store.add(make_comments(2, prefix="Other") + make_comments(5)) == make_comments(5)[4:]
+
+    # A rewritten file is re-indexed from scratch
+    write_jsonl(make_comments(1), path)
+    assert AppendOnlyStore(path).add(make_comments(2)) == make_comments(2)[1:]
+    assert list(iter_jsonl(path)) == make_comments(2)
+
+
+def test_append_only_store_appends_inside_json_array(tmp_path):
+    """Test that JSON array outputs grow in place and stay valid JSON."""
+    path = str(tmp_path / "comments.json")
+    CommentCollection().save_to_file(path)
+    with open_store(path) as store:
+        store.add(make_comments(2))
+        store.add(make_comments(3))
+
+    collection = CommentCollection()
+    collection.extend(make_comments(4))
+    collection.save_to_file(path)
+    with open_store(path) as store:
+        assert store.add(make_comments(5)) == make_comments(5)[4:]
+        assert store.count_by('platform') == {'blog': 5}
+        assert [c.commenter_name for c in store.query(limit=2)] == ["User0", "User1"]
+
+    with open(path, encoding='utf-8') as f:
+        assert [row['commenter_name'] for row in json.load(f)] == [f"User{i}" for i in range(5)]
+
+
+def test_scalable_bloom_filter_bounds_false_positives(tmp_path, monkeypatch):
+    """Test that the filter grows in slices, keeps its error bound and persists."""
+    rng = random.Random(7)
+    keys = [rng.getrandbits(64) for _ in range(5000)]
+    others = [rng.getrandbits(64) for _ in range(20000)]
+
+    fast = bloom.ScalableBloomFilter(error_rate=0.01, initial_capacity=1000)
+    fast.add_many(keys)
+    assert len(fast.filters) == 3 and fast.count == 5000
+    assert all(fast.contains_many(keys))
+    assert sum(fast.contains_many(others)) < 0.01 * len(others)
+
+    path = str(tmp_path / "ids.bloom")
+    fast.save(path)
+    loaded = bloom.ScalableBloomFilter.load(path)
+    assert [f.bits for f in loaded.filters] == [f.bits for f in fast.filters]
+
+    monkeypatch.setattr(bloom, "np", None)
+    slow = bloom.ScalableBloomFilter(error_rate=0.01, initial_capacity=1000)
+    slow.add_many(keys)
+    assert [f.bits for f in slow.filters] == [f.bits for f in fast.filters]
+    assert slow.contains_many(others[:2000]) == [key in loaded for key in others[:2000]]
+
+
+def test_append_only_store_verifies_bloom_filter_hits(tmp_path, monkeypatch):
+    """Test that filter false positives are resolved against the id sidecar."""
+    # Nearly every lookup is a filter hit, and nothing is remembered
+    monkeypatch.setattr(append, "RECENT_SIZE", 0)
+    path = str(tmp_path / "comments.jsonl")
+    with append.AppendOnlyStore(path, error_rate=0.5) as store:
+        assert len(store.add(make_comments(40))) == 40
+        assert store.add(make_comments(60)) == make_comments(60)[40:]
+        assert make_comments(1)[0] in store
+        assert make_comments(1, prefix="Never stored")[0] not in store
+    assert os.path.exists(path + ".bloom")
+
+    os.remove(path + ".bloom")
+    store = append.AppendOnlyStore(path, error_rate=0.5)
+    assert len(store) == 60 and store._bloom.count == 60
+    assert store.add(make_comments(61)) == make_comments(61)[60:]
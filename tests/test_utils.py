@@ -2,10 +2,21 @@
 Tests for utility functions.
 """
 
+import threading
+import time
+from bs4 import BeautifulSoup
 import pytest
-from commentradar.utils.sentiment import analyze_sentiment
-from commentradar.utils.filters import filter_by_length, filter_by_sentiment
-from commentradar.models import Comment
+from commentradar.utils import minhash, robots, sentiment
+from commentradar.utils.sentiment import Lexicon, analyze_sentiment, get_backend, score_batch, sentiment_score
+from commentradar.utils.filters import apply_filters, filter_by_date, filter_by_length, filter_by_sentiment
+from commentradar.models import Comment, CommentCollection
+from commentradar.utils.dates import parse_date_bound, parse_date_to_epoch
+from commentradar.utils.query import QueryError, compile_query
+from commentradar.utils.sentiment_cache import SentimentCache
+from commentradar.utils.sentiment_vectorized import VectorizedLexiconScorer
+from commentradar.utils.singleflight import SingleFlight
+from commentradar.utils.text import extract_text
+from commentradar.utils.throttle import HostThrottle
 
 
 def test_analyze_sentiment_positive():
@@ -60,3 +71,315 @@ def test_filter_by_sentiment():
     filtered = filter_by_sentiment(comments, "negative")
     assert len(filtered) == 1
 
+
+def test_extract_text_matches_copy_and_decompose():
+    """Test copy-free extraction against the copy-and-decompose approach."""
+    html = (
+        "<div><header>Ann says</header><p> Really <b>useful</b> post </p>"
+        "<!-- hidden --><div><time>Jan 1</time>Thanks!</div><footer>Reply</footer></div>"
+    )
+    element = BeautifulSoup(html, 'html.parser').div
+
+    expected = element.__copy__()
+    for unwanted in expected.find_all(['time', 'footer', 'header']):
+        unwanted.decompose()
+
+    text = extract_text(element, exclude=('time', 'footer', 'header'))
+    assert text == expected.get_text(strip=True) == "Reallyusefulpost" + "Thanks!"
+    assert extract_text(element, exclude=('time',), max_length=8) == "Ann says"[:8]
+    # The original element is untouched
+    assert element.find('time') is not None
+
+
+def test_host_throttle_spaces_requests_per_host():
+    """Test that request starts on one host are spaced apart."""
+    throttle = HostThrottle(max_concurrent=2, min_interval=0.05)
+    starts = []
+    for url in ["https://a.example/1", "https://a.example/2", "https://b.example/1"]:
+        with throttle.slot(url):
+            starts.append(time.monotonic())
+
+    assert starts[1] - starts[0] >= 0.045
+    # A different host is not delayed by the first one's budget
+    assert starts[2] - starts[1] < 0.045
+
+
+def test_parse_date_to_epoch_handles_source_formats():
+    """Test normalization of epoch, ISO, RFC 2822 and free-text dates."""
+    expected = 1704067200  # 2024-01-01T00:00:00Z
+    assert parse_date_to_epoch("1704067200.0", "reddit") == expected
+    assert parse_date_to_epoch("2024-01-01T00:00:00.000Z", "hackernews") == expected
+    assert parse_date_to_epoch("2024-01-01T01:00:00+01:00") == expected
+    assert parse_date_to_epoch("Mon, 01 Jan 2024 00:00:00 +0000") == expected
+    assert parse_date_to_epoch("January 1, 2024") == expected
+    assert parse_date_to_epoch("yesterday") is None
+    assert parse_date_to_epoch("25/04/2024") == 1714003200
+    assert parse_date_to_epoch("03/04/2024") == 1709510400  # always month first
+    assert parse_date_to_epoch("") is None
+    assert parse_date_bound("2024-01-01", end=True) == expected + 86399
+    with pytest.raises(ValueError):
+        parse_date_bound("not a date")
+
+
+def test_filter_by_date_compares_mixed_formats_numerically():
+    """Test date filters across sources, with and without the index."""
+    rows = [
+        Comment("u1", "reddit", "A", "Epoch", date_posted="1706745600.0"),  # 2024-02-01
+        Comment("u2", "github", "B", "ISO", date_posted="2024-01-15T12:00:00Z"),
+        Comment("u3", "blog", "C", "Free text", date_posted="January 31, 2024"),
+        Comment("u4", "blog", "D", "No date"),
+        Comment("u5", "devto", "E", "Too early", date_posted="2023-12-31T23:59:59Z"),
+    ]
+    collection = CommentCollection()
+    collection.extend(rows)
+
+    expected = [rows[1], rows[2]]
+    assert filter_by_date(rows, "2024-01-01", "2024-01-31") == expected
+    assert collection.filter_by_date("2024-01-01", "2024-01-31") == expected
+    assert apply_filters(collection, start_date="2024-01-01") == [rows[0], rows[1], rows[2]]
+
+    # Replacing the list with one of the same length must not reuse the index
+    collection.comments = list(reversed(rows))
+    assert collection.filter_by_date("2024-01-01", "2024-01-31") == [rows[2], rows[1]]
+
+
+def test_compile_query_expressions():
+    """Test the --where query language."""
+    rows = [
+        Comment("u1", "reddit", "Ann", "Pricing is too high", date_posted="2024-01-15T10:00:00Z",
+                sentiment="negative", likes=12),
+        Comment("u2", "github", "Bob", "Love the API", date_posted="2024-02-01", sentiment="positive", likes=3),
+        Comment("u3", "hackernews", "Cat", "We're hiring: pricing engineer", sentiment="neutral"),
+    ]
+
+    def select(expression):
+        predicate = compile_query(expression)
+        return [c.commenter_name for c in rows if predicate(c)]
+
+    assert select("platform = reddit and likes >= 10") == ['Ann']
+    assert select("text ~ /PRICING/i and not text contains 'hiring'") == ['Ann']
+    assert select("platform in (github, HackerNews) or sentiment = negative") == ['Ann', 'Bob', 'Cat']
+    assert select("date = 2024-01-15") == ['Ann']
+    assert select("date > 2024-01-15 or likes = 0") == ['Bob', 'Cat']
+    assert select('(author != "Ann") and length < 20') == ['Bob']
+
+    for bad in ("likes >", "platform = reddit and", "likes = many", "date < soon", "color = red", "text ~ /(/"):
+        with pytest.raises(QueryError):
+            compile_query(bad)
+
+
+def test_apply_filters_single_pass_honours_zero_bounds():
+    """Test compiled filters, including bounds of 0 that used to be ignored."""
+    rows = [
+        Comment("u1", "blog", "A", "", sentiment="neutral"),
+        Comment("u2", "blog", "B", "Some text", sentiment="Positive", likes=4),
+    ]
+
+    assert apply_filters(rows, max_length=0) == [rows[0]]
+    assert apply_filters(rows, min_length=0) == rows
+    assert apply_filters(rows, sentiment="positive", where="likes > 3") == [rows[1]]
+    assert apply_filters(rows) == rows
+
+
+def test_minhash_signatures_estimate_similarity(monkeypatch):
+    """Test MinHash similarity and that the numpy and pure Python paths agree."""
+    text = "Just shipped a new release of our scheduler with cron syntax and better retries"
+    hasher = minhash.MinHasher()
+    signature = hasher.signature(text)
+
+    assert minhash.similarity(signature, hasher.signature(text.upper() + "!")) == 1.0
+    assert minhash.similarity(signature, hasher.signature("Pasta recipes for a quiet night in")) < 0.2
+
+    monkeypatch.setattr(minhash, 'np', None)
+    assert hasher.signature(text) == signature
+
+
+def test_sentiment_lexicon_matches_whole_words_with_negation():
+    """Test word-boundary matching, negation and multi-word terms."""
+    assert analyze_sentiment("Goodbye, and thanks for the badge") == "neutral"
+    assert analyze_sentiment("This is not good at all") == "negative"
+    assert analyze_sentiment("I don't hate it, honestly") == "positive"
+    assert sentiment_score("Great docs, great support, bad pricing") == 1.0
+
+    lexicon = Lexicon({"waste of money": -2, "money": 0.5, "worth it": 1})
+    assert lexicon.score("A total waste of money, never worth it") == -3
+    assert lexicon.score("Saved money") == 0.5
+    assert lexicon.fingerprint != Lexicon({"waste of money": -2, "money": 1, "worth it": 1}).fingerprint
+
+
+CLAUSE_SENTENCES = {
+    "No issues, great support": "positive",
+    "No, it is great!": "positive",
+    "I have no complaints, love it": "positive",
+    "Nothing else compares. Great app": "positive",
+    "Never again. Terrible app": "negative",
+    "Not bad, great value": "positive",
+    "Not bad at all": "positive",
+}
+
+
+def test_negation_stops_at_clause_punctuation():
+    """Test that a negation does not flip terms after a comma or sentence end."""
+    assert {text: analyze_sentiment(text) for text in CLAUSE_SENTENCES} == CLAUSE_SENTENCES
+
+
+def test_score_batch_matches_across_processes():
+    """Test that pooled batch scoring matches single-process scoring and order."""
+    texts = ["great tool", "awful support", "a product", "not bad at all", "love it, best ever"] * 4
+    labels, scores = score_batch(texts, workers=1)
+    assert labels == [analyze_sentiment(text) for text in texts]
+    assert score_batch(texts, workers=2, chunk_size=3) == (labels, scores)
+
+    with pytest.raises(ValueError):
+        get_backend("nope")
+
+
+def test_sentiment_cache_skips_known_texts_and_invalidates_on_version(tmp_path):
+    """Test that cached texts are not rescored, across runs, until the backend version changes."""
+    calls = []
+
+    class CountingBackend(sentiment.KeywordBackend):
+        version_tag = "v1"
+
+        @property
+        def version(self):
+            return self.version_tag
+
+        def score_many(self, texts):
+            calls.extend(texts)
+            return super().score_many(texts)
+
+    sentiment.register_backend("counting", CountingBackend)
+    path = str(tmp_path / "scores.sentiment")
+    texts = ["great app", "awful app", "great app"]
+
+    with SentimentCache(path) as cache:
+        labels, _ = sentiment.score_batch(texts, backend="counting", cache=cache)
+    assert labels == ["positive", "negative", "positive"]
+    assert calls == ["great app", "awful app"]
+
+    with SentimentCache(path) as cache:
+        assert sentiment.score_batch(texts, backend="counting", cache=cache)[0] == labels
+        assert len(calls) == 2
+
+        CountingBackend.version_tag = "v2"
+        sentiment.score_batch(["great app"], backend="counting", cache=cache)
+        assert calls[2:] == ["great app"] and len(cache) == 1
+
+    sentiment.BACKENDS.pop("counting")
+    sentiment._instances.pop("counting", None)
+
+
+def test_vectorized_scorer_matches_analyze_sentiment():
+    """Test that the NumPy batch scorer labels exactly like analyze_sentiment."""
+    pytest.importorskip("numpy")
+
+    texts = [
+        "This is a great and wonderful product! I love it!",
+        "This is terrible and awful. I hate it!",
+        "This is a product with features.",
+        "Goodbye, and thanks for the badge",
+        "This is not good at all",
+        "I don't hate it, honestly",
+        "never, ever, at all good",
+        "users' 'great' a''b bad_ rock_solid GREAT",
+        "Ünïcode is great",
+        "",
+        "not",
+        "never!!! good; not... bad",
+        *CLAUSE_SENTENCES,
+    ]
+    scorer = VectorizedLexiconScorer()
+    assert scorer.label(texts) == [analyze_sentiment(text) for text in texts]
+
+    lexicon = Lexicon({"waste of money": -2, "good": 1, "extraordinarilyawesome": 3})
+    texts = ["good but a waste of money", "extraordinarilyawesome", "extraordXnarilyawesome", "good"]
+    assert VectorizedLexiconScorer(lexicon).score(texts).tolist() == [lexicon.score(t) for t in texts]
+
+
+def test_get_backend_loads_each_backend_once_across_threads():
+    """Test that concurrent first uses of a backend create it only once."""
+    created = []
+
+    def factory():
+        created.append(1)
+        return sentiment.KeywordBackend()
+
+    sentiment.register_backend("slow-start", factory)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def use():
+        barrier.wait()
+        results.append(sentiment.get_backend("slow-start"))
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(backend is results[0] for backend in results)
+    assert sentiment.warm_up("slow-start") is results[0] and len(created) == 1
+
+    sentiment.BACKENDS.pop("slow-start")
+    sentiment._instances.pop("slow-start", None)
+    with pytest.raises(ValueError):
+        sentiment.get_backend("slow-start")
+
+
+def test_singleflight_shares_calls_and_memoizes_successes():
+    """Test that concurrent identical calls run once and failures are retried."""
+    group = SingleFlight(ttl=60)
+    started = []
+
+    def fetch():
+        started.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(group.do("url", fetch))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(started) == 1
+    assert all(result is results[0] for result in results)
+    assert group.do("url", fetch) is results[0] and group.hits == 1
+
+    def fail():
+        started.append(1)
+        raise ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            group.do("other", fail)
+    assert len(started) == 3
+
+    group.forget("url")
+    assert group.do("url", fetch) is not results[0]
+
+
+def test_robots_txt_is_read_once_per_host(monkeypatch):
+    """Test that robots checks on one host share a single parsed robots.txt."""
+    reads = []
+
+    def read(robots_url):
+        reads.append(robots_url)
+        parser = robots.urllib.robotparser.RobotFileParser()
+        parser.parse(["User-agent: *", "Disallow: /private", "Crawl-delay: 3"])
+        return parser
+
+    monkeypatch.setattr(robots, "_read_robots", read)
+    robots._robots.clear()
+    try:
+        assert robots.check_robots_txt("https://example.org/post")
+        assert not robots.check_robots_txt("https://example.org/private/page")
+        assert robots.get_crawl_delay("https://example.org/other") == 3.0
+    finally:
+        robots._robots.clear()
+
+    assert reads == ["https://example.org/robots.txt"]